@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 Radim Rehurek <me@radimrehurek.com>
+#
+# This code is distributed under the terms and conditions
+# from the MIT License (MIT).
+#
+"""Microbenchmarks for smart_open.bytebuffer.
+
+These do not need network access:
+
+    py.test integration-tests/test_bytebuffer.py
+"""
+import io
+import os
+
+import smart_open.bytebuffer
+
+CHUNK_SIZE = 256 * 1024
+CONTENTS = os.urandom(16 * 1024**2)
+LINES = b'\n'.join([b'x' * 79] * (len(CONTENTS) // 80))
+
+
+def consume(contents, read_size, method):
+    buf = smart_open.bytebuffer.ByteBuffer(CHUNK_SIZE)
+    reader = io.BytesIO(contents)
+    dest = bytearray(read_size)
+    total = 0
+    eof = False
+    while True:
+        #
+        # Fill the buffer the same way the readers do.
+        #
+        while len(buf) < read_size and not eof:
+            eof = buf.fill(reader) == 0
+        if eof and not len(buf):
+            break
+
+        if method == 'readinto':
+            total += buf.readinto(dest)
+        else:
+            total += len(getattr(buf, method)(read_size))
+    return total
+
+
+def consume_lines(contents):
+    buf = smart_open.bytebuffer.ByteBuffer(CHUNK_SIZE)
+    reader = io.BytesIO(contents)
+    lines = 0
+    while buf.fill(reader) or len(buf):
+        while len(buf):
+            buf.readline(b'\n')
+            lines += 1
+    return lines
+
+
+def test_read_small(benchmark):
+    assert benchmark(consume, CONTENTS, 64, 'read') == len(CONTENTS)
+
+
+def test_read_view_small(benchmark):
+    assert benchmark(consume, CONTENTS, 64, 'read_view') == len(CONTENTS)
+
+
+def test_readinto_small(benchmark):
+    assert benchmark(consume, CONTENTS, 64, 'readinto') == len(CONTENTS)
+
+
+def test_read_chunk(benchmark):
+    assert benchmark(consume, CONTENTS, CHUNK_SIZE, 'read') == len(CONTENTS)
+
+
+def test_read_many_chunks(benchmark):
+    assert benchmark(consume, CONTENTS, 32 * CHUNK_SIZE, 'read') == len(CONTENTS)
+
+
+def test_readline(benchmark):
+    assert benchmark(consume_lines, LINES) > 0
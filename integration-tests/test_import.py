@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 Radim Rehurek <me@radimrehurek.com>
+#
+# This code is distributed under the terms and conditions
+# from the MIT License (MIT).
+#
+"""Benchmarks for how long ``import smart_open`` takes.
+
+Uses ``python -X importtime`` in a fresh interpreter each time, so nothing is
+cached in sys.modules.  The timings include starting the interpreter; the
+import time itself ends up in each benchmark's extra_info.  These do not need network access:
+
+    py.test integration-tests/test_import.py
+"""
+import subprocess
+import sys
+
+
+def import_time(statement):
+    """Return the number of microseconds it took to import smart_open."""
+    command = [sys.executable, '-X', 'importtime', '-c', statement]
+    output = subprocess.run(command, stderr=subprocess.PIPE, check=True).stderr.decode('utf-8')
+    for line in output.splitlines():
+        fields = line.split('|')
+        if line.startswith('import time:') and fields[-1].strip() == 'smart_open':
+            return int(fields[1])
+    raise AssertionError('smart_open was not imported:\n%s' % output)
+
+
+def test_import(benchmark):
+    microseconds = benchmark(import_time, 'import smart_open')
+    benchmark.extra_info['import_time_us'] = microseconds
+
+
+def test_import_s3(benchmark):
+    microseconds = benchmark(import_time, 'import smart_open; smart_open.parse_uri("s3://bucket/key")')
+    benchmark.extra_info['import_time_us'] = microseconds
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 Radim Rehurek <me@radimrehurek.com>
+#
+# This code is distributed under the terms and conditions
+# from the MIT License (MIT).
+#
+"""Benchmarks for reading lines of text through smart_open.
+
+Compares the text layer that smart_open puts on top of non-local streams
+with the built-in open that local files get.  These do not need network
+access:
+
+    py.test integration-tests/test_text.py
+"""
+import codecs
+import io
+import os
+import tempfile
+
+import pytest
+
+import smart_open
+
+LINES = [('{"id": %d, "name": "user %d", "tags": ["a", "b"]}\n' % (i, i)) for i in range(200000)]
+CONTENTS = ''.join(LINES).encode('utf-8')
+
+
+@pytest.fixture(scope='module')
+def local_path():
+    with tempfile.NamedTemporaryFile(suffix='.jsonl', delete=False) as fout:
+        fout.write(CONTENTS)
+    yield fout.name
+    os.unlink(fout.name)
+
+
+def make_stream():
+    #
+    # smart_open passes file objects through to its text layer, just like the
+    # streams it gets from its transports, instead of taking the shortcut.
+    #
+    fin = io.BytesIO(CONTENTS)
+    fin.name = 'stream.jsonl'
+    return fin
+
+
+def count_lines(fin):
+    with fin:
+        return sum(1 for _ in fin)
+
+
+def test_shortcut_open(benchmark, local_path):
+    assert benchmark(lambda: count_lines(smart_open.open(local_path))) == len(LINES)
+
+
+def test_text_layer(benchmark):
+    open_stream = lambda: smart_open.open(make_stream(), 'r', encoding='utf-8')  # noqa: E731
+    assert benchmark(lambda: count_lines(open_stream())) == len(LINES)
+
+
+def test_codecs_reader(benchmark):
+    """The text layer that smart_open used before it switched to TextIOWrapper."""
+    open_stream = lambda: codecs.getreader('utf-8')(make_stream())  # noqa: E731
+    assert benchmark(lambda: count_lines(open_stream())) == len(LINES)
+
+
+def test_iter_lines(benchmark):
+    def count():
+        return sum(len(batch) for batch in smart_open.iter_lines(make_stream(), encoding='utf-8'))
+    assert benchmark(count) == len(LINES)
+
+
+def test_iter_binary_lines(benchmark):
+    def count():
+        return sum(len(batch) for batch in smart_open.iter_lines(make_stream()))
+    assert benchmark(count) == len(LINES)
@@ -71,7 +71,7 @@ set +e
 git commit CHANGELOG.md -m "updated CHANGELOG.md for version $version"
 set -e
 
-python -c 'help("smart_open")' > help.txt
+python -c 'import smart_open.doctools; smart_open.doctools.build_docstrings(); help("smart_open")' > help.txt
 
 #
 # The below command will fail if there are no changes to help.txt.
@@ -17,23 +17,49 @@ The main functions are:
 
 * `open()`, which opens the given file for reading/writing
 * `parse_uri()`
+* `tail()`, which reads the end of the given file without reading all of it
+* `iter_lines()`, which iterates over the lines of the given file in batches, quickly
+* `split()`, which splits the given file into line-aligned byte ranges for parallel processing
 * `s3_iter_bucket()`, which goes over all keys in an S3 bucket in parallel
 * `register_compressor()`, which registers callbacks for transparent compressor handling
 
 """
 
+import importlib
 import logging
+import sys
+
 from smart_open import version
 
-from .smart_open_lib import open, parse_uri, smart_open, register_compressor
-from .s3 import iter_bucket as s3_iter_bucket
+from .smart_open_lib import open, parse_uri, smart_open, register_compressor, tail, iter_lines, split
+
+#
+# The transport submodules import large third-party libraries, e.g. boto3, so
+# only import them when someone uses them.  Module-level __getattr__ needs
+# Python 3.7.
+#
+_LAZY_SUBMODULES = ('asb', 'gcs', 'hdfs', 'http', 's3', 'ssh', 'webhdfs')
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name == 's3_iter_bucket':
+            from .s3 import iter_bucket
+            return iter_bucket
+        if name in _LAZY_SUBMODULES:
+            return importlib.import_module('.' + name, __name__)
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+else:
+    from .s3 import iter_bucket as s3_iter_bucket  # noqa: F401
 
 __all__ = [
+    'iter_lines',
     'open',
     'parse_uri',
     'register_compressor',
     's3_iter_bucket',
     'smart_open',
+    'split',
+    'tail',
 ]
 
 
@@ -8,12 +8,15 @@
 #
 """Implements file-like objects for reading and writing to/from Azure Storage Blob (ASB)."""
 
+import base64
+import functools
 import io
 import logging
-import base64
 
+import smart_open.blockcache
 import smart_open.bytebuffer
 import smart_open.constants
+import smart_open.utils
 
 import azure.storage.blob
 import azure.core.exceptions
@@ -58,6 +61,7 @@ def open(
         mode,
         buffer_size=DEFAULT_BUFFER_SIZE,
         client=None,  # type: azure.storage.blob.azure.storage.blob.BlobServiceClient
+        block_cache=None,
         ):
     """Open an Azure Storage Blob blob for reading or writing.
 
@@ -73,6 +77,11 @@ def open(
         The buffer size to use when performing I/O. For reading only.
     client: azure.storage.blob.azure.storage.blob.BlobServiceClient, optional
         The Azure Storage Blob client to use when working with azure-storage-blob.
+    block_cache: bool or str or smart_open.blockcache.BlockCache, optional
+        Keep the blocks read from the blob in an LRU cache, so that seeking
+        back to them does not require another request.  Pass True to use the
+        in-memory cache shared by the entire process, or the path to a local
+        directory to use a persistent cache on disk.  For reading only.
 
     """
     if mode == smart_open.constants.READ_BINARY:
@@ -82,6 +91,7 @@ def open(
             buffer_size=buffer_size,
             line_terminator=smart_open.constants.BINARY_NEWLINE,
             client=client,
+            block_cache=block_cache,
         )
     elif mode == smart_open.constants.WRITE_BINARY:
         return Writer(
@@ -93,6 +103,49 @@ def open(
         raise NotImplementedError('Azure Storage Blob support for mode %r not implemented' % mode)
 
 
+def tail_uri(uri, nbytes, transport_params):
+    parsed_uri = parse_uri(uri)
+    kwargs = smart_open.utils.check_kwargs(tail, transport_params)
+    return tail(parsed_uri['container_id'], parsed_uri['blob_id'], nbytes, **kwargs)
+
+
+def tail(
+        container_id,
+        blob_id,
+        nbytes,
+        client=None,  # type: azure.storage.blob.BlobServiceClient
+        ):
+    """Read the last nbytes of an Azure Storage Blob blob.
+
+    Azure does not support suffix ranges, so this costs two requests: one to
+    get the size of the blob, and another to download its end.
+
+    Parameters
+    ----------
+    container_id: str
+        The name of the container this object resides in.
+    blob_id: str
+        The name of the blob within the container.
+    nbytes: int
+        The number of bytes to read.
+    client: azure.storage.blob.BlobServiceClient, optional
+        The Azure Blob Storage client to use when working with azure-storage-blob.
+
+    Returns
+    -------
+    bytes
+        The end of the blob.  Shorter than nbytes if the blob is smaller.
+
+    """
+    if client is None:
+        client = azure.storage.blob.BlobServiceClient()
+    blob = client.get_container_client(container_id).get_blob_client(blob_id)
+    size = blob.get_blob_properties()['size']
+    if nbytes <= 0 or size == 0:
+        return b''
+    return _download_range(blob, max(size - nbytes, 0), size)
+
+
 class _RawReader(object):
     """Read an Azure Storage Blob file."""
 
@@ -119,6 +172,17 @@ class _RawReader(object):
         self._position += len(binary)
         return binary
 
+    def readinto(self, b):
+        if self._position >= self._size:
+            return 0
+        #
+        # The client library only gives us bytes, so this costs one copy.
+        #
+        binary = self._download_blob_chunk(len(b))
+        b[:len(binary)] = binary
+        self._position += len(binary)
+        return len(binary)
+
     def _download_blob_chunk(self, size):
         if self._size == self._position:
             #
@@ -137,6 +201,14 @@ class _RawReader(object):
         return binary
 
 
+def _download_range(asb_blob, start, stop):
+    """Download bytes from start (inclusive) to stop (exclusive) of a blob."""
+    stream = asb_blob.download_blob(offset=start, length=stop - start)
+    if isinstance(stream, azure.storage.blob.StorageStreamDownloader):
+        return stream.readall()
+    return stream.read()
+
+
 class Reader(io.BufferedIOBase):
     """Reads bytes from Azure Blob Storage.
 
@@ -152,6 +224,7 @@ class Reader(io.BufferedIOBase):
             buffer_size=DEFAULT_BUFFER_SIZE,
             line_terminator=smart_open.constants.BINARY_NEWLINE,
             client=None,  # type: azure.storage.blob.BlobServiceClient
+            block_cache=None,
     ):
         if client is None:
             client = azure.storage.blob.BlobServiceClient()
@@ -163,12 +236,27 @@ class Reader(io.BufferedIOBase):
             raise azure.core.exceptions.ResourceNotFoundError(
                 'blob %s not found in %s' % (blob, container)
             )
+        properties = self._blob.get_blob_properties()
         try:
-            self._size = self._blob.get_blob_properties()['size']
+            self._size = properties['size']
         except KeyError:
             self._size = 0
 
-        self._raw_reader = _RawReader(self._blob, self._size)
+        #
+        # We can only cache if we can tell when the blob changes.
+        #
+        cache = smart_open.blockcache.resolve(block_cache)
+        validator = properties.get('etag')
+        if cache is None or validator is None:
+            self._raw_reader = _RawReader(self._blob, self._size)
+            self._fetch_range = functools.partial(_download_range, self._blob)
+        else:
+            cache_key = (SCHEME, container, blob, validator)
+            fetch = functools.partial(_download_range, self._blob)
+            self._raw_reader = smart_open.blockcache.CachedRawReader(
+                fetch, self._size, cache, cache_key,
+            )
+            self._fetch_range = self._raw_reader.read_range
         self._position = 0
         self._current_part = smart_open.bytebuffer.ByteBuffer(buffer_size)
         self._line_terminator = line_terminator
@@ -222,6 +310,16 @@ class Reader(io.BufferedIOBase):
             new_position = self._position + offset
         else:
             new_position = self._size + offset
+        gap = new_position - self._position
+        if 0 <= gap <= len(self._current_part):
+            #
+            # The new position is already in our buffer, so there's no need
+            # to download it again.
+            #
+            self._current_part.skip(gap)
+            self._position = new_position
+            return self._position
+
         self._position = new_position
         self._raw_reader.seek(new_position)
         logger.debug('current_pos: %r', self._position)
@@ -254,7 +352,7 @@ class Reader(io.BufferedIOBase):
         if self._position == self._size:
             return self._read_from_buffer()
 
-        self._fill_buffer()
+        self._fill_buffer(size)
         return self._read_from_buffer(size)
 
     def read1(self, size=-1):
@@ -262,11 +360,35 @@ class Reader(io.BufferedIOBase):
         return self.read(size=size)
 
     def readinto(self, b):
-        """Read up to len(b) bytes into b, and return the number of bytes read."""
-        data = self.read(len(b))
-        if not data:
-            return 0
-        b[:len(data)] = data
+        """Read up to len(b) bytes into b, and return the number of bytes
+        read."""
+        return self._readinto(b, single=False)
+
+    def readinto1(self, b):
+        """Read up to len(b) bytes into b with at most one read from the
+        underlying stream, and return the number of bytes read."""
+        return self._readinto(b, single=True)
+
+    def pread(self, offset, size=-1):
+        """Read up to size bytes starting at offset, and return them.
+
+        Does not use or move the current position, so it is safe to call
+        from multiple threads, even while the stream is being read.
+        If size is negative, read until the end of the blob."""
+        if offset < 0:
+            raise ValueError('offset must be non-negative, got %r' % offset)
+        stop = self._size if size < 0 else min(offset + size, self._size)
+        if offset >= stop:
+            return b''
+        return self._fetch_range(offset, stop)
+
+    def readinto_at(self, offset, b):
+        """Read up to len(b) bytes starting at offset into b, and return the
+        number of bytes read.  Like pread, this does not move the current
+        position."""
+        dest = memoryview(b).cast('B')
+        data = self.pread(offset, len(dest))
+        dest[:len(data)] = data
         return len(data)
 
     def readline(self, limit=-1):
@@ -292,6 +414,18 @@ class Reader(io.BufferedIOBase):
                 self._fill_buffer()
         return the_line.getvalue()
 
+    def iter_lines(self, batch_size=smart_open.utils.DEFAULT_LINE_BATCH_SIZE, keepends=False):
+        """Yield lists of lines, splitting batch_size bytes at a time.
+
+        Much faster than iterating over the lines one at a time.
+        See :func:`smart_open.utils.iter_line_batches`."""
+        return smart_open.utils.iter_line_batches(
+            self,
+            batch_size=batch_size,
+            keepends=keepends,
+            terminator=self._line_terminator,
+        )
+
     #
     # Internal methods.
     #
@@ -312,6 +446,28 @@ class Reader(io.BufferedIOBase):
                 logger.debug('reached EOF while filling buffer')
                 return True
 
+    def _readinto(self, b, single):
+        """Copy unused data into b first, then read the rest from the raw
+        reader.  Requests of at least one buffer's worth skip our buffer
+        entirely.  If single is True, read from the raw reader at most once."""
+        dest = memoryview(b).cast('B')
+        total = self._current_part.readinto(dest)
+        while total < len(dest) and not (single and total):
+            remaining = dest[total:]
+            if len(remaining) >= self._current_part._chunk_size:
+                bytes_read = self._raw_reader.readinto(remaining)
+            elif self._current_part.fill(self._raw_reader):
+                bytes_read = self._current_part.readinto(remaining)
+            else:
+                bytes_read = 0
+
+            if bytes_read == 0:
+                logger.debug('reached EOF while reading into caller buffer')
+                break
+            total += bytes_read
+        self._position += total
+        return total
+
     def __enter__(self):
         return self
 
@@ -0,0 +1,542 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 Radim Rehurek <me@radimrehurek.com>
+#
+# This code is distributed under the terms and conditions
+# from the MIT License (MIT).
+#
+"""Implements a size-bounded cache of object blocks for the remote readers.
+
+Readers that support caching take a ``block_cache`` transport parameter.
+Pass ``True`` to use the in-memory cache shared by the entire process, the
+path to a directory to use a persistent :class:`DiskBlockCache` that can be
+shared between processes, or pass your own cache instance.
+
+Cached blocks are keyed by the identity of the object (including its version
+or ETag) and the offset of the block, so re-reading a part of an object that
+was fetched recently does not require another round trip.
+
+"""
+
+import collections
+import hashlib
+import logging
+import os
+import os.path
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 256 * 1024**2
+"""The default maximum number of bytes held by a cache."""
+
+DEFAULT_BLOCK_SIZE = 1024**2
+"""The default number of bytes in each cached block."""
+
+DEFAULT_DISK_MAX_SIZE = 4 * 1024**3
+"""The default maximum number of bytes held by a disk cache."""
+
+DEFAULT_DISK_BLOCK_SIZE = 8 * 1024**2
+"""The default number of bytes in each block cached on disk."""
+
+_LOCK_NAME = '.lock'
+
+
+class BlockCache(object):
+    """A thread-safe, size-bounded LRU cache of blocks.
+
+    Keeps count of hits, misses and evictions, so that you can find out how
+    effective the cache is for your workload.
+
+    Example
+    -------
+
+    >>> cache = BlockCache(max_size=8, block_size=4)
+    >>> cache.put(('s3', 'bucket', 'key', None, 4, 0), b'abcd')
+    >>> cache.put(('s3', 'bucket', 'key', None, 4, 1), b'efgh')
+    >>> cache.get(('s3', 'bucket', 'key', None, 4, 0))
+    b'abcd'
+    >>> cache.put(('s3', 'bucket', 'key', None, 4, 2), b'ijkl')
+    >>> cache.get(('s3', 'bucket', 'key', None, 4, 1)) is None
+    True
+    >>> cache.hits, cache.misses, cache.evictions
+    (1, 1, 1)
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, block_size=DEFAULT_BLOCK_SIZE):
+        """Create an empty cache.
+
+        Parameters
+        ----------
+        max_size: int, optional
+            The maximum total number of bytes to keep in the cache.
+        block_size: int, optional
+            The size of the blocks that readers should fetch when they use
+            this cache.
+        """
+        self.max_size = max_size
+        self.block_size = block_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._blocks = collections.OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of blocks in the cache."""
+        return len(self._blocks)
+
+    @property
+    def size(self):
+        """The total number of bytes held by the cache."""
+        return self._size
+
+    def get(self, key):
+        """Get a block from the cache.
+
+        Parameters
+        ----------
+        key: tuple
+            The key of the block.
+
+        Returns
+        -------
+        bytes
+            The block, or None if it isn't in the cache.
+        """
+        with self._lock:
+            try:
+                block = self._blocks[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._blocks.move_to_end(key)
+            self.hits += 1
+            return block
+
+    def put(self, key, block):
+        """Put a block into the cache, evicting the least recently used blocks
+        to make room for it if necessary.
+
+        Blocks larger than the cache itself are not cached at all.
+
+        Parameters
+        ----------
+        key: tuple
+            The key of the block.
+        block: bytes
+            The contents of the block.
+        """
+        if len(block) > self.max_size:
+            return
+
+        with self._lock:
+            old_block = self._blocks.pop(key, None)
+            if old_block is not None:
+                self._size -= len(old_block)
+
+            self._blocks[key] = block
+            self._size += len(block)
+
+            while self._size > self.max_size:
+                _, evicted = self._blocks.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all blocks from the cache.  Does not reset the counters."""
+        with self._lock:
+            self._blocks.clear()
+            self._size = 0
+
+    def stats(self):
+        """Return the counters and the current size of the cache as a dict."""
+        with self._lock:
+            return dict(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                blocks=len(self._blocks),
+                size=self._size,
+            )
+
+    def __repr__(self):
+        return '%s(max_size=%r, block_size=%r)' % (
+            self.__class__.__name__, self.max_size, self.block_size,
+        )
+
+
+class DiskBlockCache(object):
+    """A persistent cache of blocks, stored as files in a local directory.
+
+    Safe to share between threads and processes: blocks are written to a
+    temporary file and atomically renamed into place, and eviction happens
+    while holding an exclusive lock on the directory (where the platform
+    supports it).  When the total size of the cached blocks exceeds
+    max_size, the least recently used blocks are removed.  Concurrent
+    writers may push the total over the limit until the next eviction.
+
+    Blocks are immutable: freshness is guaranteed by the key, which includes
+    the version or ETag of the object, so a changed object never maps to the
+    blocks of its previous version.
+
+    The hit, miss and eviction counters are kept per process.
+    """
+
+    def __init__(self, cache_dir, max_size=DEFAULT_DISK_MAX_SIZE, block_size=DEFAULT_DISK_BLOCK_SIZE):
+        """Open a cache, creating its directory if necessary.
+
+        Parameters
+        ----------
+        cache_dir: str
+            The directory to keep the blocks in.
+        max_size: int, optional
+            The maximum total number of bytes to keep in the cache.
+        block_size: int, optional
+            The size of the blocks that readers should fetch when they use
+            this cache.
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.block_size = block_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._size = sum(size for _, _, size in self._scan())
+
+    def __len__(self):
+        """Return the number of blocks in the cache."""
+        return sum(1 for _ in self._scan())
+
+    @property
+    def size(self):
+        """The total number of bytes held by the cache, as last seen by this process."""
+        return self._size
+
+    def get(self, key):
+        """Get a block from the cache.
+
+        Parameters
+        ----------
+        key: tuple
+            The key of the block.
+
+        Returns
+        -------
+        bytes
+            The block, or None if it isn't in the cache.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as fin:
+                block = fin.read()
+        except (IOError, OSError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        #
+        # The modification time tells us which blocks were least recently used.
+        #
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        with self._lock:
+            self.hits += 1
+        return block
+
+    def put(self, key, block):
+        """Put a block into the cache, evicting the least recently used blocks
+        to make room for it if necessary.
+
+        Blocks larger than the cache itself are not cached at all.
+
+        Parameters
+        ----------
+        key: tuple
+            The key of the block.
+        block: bytes
+            The contents of the block.
+        """
+        if len(block) > self.max_size:
+            return
+
+        path = self._path(key)
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fout:
+                fout.write(block)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            self._size += len(block) - replaced
+            if self._size <= self.max_size:
+                return
+
+        self._evict()
+
+    def clear(self):
+        """Remove all blocks from the cache.  Does not reset the counters."""
+        with self._lock, self._dir_lock():
+            for path, _, _ in self._scan():
+                _unlink(path)
+            self._size = 0
+
+    def stats(self):
+        """Return the counters and the current size of the cache as a dict."""
+        with self._lock:
+            return dict(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                blocks=len(self),
+                size=self._size,
+            )
+
+    def _path(self, key):
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest)
+
+    def _scan(self):
+        """Yield the path, modification time and size of each cached block."""
+        for entry in os.scandir(self.cache_dir):
+            if not entry.is_dir():
+                continue
+            for block_entry in os.scandir(entry.path):
+                if block_entry.name.endswith('.tmp'):
+                    continue
+                try:
+                    stat = block_entry.stat()
+                except OSError:
+                    continue
+                yield block_entry.path, stat.st_mtime, stat.st_size
+
+    def _evict(self):
+        with self._lock, self._dir_lock():
+            #
+            # Other processes may have added or removed blocks, so look at
+            # what's actually on disk.
+            #
+            blocks = sorted(self._scan(), key=lambda item: item[1])
+            size = sum(block_size for _, _, block_size in blocks)
+            for path, _, block_size in blocks:
+                if size <= self.max_size:
+                    break
+                if _unlink(path):
+                    self.evictions += 1
+                size -= block_size
+            self._size = size
+
+    def _dir_lock(self):
+        return _FileLock(os.path.join(self.cache_dir, _LOCK_NAME))
+
+    def __repr__(self):
+        return '%s(%r, max_size=%r, block_size=%r)' % (
+            self.__class__.__name__, self.cache_dir, self.max_size, self.block_size,
+        )
+
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        #
+        # Another process got there first.
+        #
+        return False
+    return True
+
+
+class _FileLock(object):
+    """Holds an exclusive lock on a file for the duration of a with block.
+
+    Does nothing on platforms that lack fcntl.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._fd = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+SHARED_CACHE = BlockCache()
+"""The cache used by all readers that were opened with ``block_cache=True``."""
+
+_DISK_CACHES = {}
+_DISK_CACHES_LOCK = threading.Lock()
+
+
+def resolve(block_cache):
+    """Get the cache that corresponds to the value of a block_cache parameter.
+
+    Parameters
+    ----------
+    block_cache: bool or str or BlockCache or DiskBlockCache
+        If True, use the in-memory cache shared by the entire process.  If a
+        string, use a DiskBlockCache in that directory.  If None or False, do
+        not use a cache at all.
+
+    Returns
+    -------
+    BlockCache or DiskBlockCache
+        The cache to use, or None.
+    """
+    if block_cache is None or block_cache is False:
+        return None
+    elif block_cache is True:
+        return SHARED_CACHE
+    elif isinstance(block_cache, str):
+        cache_dir = os.path.abspath(os.path.expanduser(block_cache))
+        with _DISK_CACHES_LOCK:
+            try:
+                return _DISK_CACHES[cache_dir]
+            except KeyError:
+                cache = _DISK_CACHES[cache_dir] = DiskBlockCache(cache_dir)
+                return cache
+    return block_cache
+
+
+class CachedRawReader(object):
+    """Reads a remote object one block at a time, checking the cache before
+    fetching each block over the network.
+
+    Parameters
+    ----------
+    fetch: callable
+        Accepts the start (inclusive) and stop (exclusive) byte offsets of a
+        range and returns its contents as bytes.
+    size: int
+        The size of the remote object in bytes.
+    cache: BlockCache
+        The cache to use.
+    key: tuple
+        Uniquely identifies the object and its version, e.g.
+        ``(scheme, bucket, key, version_or_etag)``.  Cached blocks are keyed by
+        this tuple, followed by the block size and the index of the block.
+    """
+
+    def __init__(self, fetch, size, cache, key):
+        self._fetch = fetch
+        self._size = size
+        self._cache = cache
+        self._key = tuple(key) + (cache.block_size, )
+        self._position = 0
+        self._block = b''
+        self._block_index = None
+
+    def seek(self, position):
+        """Seek to the specified position (byte offset) in the object.
+
+        :param int position: The byte offset from the beginning of the object.
+
+        Returns the position after seeking.
+        """
+        self._position = position
+        return self._position
+
+    def read(self, size=-1):
+        """Read up to size bytes, but no further than the end of the current block."""
+        if size < 0:
+            parts = []
+            while True:
+                part = self.read(self._cache.block_size)
+                if not part:
+                    return b''.join(parts)
+                parts.append(part)
+
+        if self._position >= self._size:
+            return b''
+
+        index, offset = divmod(self._position, self._cache.block_size)
+        if index != self._block_index:
+            self._block = self.get_block(index)
+            self._block_index = index
+
+        part = self._block[offset:offset + size]
+        self._position += len(part)
+        return part
+
+    def readinto(self, b):
+        """Copy up to len(b) bytes into b, but no further than the end of the
+        current block.  Returns the number of bytes copied."""
+        if self._position >= self._size:
+            return 0
+
+        index, offset = divmod(self._position, self._cache.block_size)
+        if index != self._block_index:
+            self._block = self.get_block(index)
+            self._block_index = index
+
+        size = min(len(b), len(self._block) - offset)
+        b[:size] = memoryview(self._block)[offset:offset + size]
+        self._position += size
+        return size
+
+    def read_range(self, start, stop):
+        """Read bytes from start (inclusive) to stop (exclusive), block by block.
+
+        Does not affect the current position, so it is safe to call from
+        multiple threads.
+        """
+        stop = min(stop, self._size)
+        if start >= stop:
+            return b''
+        block_size = self._cache.block_size
+        parts = []
+        for index in range(start // block_size, (stop - 1) // block_size + 1):
+            offset = index * block_size
+            parts.append(self.get_block(index)[max(start - offset, 0):stop - offset])
+        return b''.join(parts)
+
+    def get_block(self, index):
+        """Get the block with the specified index from the cache, or fetch it.
+
+        Safe to call from multiple threads.
+        """
+        key = self._key + (index, )
+        block = self._cache.get(key)
+        if block is None:
+            block_size = self._cache.block_size
+            start = index * block_size
+            stop = min(start + block_size, self._size)
+            block = self._fetch(start, stop)[:block_size]
+            self._cache.put(key, block)
+        return block
+
+    def close(self):
+        """Release the current block."""
+        self._block = b''
+        self._block_index = None
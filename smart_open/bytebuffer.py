@@ -9,6 +9,17 @@
 
 import io
 
+#
+# If the storage gets this many times larger than what the buffer needs
+# (e.g. after a single large read), it gets reallocated to free memory.
+#
+_SHRINK_FACTOR = 4
+
+#
+# Reads of at least this many bytes copy through a memoryview.
+#
+_VIEW_THRESHOLD = 4096
+
 
 class ByteBuffer(object):
     """Implements a byte buffer that allows callers to read data with minimal
@@ -21,9 +32,12 @@ class ByteBuffer(object):
     the buffer is filled, hence the chunk_size parameter instead of some fixed
     capacity.
 
-    The bytes are stored in a bytestring, and previously-read bytes are freed
-    when the buffer is next filled (by slicing the bytestring into a smaller
-    copy).
+    The bytes are stored in a preallocated bytearray that grows as needed.
+    Filling the buffer writes new bytes directly after the unread ones, and
+    previously-read bytes are reclaimed by moving the unread bytes to the
+    front of the bytearray only when there is not enough room left at its end.
+    The read_view and readinto methods give access to the unread bytes without
+    creating intermediate bytestrings.
 
     Example
     -------
@@ -64,11 +78,12 @@ class ByteBuffer(object):
             or iterable when filling the buffer.
         """
         self._chunk_size = chunk_size
+        self._bytes = bytearray()
         self.empty()
 
     def __len__(self):
         """Return the number of unread bytes in the buffer as an int"""
-        return len(self._bytes) - self._pos
+        return self._end - self._pos
 
     def read(self, size=-1):
         """Read bytes from the buffer and advance the read position. Returns
@@ -88,6 +103,71 @@ class ByteBuffer(object):
         self._pos += len(part)
         return part
 
+    def read_view(self, size=-1):
+        """Read bytes from the buffer and advance the read position. Returns
+        the bytes as a memoryview of the buffer's storage, without copying.
+
+        The view is only valid until the buffer is next filled or emptied:
+        those operations may overwrite the bytes it points to.
+
+        Parameters
+        ----------
+        size: int, optional
+            Maximum number of bytes to read. If negative or not supplied, read
+            all unread bytes in the buffer.
+
+        Returns
+        -------
+        memoryview
+        """
+        if size < 0 or size > len(self):
+            size = len(self)
+
+        view = memoryview(self._bytes)[self._pos:self._pos + size]
+        self._pos += size
+        return view
+
+    def readinto(self, b):
+        """Read bytes from the buffer into a pre-allocated, writable bytes-like
+        object and advance the read position.
+
+        Parameters
+        ----------
+        b: bytes-like object
+            The destination.  At most len(b) bytes are read.
+
+        Returns
+        -------
+        int, the number of bytes read.
+        """
+        dest = memoryview(b)
+        if dest.itemsize != 1:
+            dest = dest.cast('B')
+
+        start = self._pos
+        size = min(len(dest), self._end - start)
+        dest[:size] = memoryview(self._bytes)[start:start + size]
+        self._pos += size
+        return size
+
+    def skip(self, size=-1):
+        """Advance the read position without returning any bytes.
+
+        Parameters
+        ----------
+        size: int, optional
+            Maximum number of bytes to skip. If negative or not supplied, skip
+            all unread bytes in the buffer.
+
+        Returns
+        -------
+        int, the number of bytes skipped.
+        """
+        if size < 0 or size > len(self):
+            size = len(self)
+        self._pos += size
+        return size
+
     def peek(self, size=-1):
         """Get bytes from the buffer without advancing the read position.
         Returns the bytes in a bytestring.
@@ -102,16 +182,22 @@ class ByteBuffer(object):
         -------
         bytes
         """
-        if size < 0 or size > len(self):
-            size = len(self)
+        start = self._pos
+        if size < 0 or size > self._end - start:
+            size = self._end - start
 
-        part = self._bytes[self._pos:self._pos+size]
-        return part
+        #
+        # Slicing the bytearray copies twice, but is cheaper than creating a
+        # memoryview for the small reads that readline typically makes.
+        #
+        if size < _VIEW_THRESHOLD:
+            return bytes(self._bytes[start:start + size])
+        return memoryview(self._bytes)[start:start + size].tobytes()
 
     def empty(self):
         """Remove all bytes from the buffer"""
-        self._bytes = b''
         self._pos = 0
+        self._end = 0
 
     def fill(self, source, size=-1):
         """Fill the buffer with bytes from source until one of these
@@ -120,7 +206,7 @@ class ByteBuffer(object):
             * chunk_size bytes have been read from source;
             * no more bytes can be read from source;
         Returns the number of new bytes added to the buffer.
-        Note: all previously-read bytes in the buffer are removed.
+        Note: previously-read bytes in the buffer may be overwritten.
 
         Parameters
         ----------
@@ -129,7 +215,8 @@ class ByteBuffer(object):
             the `read` attribute, it's assumed to be a file-like object and
             `read` is called to get the bytes; otherwise it's assumed to be an
             iterable or list that contains bytes, and a for loop is used to get
-            the bytes.
+            the bytes.  If the file-like object has a `readinto` attribute,
+            the bytes are read directly into the buffer instead.
         size: int, optional
             The number of bytes to try to read from source. If not supplied,
             negative, or larger than the buffer's chunk_size, then chunk_size
@@ -144,21 +231,22 @@ class ByteBuffer(object):
         size = size if size >= 0 else self._chunk_size
         size = min(size, self._chunk_size)
 
-        if self._pos != 0:
-            self._bytes = self._bytes[self._pos:]
-            self._pos = 0
+        if hasattr(source, 'readinto'):
+            self._reserve(size)
+            with memoryview(self._bytes) as view:
+                bytes_read = source.readinto(view[self._end:self._end + size]) or 0
+            self._end += bytes_read
+            return bytes_read
 
         if hasattr(source, 'read'):
-            new_bytes = source.read(size)
-        else:
-            new_bytes = b''
-            for more_bytes in source:
-                new_bytes += more_bytes
-                if len(new_bytes) >= size:
-                    break
+            return self._write(source.read(size))
 
-        self._bytes += new_bytes
-        return len(new_bytes)
+        bytes_read = 0
+        for more_bytes in source:
+            bytes_read += self._write(more_bytes)
+            if bytes_read >= size:
+                break
+        return bytes_read
 
     def readline(self, terminator):
         """Read a line from this buffer efficiently.
@@ -172,9 +260,42 @@ class ByteBuffer(object):
         :rtype: bytes
 
         """
-        index = self._bytes.find(terminator, self._pos)
+        index = self._bytes.find(terminator, self._pos, self._end)
         if index == -1:
             size = len(self)
         else:
             size = index - self._pos + 1
         return self.read(size)
+
+    def _write(self, data):
+        """Append data after the unread bytes, and return its length."""
+        size = len(data)
+        self._reserve(size)
+        self._bytes[self._end:self._end + size] = data
+        self._end += size
+        return size
+
+    def _reserve(self, size):
+        """Make room for size more bytes after the unread bytes.
+
+        Moves the unread bytes to the front of the storage if that frees enough
+        room.  Otherwise, or if the storage is much larger than what we need,
+        moves them into newly allocated storage instead.  Never resizes the
+        existing bytearray in place, because that fails while a memoryview
+        returned by read_view still exists."""
+        if self._end + size <= len(self._bytes):
+            return
+
+        unread = len(self)
+        needed = unread + size
+        capacity = len(self._bytes)
+        if needed <= capacity <= _SHRINK_FACTOR * max(needed, self._chunk_size):
+            with memoryview(self._bytes) as view:
+                view[:unread] = view[self._pos:self._end]
+        else:
+            storage = bytearray(2 * needed)
+            storage[:unread] = memoryview(self._bytes)[self._pos:self._end]
+            self._bytes = storage
+
+        self._pos = 0
+        self._end = unread
@@ -6,11 +6,42 @@
 # from the MIT License (MIT).
 #
 """Implements the compression layer of the ``smart_open`` library."""
+import collections
+import concurrent.futures
+import io
 import logging
+import os
 import os.path
+import queue
+import threading
+import time
+
+import smart_open.utils
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_WRITE_WORKERS = 1
+"""The default number of threads that compress gzip and bzip2 files for writing.
+
+If this is one, we write them with ``gzip.GzipFile`` and ``bz2.BZ2File``
+on the calling thread.  Pass ``compression_params={'workers': 4}`` to
+:func:`smart_open.open` to compress on a pool of threads instead."""
+
+DEFAULT_WRITE_CHUNK_SIZE = 4 * 1024**2
+"""The number of uncompressed bytes in each gzip member or bzip2 stream that we write."""
+
+DEFAULT_READ_AHEAD_BLOCKS = 0
+"""The number of compressed blocks to read ahead while decompressing.
+
+If this is greater than zero, a background thread reads the compressed data
+while the calling thread decompresses it, so that the network and the CPU
+work at the same time.  Zero disables reading ahead.  Pass e.g.
+``compression_params={'read_ahead_blocks': 2}`` to :func:`smart_open.open`
+to read ahead for a single file."""
+
+DEFAULT_READ_AHEAD_BLOCK_SIZE = 1024**2
+"""The number of compressed bytes in each block read ahead."""
+
 
 _COMPRESSOR_REGISTRY = {}
 
@@ -30,7 +61,8 @@ def register_compressor(ext, callback):
     callback: callable
         The callback.  It must accept two position arguments, file_obj and mode.
         This function will be called when ``smart_open`` is opening a file with
-        the specified extension.
+        the specified extension.  It may also accept keyword arguments, which
+        it gets from the compression_params of :func:`smart_open.open`.
 
     Examples
     --------
@@ -52,17 +84,426 @@ def register_compressor(ext, callback):
     _COMPRESSOR_REGISTRY[ext] = callback
 
 
-def _handle_bz2(file_obj, mode):
-    from bz2 import BZ2File
+class ParallelCompressor(io.BufferedIOBase):
+    """Compresses the data written to it on a thread pool.
+
+    Splits the data into chunks of the same size, and compresses each chunk
+    into a self-contained gzip member or bzip2 stream.  The compressed chunks
+    are written to the underlying file object in order, so the result is a
+    standard multi-member file that any decompressor can read.
+
+    zlib and bz2 release the GIL while they work, so the chunks really do get
+    compressed in parallel.
+
+    Like ``gzip.GzipFile``, does not explicitly close the underlying file object.
+    """
+    def __init__(
+            self,
+            file_obj,
+            compress,
+            chunk_size=DEFAULT_WRITE_CHUNK_SIZE,
+            workers=DEFAULT_WRITE_WORKERS,
+            ):
+        """
+        Parameters
+        ----------
+        file_obj: file-like object
+            Where to write the compressed data.
+        compress: callable
+            Compresses a chunk of bytes into a self-contained gzip member or
+            bzip2 stream, e.g. ``gzip.compress``.
+        chunk_size: int, optional
+            The number of uncompressed bytes in each chunk.
+        workers: int, optional
+            The number of threads to compress the chunks with.
+        """
+        self._file_obj = file_obj
+        self._compress = compress
+        self._chunk_size = chunk_size
+        self._workers = workers
+        self._buffer = bytearray()
+        self._pending = collections.deque()
+        self._executor = None
+        self._chunks = 0
+        self._position = 0
+        self.name = getattr(file_obj, 'name', 'unknown')
+
+    def writable(self):
+        """Return True if the stream supports writing."""
+        return True
+
+    def seekable(self):
+        """Return True, like ``gzip.GzipFile``: we can seek forward."""
+        return True
+
+    def tell(self):
+        """Return the number of uncompressed bytes written so far."""
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """Seek forward by writing zeros, like ``gzip.GzipFile`` does.
+
+        Seeking backward is unsupported, because the data before the current
+        position may already be compressed."""
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence != io.SEEK_SET:
+            raise ValueError('invalid whence (%r)' % whence)
+        if offset < self._position:
+            raise OSError('Negative seek in write mode')
+        self.write(bytes(offset - self._position))
+        return self._position
+
+    def write(self, b):
+        """Write the given buffer (bytes, bytearray, memoryview or any buffer
+        interface implementation) into the buffer. Content of the buffer will be
+        compressed and written to the underlying file object once there is
+        enough of it."""
+        if self.closed:
+            raise ValueError('I/O operation on closed file')
+        with memoryview(b) as view, view.cast('B') as data:
+            self._buffer += data
+            size = len(data)
+        self._position += size
+
+        while len(self._buffer) >= self._chunk_size:
+            chunk = bytes(self._buffer[:self._chunk_size])
+            del self._buffer[:self._chunk_size]
+            self._submit(chunk)
+        return size
+
+    def flush(self):
+        """Write the chunks that have been compressed so far.
+
+        The last chunk stays in the buffer until it is full, or the stream is
+        closed.
+        """
+        while self._pending:
+            self._file_obj.write(self._pending.popleft().result())
+
+    def close(self):
+        """Compress the remaining data, and write everything out."""
+        if self.closed:
+            return
+        try:
+            #
+            # An empty file still needs a valid (empty) member or stream.
+            #
+            if self._buffer or not self._chunks:
+                self._submit(bytes(self._buffer))
+                self._buffer = bytearray()
+            self.flush()
+        finally:
+            self._pending.clear()
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+            #
+            # Like GzipFile, let go of the file object without closing it.
+            # If nobody else holds on to it, it gets closed as it is
+            # garbage collected.
+            #
+            self._file_obj = None
+            super().close()
+
+    def detach(self):
+        """Unsupported."""
+        raise io.UnsupportedOperation
+
+    def _submit(self, chunk):
+        self._chunks += 1
+        if self._workers <= 1:
+            self._file_obj.write(self._compress(chunk))
+            return
+
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self._workers)
+        self._pending.append(self._executor.submit(self._compress, chunk))
+
+        #
+        # Keep the backlog bounded, so that we don't buffer the entire file
+        # if the workers can't keep up.
+        #
+        while len(self._pending) > 2 * self._workers:
+            self._file_obj.write(self._pending.popleft().result())
+
+    def __repr__(self):
+        return '%s(file_obj=%r, compress=%r, chunk_size=%r, workers=%r)' % (
+            self.__class__.__name__, self._file_obj, self._compress,
+            self._chunk_size, self._workers,
+        )
+
+
+class PipelinedReader(io.BufferedIOBase):
+    """Reads a binary stream ahead on a background thread.
+
+    A producer thread reads blocks from the stream into a bounded queue, and
+    the reader serves them to the decompressor.  While the decompressor and
+    the caller work on one block, the producer fetches the next ones.
+
+    Keeps track of the time spent in each stage of the pipeline, so you can
+    find out which one is the bottleneck (see :meth:`stats`).
+    """
+    def __init__(
+            self,
+            file_obj,
+            blocks=DEFAULT_READ_AHEAD_BLOCKS,
+            block_size=DEFAULT_READ_AHEAD_BLOCK_SIZE,
+            ):
+        """
+        Parameters
+        ----------
+        file_obj: file-like object
+            The stream to read from.
+        blocks: int, optional
+            The maximum number of blocks to read ahead.
+        block_size: int, optional
+            The number of bytes to read from the stream at a time.
+        """
+        self._file_obj = file_obj
+        self._blocks = max(blocks, 1)
+        self._block_size = block_size
+        self._producer = None
+        self._block = memoryview(b'')
+        self._eof = False
+        self._position = 0
+        self._returned = None
+        self._stats = _PipelineStats()
+        self.name = getattr(file_obj, 'name', 'unknown')
+
+    def stats(self):
+        """Return the time spent in each stage of the pipeline as a dict.
+
+        fetch
+            Seconds the producer spent reading from the stream.
+        stall
+            Seconds the producer waited for the consumer to make room in the
+            queue.  If this is large, decompression or the caller is the
+            bottleneck.
+        wait
+            Seconds the consumer waited for the producer.  If this is large,
+            the network is the bottleneck.
+        consume
+            Seconds the consumer spent outside of this reader, decompressing
+            and processing the data.
+        """
+        stats = self._stats
+        return dict(
+            fetch=stats.fetch,
+            stall=stats.stall,
+            wait=stats.wait,
+            consume=stats.consume,
+            bytes=stats.bytes,
+        )
+
+    #
+    # io.BufferedIOBase methods.
+    #
+    def close(self):
+        """Stop reading ahead, and close the underlying stream."""
+        logger.debug("close: called")
+        if self.closed:
+            return
+        self._stop()
+        logger.debug('%r: %r', self.name, self.stats())
+        self._file_obj.close()
+        super().close()
+
+    def readable(self):
+        """Return True if the stream can be read from."""
+        return True
+
+    def seekable(self):
+        """Return True if the underlying stream supports random access."""
+        return self._file_obj.seekable()
+
+    def detach(self):
+        """Unsupported."""
+        raise io.UnsupportedOperation
+
+    def tell(self):
+        """Return the current position within the stream."""
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """Seek to the specified position.
+
+        Stops reading ahead, discarding what was read so far.
+
+        :param int offset: The offset in bytes.
+        :param int whence: Where the offset is from.
+
+        Returns the position after seeking."""
+        if whence == io.SEEK_CUR:
+            offset, whence = self._position + offset, io.SEEK_SET
+        self._stop()
+        self._position = self._file_obj.seek(offset, whence)
+        self._block = memoryview(b'')
+        self._eof = False
+        return self._position
+
+    def read(self, size=-1):
+        """Read up to size bytes from the stream and return them."""
+        self._enter()
+        parts = []
+        while size != 0 and self._fill():
+            part = self._block[:size] if size > 0 else self._block
+            self._block = self._block[len(part):]
+            parts.append(part)
+            size -= len(part)
+        data = b''.join(parts)
+        self._position += len(data)
+        self._exit()
+        return data
+
+    def read1(self, size=-1):
+        """Read up to size bytes, from at most one block."""
+        self._enter()
+        data = b''
+        if self._fill():
+            data = bytes(self._block[:size] if size >= 0 else self._block)
+            self._block = self._block[len(data):]
+        self._position += len(data)
+        self._exit()
+        return data
+
+    def readinto(self, b):
+        """Read up to len(b) bytes into b, and return the number of bytes
+        read."""
+        with memoryview(b) as view, view.cast('B') as dest:
+            data = self.read(len(dest))
+            dest[:len(data)] = data
+        return len(data)
+
+    def _fill(self):
+        """Make sure the current block is not exhausted.  Returns False at EOF."""
+        while not self._block and not self._eof:
+            if self._producer is None:
+                self._producer = _Producer(self._file_obj, self._blocks, self._block_size, self._stats)
+
+            start = time.monotonic()
+            block = self._producer.get()
+            self._stats.wait += time.monotonic() - start
+            self._eof = not block
+            self._block = memoryview(block)
+        return bool(self._block)
+
+    def _stop(self):
+        if self._producer is not None:
+            self._producer.stop()
+            self._producer = None
+        self._returned = None
+
+    def _enter(self):
+        if self._returned is not None:
+            self._stats.consume += time.monotonic() - self._returned
+
+    def _exit(self):
+        self._returned = time.monotonic()
+
+    def __repr__(self):
+        return '%s(file_obj=%r, blocks=%r, block_size=%r)' % (
+            self.__class__.__name__, self._file_obj, self._blocks, self._block_size,
+        )
+
+
+class _PipelineStats(object):
+    def __init__(self):
+        self.fetch = self.stall = self.wait = self.consume = 0.0
+        self.bytes = 0
+
+
+class _Producer(object):
+    """Reads blocks from a stream into a bounded queue, on its own thread.
+
+    Does not hold on to the reader it works for, so that the reader can still
+    be garbage-collected (and closed) while the thread is running.
+    """
+    def __init__(self, file_obj, blocks, block_size, stats):
+        self._queue = queue.Queue(maxsize=blocks)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(file_obj, block_size, stats),
+            name='smart_open-read-ahead',
+            daemon=True,
+        )
+        self._thread.start()
+
+    def get(self):
+        item = self._queue.get()
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    def stop(self):
+        self._stopped.set()
+        #
+        # Make room in the queue, in case the thread is waiting to put a block.
+        #
+        while self._thread.is_alive():
+            try:
+                self._queue.get(timeout=0.01)
+            except queue.Empty:
+                pass
+        self._thread.join()
+
+    def _run(self, file_obj, block_size, stats):
+        while not self._stopped.is_set():
+            start = time.monotonic()
+            try:
+                block = file_obj.read(block_size)
+            except Exception as err:
+                self._put(err, stats)
+                return
+            stats.fetch += time.monotonic() - start
+            stats.bytes += len(block)
+            if not self._put(block, stats) or not block:
+                return
+
+    def _put(self, item, stats):
+        start = time.monotonic()
+        try:
+            while not self._stopped.is_set():
+                try:
+                    self._queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        finally:
+            stats.stall += time.monotonic() - start
+
+
+def _handle_bz2(file_obj, mode, workers=None):
+    from bz2 import BZ2File, compress
+    if workers is None:
+        workers = DEFAULT_WRITE_WORKERS
+    if 'r' not in mode and workers > 1:
+        return ParallelCompressor(
+            file_obj,
+            compress,
+            chunk_size=DEFAULT_WRITE_CHUNK_SIZE,
+            workers=workers,
+        )
     return BZ2File(file_obj, mode)
 
 
-def _handle_gzip(file_obj, mode):
+def _handle_gzip(file_obj, mode, workers=None):
     import gzip
+    if workers is None:
+        workers = DEFAULT_WRITE_WORKERS
+    if 'r' not in mode and workers > 1:
+        return ParallelCompressor(
+            file_obj,
+            gzip.compress,
+            chunk_size=DEFAULT_WRITE_CHUNK_SIZE,
+            workers=workers,
+        )
     return gzip.GzipFile(fileobj=file_obj, mode=mode)
 
 
-def compression_wrapper(file_obj, mode):
+def compression_wrapper(file_obj, mode, compression_params=None):
     """
     This function will wrap the file_obj with an appropriate
     [de]compression mechanism based on the extension of the filename.
@@ -72,6 +513,16 @@ def compression_wrapper(file_obj, mode):
 
     If the filename extension isn't recognized, will simply return the original
     file_obj.
+
+    compression_params are passed on as keyword arguments to the compressor
+    callback, if it accepts them, e.g. ``{'workers': 4}`` to compress gzip and
+    bzip2 files on four threads when writing.
+
+    The compression layer itself handles one parameter, read_ahead_blocks:
+    when reading, if it is greater than zero, file_obj is read ahead on a
+    background thread while the data is being decompressed (see
+    :class:`PipelinedReader`).  If it is not specified,
+    :data:`DEFAULT_READ_AHEAD_BLOCKS` applies.
     """
 
     try:
@@ -90,8 +541,17 @@ def compression_wrapper(file_obj, mode):
         callback = _COMPRESSOR_REGISTRY[ext]
     except KeyError:
         return file_obj
-    else:
-        return callback(file_obj, mode)
+
+    compression_params = dict(compression_params or {})
+    read_ahead_blocks = compression_params.pop('read_ahead_blocks', DEFAULT_READ_AHEAD_BLOCKS)
+    if 'r' in mode and read_ahead_blocks > 0:
+        file_obj = PipelinedReader(
+            file_obj,
+            blocks=read_ahead_blocks,
+            block_size=DEFAULT_READ_AHEAD_BLOCK_SIZE,
+        )
+    kwargs = smart_open.utils.check_kwargs(callback, compression_params)
+    return callback(file_obj, mode, **kwargs)
 
 
 #
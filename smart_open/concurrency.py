@@ -8,11 +8,13 @@
 
 """Common functionality for concurrent processing.
 
-The main entry point is :func:`create_pool`.
+The main entry point is :func:`create_pool`.  :func:`map_lines` uses it to
+process the lines of a single large file on several cores.
 """
 
 import contextlib
 import logging
+import os
 import warnings
 
 logger = logging.getLogger(__name__)
@@ -48,14 +50,50 @@ class DummyPool(object):
 
 
 class ConcurrentFuturesPool(object):
-    """A class that mimics multiprocessing.pool.Pool but uses concurrent futures instead of processes."""
-    def __init__(self, max_workers):
+    """A class that mimics multiprocessing.pool.Pool but uses concurrent futures instead of processes.
+
+    Parameters
+    ----------
+    max_workers: int
+        The number of worker threads.
+    max_backlog: int, optional
+        The maximum number of items submitted to the workers, but not yet
+        yielded to the caller.  Defaults to twice the number of workers.
+    """
+    def __init__(self, max_workers, max_backlog=None):
         self.executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+        self.max_backlog = max_backlog if max_backlog else 2 * max_workers
 
     def imap_unordered(self, function, items):
-        futures = [self.executor.submit(function, item) for item in items]
-        for future in concurrent.futures.as_completed(futures):
-            yield future.result()
+        """Apply function to each item, and yield the results as they complete.
+
+        Consumes items lazily: it only takes the next item once there is room
+        in the backlog, so the memory used does not depend on the number of
+        items, and the first result is available as soon as it is ready.
+        """
+        items = iter(items)
+        pending = set()
+        try:
+            while True:
+                for item in items:
+                    pending.add(self.executor.submit(function, item))
+                    if len(pending) >= self.max_backlog:
+                        break
+
+                if not pending:
+                    return
+
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+                for future in done:
+                    yield future.result()
+        finally:
+            #
+            # Don't run the remaining items if the caller stops early.
+            #
+            for future in pending:
+                future.cancel()
 
     def terminate(self):
         self.executor.shutdown(wait=True)
@@ -74,3 +112,83 @@ def create_pool(processes=1):
         pool = DummyPool()
     yield pool
     pool.terminate()
+
+
+DEFAULT_SPLIT_SIZE = 64 * 1024 * 1024
+"""The default number of bytes of the file that each :func:`map_lines` task reads."""
+
+
+def map_lines(
+        uri,
+        function,
+        workers=None,
+        n_splits=None,
+        split_size=None,
+        encoding=None,
+        transport_params=None,
+        ):
+    """Apply function to each line of the URI object, using a pool of workers.
+
+    Splits the object into line-aligned byte ranges with
+    :func:`smart_open.split`, and lets each worker read and process its
+    own range independently.
+
+    Parameters
+    ----------
+    uri: str
+        The object to read.
+    function: callable
+        The function to apply to each line.  Receives the line without its
+        terminator.  Must be picklable, e.g. defined at module level.
+    workers: int, optional
+        The number of worker processes.  Defaults to the number of CPUs.
+    n_splits: int, optional
+        The number of ranges to split the object into.
+    split_size: int, optional
+        The approximate number of bytes in each range.  Used if n_splits is
+        not specified.  Defaults to DEFAULT_SPLIT_SIZE.
+    encoding: str, optional
+        Decode lines with this encoding.  If not specified, lines are bytes.
+    transport_params: dict, optional
+        Additional parameters for the transport layer.  Must be picklable.
+
+    Yields
+    ------
+    The result of applying function to each line, in the order of the lines.
+    """
+    import smart_open.smart_open_lib
+
+    if n_splits is None and split_size is None:
+        split_size = DEFAULT_SPLIT_SIZE
+    ranges = smart_open.smart_open_lib.split(
+        uri, n_splits=n_splits, split_size=split_size, transport_params=transport_params,
+    )
+    tasks = [
+        (index, uri, byte_range, function, encoding, transport_params)
+        for (index, byte_range) in enumerate(ranges)
+    ]
+
+    #
+    # The tasks complete in any order, so hold on to the results of later
+    # ranges until all the earlier ones are done.
+    #
+    finished = {}
+    next_index = 0
+    with create_pool(processes=workers or os.cpu_count() or 1) as pool:
+        for index, results in pool.imap_unordered(_map_range, tasks):
+            finished[index] = results
+            while next_index in finished:
+                yield from finished.pop(next_index)
+                next_index += 1
+
+
+def _map_range(task):
+    import smart_open.smart_open_lib
+    import smart_open.utils
+
+    index, uri, byte_range, function, encoding, transport_params = task
+    with smart_open.smart_open_lib.open(
+            uri, 'rb', ignore_ext=True, transport_params=transport_params, byte_range=byte_range,
+            ) as fin:
+        batches = smart_open.utils.iter_line_batches(fin, encoding=encoding)
+        return index, [function(line) for batch in batches for line in batch]
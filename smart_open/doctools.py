@@ -22,6 +22,8 @@ from . import transport
 
 PLACEHOLDER = '    smart_open/doctools.py magic goes here'
 
+_TEMPLATES = {}
+
 
 def extract_kwargs(docstring):
     """Extract keyword argument documentation from a function's docstring.
@@ -168,7 +170,49 @@ def extract_examples_from_readme_rst(indent='    '):
         return indent + 'See README.rst'
 
 
-def tweak_open_docstring(f):
+def _iter_transports():
+    """Yield (scheme, submodule) for each transport that can be imported."""
+    for scheme in sorted(transport._REGISTRY):
+        if scheme == transport.NO_SCHEME:
+            continue
+        try:
+            yield scheme, transport.get_transport(scheme)
+        except ImportError:
+            pass
+
+
+def _iter_transport_names():
+    """Yield (module name, schemes) for each registered transport, without importing it."""
+    schemes_by_name = {}
+    for scheme, submodule in sorted(transport._REGISTRY.items()):
+        if scheme == transport.NO_SCHEME:
+            continue
+        name = submodule if isinstance(submodule, str) else submodule.__name__
+        schemes_by_name.setdefault(name, []).append(scheme)
+    for name, schemes in sorted(schemes_by_name.items(), key=lambda item: item[1]):
+        yield name, schemes
+
+
+def _fill_placeholder(f, text):
+    #
+    # Keep the original docstring around, so that we can fill it in again,
+    # e.g. with the full documentation from build_docstrings.
+    #
+    template = _TEMPLATES.setdefault(f, f.__doc__)
+
+    #
+    # The docstring can be None if -OO was passed to the interpreter.
+    #
+    if template:
+        f.__doc__ = template.replace(PLACEHOLDER, text)
+
+
+def tweak_open_docstring(f, full=False):
+    """Fill in the transport and compression sections of the docstring of open.
+
+    Unless full is True, only lists the transports, because documenting
+    their keyword arguments means importing all of them, which is slow.
+    """
     buf = io.StringIO()
     seen = set()
 
@@ -177,8 +221,18 @@ def tweak_open_docstring(f):
     with contextlib.redirect_stdout(buf):
         print('    smart_open supports the following transport mechanisms:')
         print()
-        for scheme, submodule in sorted(transport._REGISTRY.items()):
-            if scheme == transport.NO_SCHEME or submodule in seen:
+        if not full:
+            for name, schemes in _iter_transport_names():
+                print('    * %s (%s)' % (', '.join(schemes), name))
+            print()
+            print('    To keep importing smart_open fast, this docstring leaves out the keyword')
+            print('    arguments of each transport, and examples.  For those, see the open')
+            print('    function of the transport, e.g. help(smart_open.s3.open), or run')
+            print('    smart_open.doctools.build_docstrings() and then help(smart_open.open) again.')
+            print()
+
+        for scheme, submodule in _iter_transports() if full else ():
+            if submodule in seen:
                 continue
             seen.add(submodule)
 
@@ -193,10 +247,11 @@ def tweak_open_docstring(f):
             if kwargs:
                 print(to_docstring(kwargs, lpad=u'    '))
 
-        print('    Examples')
-        print('    --------')
-        print()
-        print(extract_examples_from_readme_rst())
+        if full:
+            print('    Examples')
+            print('    --------')
+            print()
+            print(extract_examples_from_readme_rst())
 
         print('    This function also supports transparent compression and decompression ')
         print('    using the following codecs:')
@@ -206,29 +261,34 @@ def tweak_open_docstring(f):
         print()
         print('    The function depends on the file extension to determine the appropriate codec.')
 
-    #
-    # The docstring can be None if -OO was passed to the interpreter.
-    #
-    if f.__doc__:
-        f.__doc__ = f.__doc__.replace(PLACEHOLDER, buf.getvalue())
+    _fill_placeholder(f, buf.getvalue())
+
 
+def tweak_parse_uri_docstring(f, full=False):
+    """Fill in the supported schemes section of the docstring of parse_uri.
 
-def tweak_parse_uri_docstring(f):
+    Unless full is True, leaves out the URI examples, because getting them
+    means importing every transport, which is slow.
+    """
     buf = io.StringIO()
     seen = set()
     schemes = []
     examples = []
 
-    for scheme, submodule in sorted(transport._REGISTRY.items()):
-        if scheme == transport.NO_SCHEME or submodule in seen:
-            continue
-        schemes.append(scheme)
-        seen.add(submodule)
+    if full:
+        for scheme, submodule in _iter_transports():
+            if submodule in seen:
+                continue
+            schemes.append(scheme)
+            seen.add(submodule)
 
-        try:
-            examples.extend(submodule.URI_EXAMPLES)
-        except AttributeError:
-            pass
+            try:
+                examples.extend(submodule.URI_EXAMPLES)
+            except AttributeError:
+                pass
+    else:
+        for _, names in _iter_transport_names():
+            schemes.extend(names)
 
     with contextlib.redirect_stdout(buf):
         print('    Supported URI schemes are:')
@@ -236,10 +296,25 @@ def tweak_parse_uri_docstring(f):
         for scheme in schemes:
             print('    * %s' % scheme)
         print()
-        print('    Valid URI examples::')
-        print()
-        for example in examples:
-            print('    * %s' % example)
+        if examples:
+            print('    Valid URI examples::')
+            print()
+            for example in examples:
+                print('    * %s' % example)
+        else:
+            print('    For examples of valid URIs, run smart_open.doctools.build_docstrings()')
+            print('    and then help(smart_open.parse_uri) again.')
+
+    _fill_placeholder(f, buf.getvalue())
+
 
-    if f.__doc__:
-        f.__doc__ = f.__doc__.replace(PLACEHOLDER, buf.getvalue())
+def build_docstrings():
+    """Build the full docstrings for :func:`smart_open.open` and :func:`smart_open.parse_uri`.
+
+    These document the keyword arguments and URI examples of every
+    transport, so this imports all of them.  That takes a while, so
+    ``import smart_open`` doesn't do it: call this before generating
+    documentation, e.g. help.txt.
+    """
+    from smart_open import smart_open_lib
+    smart_open_lib._tweak_docstrings(full=True)
@@ -8,6 +8,7 @@
 
 """Implements file-like objects for reading and writing to/from GCS."""
 
+import functools
 import io
 import logging
 
@@ -15,6 +16,7 @@ import google.cloud.exceptions
 import google.cloud.storage
 import google.auth.transport.requests
 
+import smart_open.blockcache
 import smart_open.bytebuffer
 import smart_open.utils
 
@@ -109,6 +111,7 @@ def open(
         buffer_size=DEFAULT_BUFFER_SIZE,
         min_part_size=_MIN_MIN_PART_SIZE,
         client=None,  # type: google.cloud.storage.Client
+        block_cache=None,
         ):
     """Open an GCS blob for reading or writing.
 
@@ -126,6 +129,11 @@ def open(
         The minimum part size for multipart uploads.  For writing only.
     client: google.cloud.storage.Client, optional
         The GCS client to use when working with google-cloud-storage.
+    block_cache: bool or str or smart_open.blockcache.BlockCache, optional
+        Keep the blocks read from the blob in an LRU cache, so that seeking
+        back to them does not require another request.  Pass True to use the
+        in-memory cache shared by the entire process, or the path to a local
+        directory to use a persistent cache on disk.  For reading only.
 
     """
     if mode == constants.READ_BINARY:
@@ -135,6 +143,7 @@ def open(
             buffer_size=buffer_size,
             line_terminator=constants.BINARY_NEWLINE,
             client=client,
+            block_cache=block_cache,
         )
     elif mode == constants.WRITE_BINARY:
         return Writer(
@@ -147,6 +156,55 @@ def open(
         raise NotImplementedError('GCS support for mode %r not implemented' % mode)
 
 
+def tail_uri(uri, nbytes, transport_params):
+    parsed_uri = parse_uri(uri)
+    kwargs = smart_open.utils.check_kwargs(tail, transport_params)
+    return tail(parsed_uri['bucket_id'], parsed_uri['blob_id'], nbytes, **kwargs)
+
+
+def tail(
+        bucket_id,
+        blob_id,
+        nbytes,
+        client=None,  # type: google.cloud.storage.Client
+        ):
+    """Read the last nbytes of a GCS blob with a single request.
+
+    Parameters
+    ----------
+    bucket_id: str
+        The name of the bucket this object resides in.
+    blob_id: str
+        The name of the blob within the bucket.
+    nbytes: int
+        The number of bytes to read.
+    client: google.cloud.storage.Client, optional
+        The GCS client to use when working with google-cloud-storage.
+
+    Returns
+    -------
+    bytes
+        The end of the blob.  Shorter than nbytes if the blob is smaller.
+
+    """
+    if nbytes <= 0:
+        return b''
+    if client is None:
+        client = google.cloud.storage.Client()
+
+    blob = client.bucket(bucket_id).blob(blob_id)
+    try:
+        #
+        # A negative start asks for the last -start bytes.
+        #
+        return blob.download_as_string(start=-nbytes)
+    except google.cloud.exceptions.RequestRangeNotSatisfiable:
+        #
+        # The blob is empty, so no range can be satisfied.
+        #
+        return b''
+
+
 class _RawReader(object):
     """Read an GCS object."""
 
@@ -173,6 +231,19 @@ class _RawReader(object):
         self._position += len(binary)
         return binary
 
+    def readinto(self, b):
+        if self._position >= self._size:
+            return 0
+        #
+        # The client library only gives us bytes, so this costs one copy.
+        # Some versions of the library treat the end of the range as
+        # inclusive, so we may get an extra byte.
+        #
+        binary = self._download_blob_chunk(len(b))[:len(b)]
+        b[:len(binary)] = binary
+        self._position += len(binary)
+        return len(binary)
+
     def _download_blob_chunk(self, size):
         start = position = self._position
         if position == self._size:
@@ -189,6 +260,15 @@ class _RawReader(object):
         return binary
 
 
+def _download_range(gcs_blob, start, stop):
+    """Download bytes from start (inclusive) to stop (exclusive) of a blob."""
+    #
+    # Some versions of google-cloud-storage treat end as inclusive, so we
+    # may get an extra byte.
+    #
+    return gcs_blob.download_as_string(start=start, end=stop)[:stop - start]
+
+
 class Reader(io.BufferedIOBase):
     """Reads bytes from GCS.
 
@@ -204,6 +284,7 @@ class Reader(io.BufferedIOBase):
             buffer_size=DEFAULT_BUFFER_SIZE,
             line_terminator=constants.BINARY_NEWLINE,
             client=None,  # type: google.cloud.storage.Client
+            block_cache=None,
     ):
         if client is None:
             client = google.cloud.storage.Client()
@@ -215,7 +296,22 @@ class Reader(io.BufferedIOBase):
 
         self._size = self._blob.size if self._blob.size is not None else 0
 
-        self._raw_reader = _RawReader(self._blob, self._size)
+        #
+        # We can only cache if we can tell when the blob changes.  The
+        # generation changes whenever the blob gets overwritten.
+        #
+        cache = smart_open.blockcache.resolve(block_cache)
+        validator = getattr(self._blob, 'generation', None) or getattr(self._blob, 'etag', None)
+        if cache is None or validator is None:
+            self._raw_reader = _RawReader(self._blob, self._size)
+            self._fetch_range = functools.partial(_download_range, self._blob)
+        else:
+            cache_key = (SCHEME, bucket, key, validator)
+            fetch = functools.partial(_download_range, self._blob)
+            self._raw_reader = smart_open.blockcache.CachedRawReader(
+                fetch, self._size, cache, cache_key,
+            )
+            self._fetch_range = self._raw_reader.read_range
         self._current_pos = 0
         self._current_part_size = buffer_size
         self._current_part = smart_open.bytebuffer.ByteBuffer(buffer_size)
@@ -272,6 +368,16 @@ class Reader(io.BufferedIOBase):
         else:
             new_position = self._size + offset
         new_position = smart_open.utils.clamp(new_position, 0, self._size)
+        gap = new_position - self._current_pos
+        if 0 <= gap <= len(self._current_part):
+            #
+            # The new position is already in our buffer, so there's no need
+            # to download it again.
+            #
+            self._current_part.skip(gap)
+            self._current_pos = new_position
+            return self._current_pos
+
         self._current_pos = new_position
         self._raw_reader.seek(new_position)
         logger.debug('current_pos: %r', self._current_pos)
@@ -321,10 +427,33 @@ class Reader(io.BufferedIOBase):
     def readinto(self, b):
         """Read up to len(b) bytes into b, and return the number of bytes
         read."""
-        data = self.read(len(b))
-        if not data:
-            return 0
-        b[:len(data)] = data
+        return self._readinto(b, single=False)
+
+    def readinto1(self, b):
+        """Read up to len(b) bytes into b with at most one read from the
+        underlying stream, and return the number of bytes read."""
+        return self._readinto(b, single=True)
+
+    def pread(self, offset, size=-1):
+        """Read up to size bytes starting at offset, and return them.
+
+        Does not use or move the current position, so it is safe to call
+        from multiple threads, even while the stream is being read.
+        If size is negative, read until the end of the blob."""
+        if offset < 0:
+            raise ValueError('offset must be non-negative, got %r' % offset)
+        stop = self._size if size < 0 else min(offset + size, self._size)
+        if offset >= stop:
+            return b''
+        return self._fetch_range(offset, stop)
+
+    def readinto_at(self, offset, b):
+        """Read up to len(b) bytes starting at offset into b, and return the
+        number of bytes read.  Like pread, this does not move the current
+        position."""
+        dest = memoryview(b).cast('B')
+        data = self.pread(offset, len(dest))
+        dest[:len(data)] = data
         return len(data)
 
     def readline(self, limit=-1):
@@ -350,6 +479,18 @@ class Reader(io.BufferedIOBase):
                 self._fill_buffer()
         return the_line.getvalue()
 
+    def iter_lines(self, batch_size=smart_open.utils.DEFAULT_LINE_BATCH_SIZE, keepends=False):
+        """Yield lists of lines, splitting batch_size bytes at a time.
+
+        Much faster than iterating over the lines one at a time.
+        See :func:`smart_open.utils.iter_line_batches`."""
+        return smart_open.utils.iter_line_batches(
+            self,
+            batch_size=batch_size,
+            keepends=keepends,
+            terminator=self._line_terminator,
+        )
+
     #
     # Internal methods.
     #
@@ -370,6 +511,28 @@ class Reader(io.BufferedIOBase):
                 logger.debug('reached EOF while filling buffer')
                 self._eof = True
 
+    def _readinto(self, b, single):
+        """Copy unused data into b first, then read the rest from the raw
+        reader.  Requests of at least one buffer's worth skip our buffer
+        entirely.  If single is True, read from the raw reader at most once."""
+        dest = memoryview(b).cast('B')
+        total = self._current_part.readinto(dest)
+        while total < len(dest) and not self._eof and not (single and total):
+            remaining = dest[total:]
+            if len(remaining) >= self._current_part._chunk_size:
+                bytes_read = self._raw_reader.readinto(remaining)
+            elif self._current_part.fill(self._raw_reader):
+                bytes_read = self._current_part.readinto(remaining)
+            else:
+                bytes_read = 0
+
+            if bytes_read == 0:
+                logger.debug('reached EOF while reading into caller buffer')
+                self._eof = True
+            total += bytes_read
+        self._current_pos += total
+        return total
+
     def __str__(self):
         return "(%s, %r, %r)" % (self.__class__.__name__, self._blob.bucket.name, self._blob.name)
 
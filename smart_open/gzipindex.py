@@ -0,0 +1,559 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 Radim Rehurek <me@radimrehurek.com>
+#
+# This code is distributed under the terms and conditions
+# from the MIT License (MIT).
+#
+"""Implements random access to gzip files through an index of checkpoints.
+
+A gzip stream can only be decompressed from the start, so seeking backwards
+in a ``gzip.GzipFile`` rewinds and decompresses everything before the new
+position again.  For a remote object, that means downloading it again.
+
+:func:`build_index` reads a gzip file once and records a checkpoint every few
+megabytes of uncompressed data: the compressed and uncompressed offsets of a
+point where decompression can restart, and the 32KB of uncompressed data that
+precede it.  A :class:`Reader` uses the index to seek to any position by
+reading from the nearest checkpoint before it, so it needs one ranged request
+and decompresses at most ``spacing`` bytes it does not return.
+
+The index is small, and can be stored next to the gzip file as a sidecar
+object:
+
+>>> from smart_open import gzipindex
+>>> gzipindex.write_index('s3://bucket/logs.gz')  # doctest: +SKIP
+>>> with gzipindex.open('s3://bucket/logs.gz') as fin:  # doctest: +SKIP
+...     fin.seek(10 * 1024**3)
+...     line = fin.readline()
+
+Decompression can only restart where the compressed data is byte-aligned: at
+the start of each gzip member, and right after a flush point (the empty stored
+block that ``Z_SYNC_FLUSH`` and ``Z_FULL_FLUSH`` emit).  Files written by
+``pigz``, ``bgzip`` or by compressors that flush periodically have plenty of
+those.  A file compressed in a single pass by ``gzip`` has none, so its index
+holds a single checkpoint and cannot make seeking any cheaper.
+
+"""
+
+import bisect
+import collections
+import io
+import logging
+import struct
+import zlib
+
+import smart_open.bytebuffer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SPACING = 4 * 1024**2
+"""The default number of uncompressed bytes between checkpoints."""
+
+DEFAULT_BUFFER_SIZE = 256 * 1024
+"""The default number of compressed bytes to read at a time."""
+
+INDEX_SUFFIX = '.gzidx'
+"""Appended to the URI of a gzip file to get the URI of its sidecar index."""
+
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+_RAW_WBITS = -zlib.MAX_WBITS
+_WINDOW_SIZE = 32 * 1024
+_TRAILER_SIZE = 8
+
+_FLUSH_MARKER = b'\x00\x00\xff\xff'
+"""The LEN and NLEN fields of the empty stored block that ends a flush."""
+
+_VERIFY_SIZE = 64 * 1024
+"""The number of bytes a restart point must decompress to, before we trust it."""
+
+_MAGIC = b'SOGZIDX1'
+_HEADER = struct.Struct('<QQ')
+_CHECKPOINT = struct.Struct('<QQBI')
+
+Checkpoint = collections.namedtuple(
+    'Checkpoint',
+    ['compressed_offset', 'uncompressed_offset', 'window'],
+)
+"""A point where decompression can restart.
+
+The window is None at the start of a gzip member.  Otherwise, the compressed
+offset points into raw deflate data, and the window holds the uncompressed
+bytes preceding the checkpoint.
+"""
+
+
+class GzipIndex(object):
+    """The checkpoints of a gzip file, in order of their offsets.
+
+    Parameters
+    ----------
+    checkpoints: list of Checkpoint
+        The checkpoints, including one at offset zero.
+    size: int
+        The uncompressed size of the file.
+
+    """
+    def __init__(self, checkpoints, size):
+        self.checkpoints = list(checkpoints)
+        self.size = size
+        self._offsets = [c.uncompressed_offset for c in self.checkpoints]
+
+    def __len__(self):
+        return len(self.checkpoints)
+
+    def find(self, offset):
+        """Return the last checkpoint at or before the uncompressed offset."""
+        return self.checkpoints[max(bisect.bisect_right(self._offsets, offset) - 1, 0)]
+
+    def dump(self, fout):
+        """Write the index to a binary file object."""
+        fout.write(_MAGIC)
+        fout.write(_HEADER.pack(len(self.checkpoints), self.size))
+        for checkpoint in self.checkpoints:
+            window = b'' if checkpoint.window is None else zlib.compress(checkpoint.window)
+            fout.write(_CHECKPOINT.pack(
+                checkpoint.compressed_offset,
+                checkpoint.uncompressed_offset,
+                checkpoint.window is not None,
+                len(window),
+            ))
+            fout.write(window)
+
+    @classmethod
+    def load(cls, fin):
+        """Read an index written by :meth:`dump` from a binary file object."""
+        if fin.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError('not a gzip index')
+        count, size = _HEADER.unpack(_read_exactly(fin, _HEADER.size))
+        checkpoints = []
+        for _ in range(count):
+            compressed, uncompressed, raw, length = _CHECKPOINT.unpack(
+                _read_exactly(fin, _CHECKPOINT.size)
+            )
+            window = zlib.decompress(_read_exactly(fin, length)) if raw else None
+            checkpoints.append(Checkpoint(compressed, uncompressed, window))
+        return cls(checkpoints, size)
+
+    def __repr__(self):
+        return '%s(checkpoints=<%d>, size=%r)' % (
+            self.__class__.__name__, len(self.checkpoints), self.size,
+        )
+
+
+def _read_exactly(fin, size):
+    data = fin.read(size)
+    if len(data) != size:
+        raise ValueError('truncated gzip index')
+    return data
+
+
+def build_index(fileobj, spacing=DEFAULT_SPACING, buffer_size=DEFAULT_BUFFER_SIZE):
+    """Read a gzip file from the start, and index its restart points.
+
+    Parameters
+    ----------
+    fileobj: file-like object
+        The compressed file, open for reading in binary mode.
+    spacing: int, optional
+        The minimum number of uncompressed bytes between checkpoints.
+    buffer_size: int, optional
+        The number of compressed bytes to read at a time.
+
+    Returns
+    -------
+    GzipIndex
+
+    """
+    builder = _IndexBuilder(spacing)
+    for chunk in iter(lambda: fileobj.read(buffer_size), b''):
+        builder.feed(chunk)
+    return builder.finish()
+
+
+class _IndexBuilder(object):
+    """Decompresses a gzip file, and keeps track of the places we can restart from.
+
+    Flush points are found by looking for their marker in the compressed
+    data, where it can also occur by chance.  So a flush point becomes a
+    checkpoint only once decompressing from it, with nothing but its window,
+    yields the same bytes as decompressing the whole file does.
+    """
+    def __init__(self, spacing):
+        self._spacing = spacing
+        self._checkpoints = [Checkpoint(0, 0, None)]
+        self._decompressor = zlib.decompressobj(_GZIP_WBITS)
+        self._offset = 0  # compressed bytes consumed so far
+        self._size = 0  # uncompressed bytes produced so far
+        self._window = bytearray()
+        self._candidate = None
+
+    def feed(self, data):
+        while data:
+            if not self._decompressor.eof:
+                data = self._feed_member(data)
+                if not data:
+                    return
+
+            #
+            # We're between members.  Skip any zero padding.
+            #
+            stripped = data.lstrip(b'\x00')
+            self._offset += len(data) - len(stripped)
+            data = stripped
+            if data:
+                if self._due():
+                    self._checkpoints.append(Checkpoint(self._offset, self._size, None))
+                self._decompressor = zlib.decompressobj(_GZIP_WBITS)
+                self._window = bytearray()
+
+    def finish(self):
+        if self._offset and not self._decompressor.eof:
+            raise EOFError('Compressed file ended before the end-of-stream marker was reached')
+        return GzipIndex(self._checkpoints, self._size)
+
+    def _feed_member(self, data):
+        """Decompress data, until the end of the current member.
+
+        Returns the data that follows the member, if any.
+        """
+        while data and not self._decompressor.eof:
+            marker = -1
+            if self._candidate is None and self._due():
+                marker = data.find(_FLUSH_MARKER)
+            cut = len(data) if marker < 0 else marker + len(_FLUSH_MARKER)
+            self._decompress(data[:cut])
+            data = data[cut:]
+            if marker >= 0 and not self._decompressor.eof:
+                self._propose()
+
+        if not self._decompressor.eof:
+            return b''
+        if self._candidate is not None:
+            self._resolve(self._candidate.trial.eof)
+        unused = self._decompressor.unused_data
+        self._offset -= len(unused)
+        return unused + data
+
+    def _due(self):
+        return self._size - self._checkpoints[-1].uncompressed_offset >= self._spacing
+
+    def _propose(self):
+        window = bytes(self._window)
+        self._candidate = _Candidate(Checkpoint(self._offset, self._size, window))
+
+    def _decompress(self, data):
+        candidate = self._candidate
+        if candidate is not None:
+            try:
+                candidate.actual += candidate.trial.decompress(
+                    candidate.trial.unconsumed_tail + data,
+                    _VERIFY_SIZE - len(candidate.actual),
+                )
+            except zlib.error:
+                self._resolve(False)
+                candidate = None
+
+        for out in _inflate(self._decompressor, data, DEFAULT_BUFFER_SIZE):
+            self._size += len(out)
+            self._window += out
+            del self._window[:-_WINDOW_SIZE]
+            if candidate is not None and len(candidate.expected) < _VERIFY_SIZE:
+                candidate.expected += out[:_VERIFY_SIZE - len(candidate.expected)]
+        self._offset += len(data)
+
+        if candidate is not None:
+            length = min(len(candidate.expected), len(candidate.actual))
+            if candidate.expected[:length] != candidate.actual[:length]:
+                self._resolve(False)
+            elif length >= _VERIFY_SIZE:
+                self._resolve(True)
+
+    def _resolve(self, accept):
+        candidate, self._candidate = self._candidate, None
+        if accept and candidate.expected == candidate.actual:
+            logger.debug('checkpoint at %r', candidate.checkpoint[:2])
+            self._checkpoints.append(candidate.checkpoint)
+
+
+class _Candidate(object):
+    """A flush point that we have not verified yet."""
+    def __init__(self, checkpoint):
+        self.checkpoint = checkpoint
+        self.trial = _decompressor(checkpoint.window)
+        self.expected = bytearray()
+        self.actual = bytearray()
+
+
+def _decompressor(window):
+    """Create a decompressor that starts at a checkpoint with the specified window."""
+    if window is None:
+        return zlib.decompressobj(_GZIP_WBITS)
+    elif window:
+        return zlib.decompressobj(_RAW_WBITS, zdict=window)
+    return zlib.decompressobj(_RAW_WBITS)
+
+
+def _inflate(decompressor, data, max_length):
+    """Decompress data, yielding at most max_length bytes at a time."""
+    while True:
+        out = decompressor.decompress(data, max_length)
+        if out:
+            yield out
+        data = decompressor.unconsumed_tail
+        if decompressor.eof or (not data and len(out) < max_length):
+            return
+
+
+def _inflate_stream(fileobj, window, buffer_size):
+    """Decompress fileobj from a checkpoint to the end of the file.
+
+    Continues into any gzip members that follow the current one.
+    """
+    decompressor = _decompressor(window)
+    #
+    # Raw deflate data stops short of the trailer of its member, so we need
+    # to skip it ourselves.
+    #
+    trailer = 0 if window is None else _TRAILER_SIZE
+    started = False
+    data = b''
+    while True:
+        if not data:
+            data = fileobj.read(buffer_size)
+            if not data:
+                if (started and not decompressor.eof) or (decompressor.eof and trailer):
+                    raise EOFError('Compressed file ended before the end-of-stream marker was reached')
+                return
+
+        if decompressor.eof:
+            skipped = min(trailer, len(data))
+            data, trailer = data[skipped:], trailer - skipped
+            #
+            # Skip any zero padding between members.
+            #
+            data = data.lstrip(b'\x00')
+            if not data:
+                continue
+            decompressor = zlib.decompressobj(_GZIP_WBITS)
+
+        started = True
+        for out in _inflate(decompressor, data, buffer_size):
+            yield out
+        data = decompressor.unused_data if decompressor.eof else b''
+
+
+class Reader(io.BufferedIOBase):
+    """Reads a gzip file, seeking with the help of its index.
+
+    Parameters
+    ----------
+    fileobj: file-like object
+        The compressed file, open for reading in binary mode.  It must be
+        seekable, unless you only ever read it from the start.
+    index: GzipIndex
+        The index of the compressed file.
+    buffer_size: int, optional
+        The number of compressed bytes to read at a time.
+
+    """
+    def __init__(self, fileobj, index, buffer_size=DEFAULT_BUFFER_SIZE):
+        self._fileobj = fileobj
+        self._index = index
+        self._buffer_size = buffer_size
+        self._buffer = smart_open.bytebuffer.ByteBuffer(buffer_size)
+        self._stream = _inflate_stream(fileobj, None, buffer_size)
+        self._position = 0
+        self._eof = False
+        self.name = getattr(fileobj, 'name', 'unknown')
+
+    @property
+    def index(self):
+        return self._index
+
+    #
+    # io.BufferedIOBase methods.
+    #
+    def close(self):
+        """Flush and close this stream."""
+        logger.debug("close: called")
+        if not self.closed:
+            self._fileobj.close()
+            self._stream = None
+        super().close()
+
+    def readable(self):
+        """Return True if the stream can be read from."""
+        return True
+
+    def seekable(self):
+        """If False, seek(), tell() and truncate() will raise IOError."""
+        return True
+
+    def detach(self):
+        """Unsupported."""
+        raise io.UnsupportedOperation
+
+    def tell(self):
+        """Return the current position within the uncompressed data."""
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """Seek to the specified position within the uncompressed data.
+
+        Restarts decompression at the nearest checkpoint before the new
+        position, unless continuing from the current position is closer.
+
+        :param int offset: The offset in bytes.
+        :param int whence: Where the offset is from.
+
+        Returns the position after seeking."""
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._index.size + offset
+        else:
+            raise ValueError('invalid whence: %r' % whence)
+        position = min(max(position, 0), self._index.size)
+
+        checkpoint = self._index.find(position)
+        if position < self._position or checkpoint.uncompressed_offset > self._position:
+            logger.debug('restarting at %r', checkpoint[:2])
+            self._fileobj.seek(checkpoint.compressed_offset)
+            self._stream = _inflate_stream(self._fileobj, checkpoint.window, self._buffer_size)
+            self._buffer.empty()
+            self._position = checkpoint.uncompressed_offset
+            self._eof = False
+        self._skip(position - self._position)
+        return self._position
+
+    def read(self, size=-1):
+        """Read up to size bytes from the object and return them."""
+        if size < 0:
+            parts = [self._buffer.read()]
+            parts.extend(self._stream or [])
+            data = b''.join(parts)
+            self._eof = True
+        else:
+            self._fill(size)
+            data = self._buffer.read(size)
+        self._position += len(data)
+        return data
+
+    def read1(self, size=-1):
+        """This is the same as read()."""
+        return self.read(size=size)
+
+    def readinto(self, b):
+        """Read up to len(b) bytes into b, and return the number of bytes
+        read."""
+        with memoryview(b) as view, view.cast('B') as dest:
+            self._fill(len(dest))
+            size = self._buffer.readinto(dest)
+        self._position += size
+        return size
+
+    def peek(self, size=-1):
+        """Return buffered bytes without advancing the position."""
+        self._fill(max(size, 1))
+        return self._buffer.peek()
+
+    def readline(self, limit=-1):
+        """Read up to and including the next newline.  Returns the bytes read."""
+        if limit != -1:
+            raise NotImplementedError('limits other than -1 not implemented yet')
+        the_line = io.BytesIO()
+        while not (self._eof and len(self._buffer) == 0):
+            remaining_buffer = self._buffer.peek()
+            if b'\n' in remaining_buffer:
+                the_line.write(self._buffer.readline(b'\n'))
+                break
+            the_line.write(self._buffer.read())
+            self._fill(1)
+        line = the_line.getvalue()
+        self._position += len(line)
+        return line
+
+    def _fill(self, size):
+        while len(self._buffer) < size and not self._eof:
+            if not self._buffer.fill(self._stream):
+                self._eof = True
+
+    def _skip(self, size):
+        while size > 0:
+            self._fill(min(size, self._buffer_size))
+            skipped = self._buffer.skip(size)
+            if not skipped:
+                break
+            self._position += skipped
+            size -= skipped
+
+    def __repr__(self):
+        return '%s(fileobj=%r, index=%r)' % (self.__class__.__name__, self._fileobj, self._index)
+
+
+def sidecar_uri(uri):
+    """Return the default URI of the index for the specified gzip file."""
+    return uri + INDEX_SUFFIX
+
+
+def write_index(uri, index_uri=None, spacing=DEFAULT_SPACING, transport_params=None):
+    """Index a gzip file, and store the index as a sidecar object.
+
+    Parameters
+    ----------
+    uri: str
+        The URI of the gzip file.
+    index_uri: str, optional
+        Where to store the index.  Defaults to the URI of the gzip file, with
+        ``.gzidx`` appended.
+    spacing: int, optional
+        The minimum number of uncompressed bytes between checkpoints.
+    transport_params: dict, optional
+        Additional parameters for the transport layer.
+
+    Returns
+    -------
+    GzipIndex
+
+    """
+    from smart_open import smart_open_lib
+    if index_uri is None:
+        index_uri = sidecar_uri(uri)
+    with smart_open_lib.open(uri, 'rb', ignore_ext=True, transport_params=transport_params) as fin:
+        index = build_index(fin, spacing=spacing)
+    with smart_open_lib.open(index_uri, 'wb', ignore_ext=True, transport_params=transport_params) as fout:
+        index.dump(fout)
+    return index
+
+
+def open(uri, index_uri=None, index=None, transport_params=None):
+    """Open a gzip file for reading, with random access through its index.
+
+    Parameters
+    ----------
+    uri: str
+        The URI of the gzip file.
+    index_uri: str, optional
+        Where the index is stored.  Defaults to the URI of the gzip file, with
+        ``.gzidx`` appended.
+    index: GzipIndex, optional
+        The index itself, if you already have it.
+    transport_params: dict, optional
+        Additional parameters for the transport layer.
+
+    Returns
+    -------
+    Reader
+
+    """
+    from smart_open import smart_open_lib
+    if index is None:
+        if index_uri is None:
+            index_uri = sidecar_uri(uri)
+        with smart_open_lib.open(index_uri, 'rb', ignore_ext=True, transport_params=transport_params) as fin:
+            index = GzipIndex.load(fin)
+    fileobj = smart_open_lib.open(uri, 'rb', ignore_ext=True, transport_params=transport_params)
+    return Reader(fileobj, index)
@@ -111,11 +111,7 @@ class CliRawInputBase(io.RawIOBase):
     def readinto(self, b):
         """Read up to len(b) bytes into b, and return the number of bytes
         read."""
-        data = self.read(len(b))
-        if not data:
-            return 0
-        b[:len(data)] = data
-        return len(data)
+        return self._sub.stdout.readinto(b)
 
 
 class CliRawOutputBase(io.RawIOBase):
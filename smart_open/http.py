@@ -15,9 +15,19 @@ import urllib.parse
 import requests
 
 from smart_open import bytebuffer, constants
+import smart_open.blockcache
 import smart_open.utils
 
 DEFAULT_BUFFER_SIZE = 128 * 1024
+DEFAULT_MIN_RANGE_SIZE = 1024**2
+"""Size of the first ranged request issued after each seek."""
+
+DEFAULT_MAX_RANGE_SIZE = 64 * 1024**2
+"""Ranged requests double in size while the reader keeps reading sequentially, up to this size."""
+
+DEFAULT_SKIP_THRESHOLD = 1024**2
+"""Seeking forward by at most this many bytes reads and discards them from the
+open connection, instead of making another request."""
 SCHEMES = ('http', 'https')
 
 logger = logging.getLogger(__name__)
@@ -46,7 +56,7 @@ def open_uri(uri, mode, transport_params):
     return open(uri, mode, **kwargs)
 
 
-def open(uri, mode, kerberos=False, user=None, password=None, headers=None):
+def open(uri, mode, kerberos=False, user=None, password=None, headers=None, block_cache=None):
     """Implement streamed reader from a web site.
 
     Supports Kerberos and Basic HTTP authentication.
@@ -67,6 +77,12 @@ def open(uri, mode, kerberos=False, user=None, password=None, headers=None):
         Any headers to send in the request. If ``None``, the default headers are sent:
         ``{'Accept-Encoding': 'identity'}``. To use no headers at all,
         set this variable to an empty dict, ``{}``.
+    block_cache: bool or str or smart_open.blockcache.BlockCache, optional
+        Keep the blocks read from the URL in an LRU cache, so that reading
+        them again does not require another request.  Pass True to use the
+        in-memory cache shared by the entire process, or the path to a local
+        directory to use a persistent cache on disk.  Only used if the server
+        supports range requests and sends an ETag or Last-Modified header.
 
     Note
     ----
@@ -77,7 +93,8 @@ def open(uri, mode, kerberos=False, user=None, password=None, headers=None):
     if mode == constants.READ_BINARY:
         fobj = SeekableBufferedInputBase(
             uri, mode, kerberos=kerberos,
-            user=user, password=password, headers=headers
+            user=user, password=password, headers=headers,
+            block_cache=block_cache,
         )
         fobj.name = os.path.basename(urllib.parse.urlparse(uri).path)
         return fobj
@@ -85,6 +102,64 @@ def open(uri, mode, kerberos=False, user=None, password=None, headers=None):
         raise NotImplementedError('http support for mode %r not implemented' % mode)
 
 
+def tail_uri(uri, nbytes, transport_params):
+    kwargs = smart_open.utils.check_kwargs(tail, transport_params)
+    return tail(uri, nbytes, **kwargs)
+
+
+def tail(uri, nbytes, kerberos=False, user=None, password=None, headers=None):
+    """Read the last nbytes of a web resource with a single request.
+
+    Parameters
+    ----------
+    uri: str
+        The URL to read from.
+    nbytes: int
+        The number of bytes to read.
+    kerberos: boolean, optional
+        If True, will attempt to use the local Kerberos credentials
+    user: str, optional
+        The username for authenticating over HTTP
+    password: str, optional
+        The password for authenticating over HTTP
+    headers: dict, optional
+        Any headers to send in the request, as for :func:`open`.
+
+    Returns
+    -------
+    bytes
+        The end of the resource.  Shorter than nbytes if the resource is smaller.
+
+    """
+    if nbytes <= 0:
+        return b''
+
+    if kerberos:
+        import requests_kerberos
+        auth = requests_kerberos.HTTPKerberosAuth()
+    elif user is not None and password is not None:
+        auth = (user, password)
+    else:
+        auth = None
+
+    headers = dict(_HEADERS if headers is None else headers)
+    headers['range'] = smart_open.utils.make_range_string(-nbytes)
+    response = requests.get(uri, auth=auth, headers=headers)
+    if response.status_code == 416:
+        #
+        # The resource is empty, so no range can be satisfied.
+        #
+        return b''
+    elif not response.ok:
+        response.raise_for_status()
+    elif response.status_code != 206:
+        #
+        # The server ignored the range and sent us the whole thing.
+        #
+        return response.content[-nbytes:]
+    return response.content
+
+
 class BufferedInputBase(io.BufferedIOBase):
     def __init__(self, url, mode='r', buffer_size=DEFAULT_BUFFER_SIZE,
                  kerberos=False, user=None, password=None, headers=None):
@@ -124,6 +199,11 @@ class BufferedInputBase(io.BufferedIOBase):
     def close(self):
         """Flush and close this stream."""
         logger.debug("close: called")
+        if self.response is not None:
+            #
+            # Don't wait for the rest of the response to arrive.
+            #
+            self.response.close()
         self.response = None
         self._read_iter = None
 
@@ -180,14 +260,48 @@ class BufferedInputBase(io.BufferedIOBase):
         """This is the same as read()."""
         return self.read(size=size)
 
+    def iter_lines(self, batch_size=smart_open.utils.DEFAULT_LINE_BATCH_SIZE, keepends=False):
+        """Yield lists of lines, splitting batch_size bytes at a time.
+
+        Much faster than iterating over the lines one at a time.
+        See :func:`smart_open.utils.iter_line_batches`."""
+        return smart_open.utils.iter_line_batches(
+            self,
+            batch_size=batch_size,
+            keepends=keepends,
+        )
+
     def readinto(self, b):
         """Read up to len(b) bytes into b, and return the number of bytes
         read."""
-        data = self.read(len(b))
-        if not data:
+        if self.response is None:
             return 0
-        b[:len(data)] = data
-        return len(data)
+        return self._readinto(b, self._read_iter)
+
+    #
+    # Internal methods.
+    #
+    def _readinto(self, b, source):
+        """Copy unused data into b first, then read the rest from source.
+
+        If source supports readinto, requests of at least one buffer's worth
+        skip our buffer entirely."""
+        dest = memoryview(b).cast('B')
+        total = self._read_buffer.readinto(dest)
+        while total < len(dest):
+            remaining = dest[total:]
+            if len(remaining) >= self.buffer_size and hasattr(source, 'readinto'):
+                bytes_read = source.readinto(remaining)
+            elif self._read_buffer.fill(source):
+                bytes_read = self._read_buffer.readinto(remaining)
+            else:
+                bytes_read = 0
+
+            if bytes_read == 0:
+                break
+            total += bytes_read
+        self._current_pos += total
+        return total
 
 
 class SeekableBufferedInputBase(BufferedInputBase):
@@ -197,7 +311,7 @@ class SeekableBufferedInputBase(BufferedInputBase):
     """
 
     def __init__(self, url, mode='r', buffer_size=DEFAULT_BUFFER_SIZE,
-                 kerberos=False, user=None, password=None, headers=None):
+                 kerberos=False, user=None, password=None, headers=None, block_cache=None):
         """
         If Kerberos is True, will attempt to use the local Kerberos credentials.
         Otherwise, will try to use "basic" HTTP authentication via username/password.
@@ -221,6 +335,12 @@ class SeekableBufferedInputBase(BufferedInputBase):
 
         self.buffer_size = buffer_size
         self.mode = mode
+
+        #
+        # Reuse connections across the many ranged requests that seeking and
+        # positional reads make.
+        #
+        self._session = requests.Session()
         self.response = self._partial_request()
 
         if not self.response.ok:
@@ -240,11 +360,91 @@ class SeekableBufferedInputBase(BufferedInputBase):
         self._read_buffer = bytebuffer.ByteBuffer(buffer_size)
         self._current_pos = 0
 
+        #
+        # We can only cache if we can tell when the resource changes.
+        #
+        self._cached_reader = None
+        cache = smart_open.blockcache.resolve(block_cache)
+        validator = self.response.headers.get('ETag') or self.response.headers.get('Last-Modified')
+        if cache is not None and self._seekable and validator:
+            self.response.close()
+            self._cached_reader = smart_open.blockcache.CachedRawReader(
+                self._fetch_range, self.content_length, cache, ('http', url, validator),
+            )
+
         #
         # This member is part of the io.BufferedIOBase interface.
         #
         self.raw = None
 
+    def close(self):
+        """Flush and close this stream."""
+        super().close()
+        if self._session is not None:
+            self._session.close()
+        self._session = None
+
+    def read(self, size=-1):
+        """
+        Mimics the read call to a filehandle object.
+        """
+        if self._cached_reader is None and size < 0 and self.response is not None:
+            #
+            # After a seek, the response covers only part of the resource,
+            # so we can't read the rest straight from it.
+            #
+            retval = self._read_buffer.read() + b''.join(self._read_iter)
+            self._current_pos += len(retval)
+            return retval
+        elif self._cached_reader is None:
+            return super(SeekableBufferedInputBase, self).read(size)
+
+        if size == 0:
+            return b''
+        elif size < 0:
+            retval = self._read_buffer.read() + self._cached_reader.read()
+        else:
+            while len(self._read_buffer) < size:
+                if self._read_buffer.fill(self._cached_reader) == 0:
+                    break
+            retval = self._read_buffer.read(size)
+
+        self._current_pos += len(retval)
+        return retval
+
+    def readinto(self, b):
+        """Read up to len(b) bytes into b, and return the number of bytes
+        read."""
+        if self._cached_reader is None:
+            return super(SeekableBufferedInputBase, self).readinto(b)
+        return self._readinto(b, self._cached_reader)
+
+    def pread(self, offset, size=-1):
+        """Read up to size bytes starting at offset, and return them.
+
+        Does not use or move the current position, so it is safe to call
+        from multiple threads, even while the stream is being read.
+        If size is negative, read until the end of the resource."""
+        if not self.seekable():
+            raise io.UnsupportedOperation('the server does not support range requests')
+        if offset < 0:
+            raise ValueError('offset must be non-negative, got %r' % offset)
+        stop = self.content_length if size < 0 else min(offset + size, self.content_length)
+        if offset >= stop:
+            return b''
+        if self._cached_reader is not None:
+            return self._cached_reader.read_range(offset, stop)
+        return self._fetch_range(offset, stop)
+
+    def readinto_at(self, offset, b):
+        """Read up to len(b) bytes starting at offset into b, and return the
+        number of bytes read.  Like pread, this does not move the current
+        position."""
+        dest = memoryview(b).cast('B')
+        data = self.pread(offset, len(dest))
+        dest[:len(data)] = data
+        return len(data)
+
     def seek(self, offset, whence=0):
         """Seek to the specified position.
 
@@ -271,19 +471,42 @@ class SeekableBufferedInputBase(BufferedInputBase):
         if self._current_pos == new_pos:
             return self._current_pos
 
+        #
+        # Short forward seeks are cheaper to satisfy from our buffer or the
+        # open connection than with another request.
+        #
+        gap = new_pos - self._current_pos
+        connected = self._cached_reader is None and self._read_iter is not None
+        if 0 < gap <= len(self._read_buffer):
+            self._current_pos += self._read_buffer.skip(gap)
+            return self._current_pos
+        elif connected and 0 < gap <= DEFAULT_SKIP_THRESHOLD:
+            self._current_pos += self._skip(gap)
+            if self._current_pos == new_pos:
+                return self._current_pos
+
         logger.debug("http seeking from current_pos: %d to new_pos: %d", self._current_pos, new_pos)
 
         self._current_pos = new_pos
 
+        if self._cached_reader is not None:
+            self._cached_reader.seek(new_pos)
+            self._read_buffer.empty()
+            return self._current_pos
+
+        if self.response is not None:
+            self.response.close()
+
         if new_pos == self.content_length:
             self.response = None
             self._read_iter = None
             self._read_buffer.empty()
         else:
-            response = self._partial_request(new_pos)
+            stop = min(new_pos + DEFAULT_MIN_RANGE_SIZE, self.content_length)
+            response = self._partial_request(new_pos, stop)
             if response.ok:
                 self.response = response
-                self._read_iter = self.response.iter_content(self.buffer_size)
+                self._read_iter = self._iter_ranges(new_pos, stop)
                 self._read_buffer.empty()
             else:
                 self.response = None
@@ -300,9 +523,53 @@ class SeekableBufferedInputBase(BufferedInputBase):
         """Unsupported."""
         raise io.UnsupportedOperation
 
-    def _partial_request(self, start_pos=None):
+    def _skip(self, size):
+        """Read and discard up to size bytes from the open connection.
+        Returns the number of bytes skipped."""
+        skipped = self._read_buffer.skip(size)
+        while skipped < size and self._read_buffer.fill(self._read_iter):
+            skipped += self._read_buffer.skip(size - skipped)
+        return skipped
+
+    def _iter_ranges(self, start, stop):
+        """Yield the content of the current response, which covers bytes
+        from start (inclusive) to stop (exclusive), and then the rest of the
+        resource, using ranged requests that double in size each time."""
+        size = stop - start
+        while True:
+            for chunk in self.response.iter_content(self.buffer_size):
+                yield chunk
+            if stop >= self.content_length:
+                return
+
+            size = min(2 * size, DEFAULT_MAX_RANGE_SIZE)
+            start, stop = stop, min(stop + size, self.content_length)
+            self.response.close()
+            self.response = self._partial_request(start, stop)
+            if not self.response.ok:
+                self.response.raise_for_status()
+
+    def _partial_request(self, start_pos=None, stop_pos=None):
+        """Request bytes from start_pos (inclusive) to stop_pos (exclusive).
+        If stop_pos is None, request everything up to the end."""
+        headers = dict(self.headers)
         if start_pos is not None:
-            self.headers.update({"range": smart_open.utils.make_range_string(start_pos)})
+            stop = None if stop_pos is None else stop_pos - 1
+            headers['range'] = smart_open.utils.make_range_string(start_pos, stop)
 
-        response = requests.get(self.url, auth=self.auth, stream=True, headers=self.headers)
+        response = self._session.get(self.url, auth=self.auth, stream=True, headers=headers)
         return response
+
+    def _fetch_range(self, start, stop):
+        """Fetch bytes from start (inclusive) to stop (exclusive)."""
+        headers = dict(self.headers)
+        headers['range'] = smart_open.utils.make_range_string(start, stop - 1)
+        response = self._session.get(self.url, auth=self.auth, headers=headers)
+        if not response.ok:
+            response.raise_for_status()
+        if response.status_code != 206:
+            #
+            # The server ignored the range and sent us the whole thing.
+            #
+            return response.content[start:stop]
+        return response.content
@@ -35,6 +35,15 @@ def open_uri(uri_as_string, mode, transport_params):
     return fobj
 
 
+def tail_uri(uri_as_string, nbytes, transport_params):
+    parsed_uri = parse_uri(uri_as_string)
+    if nbytes <= 0:
+        return b''
+    with io.open(parsed_uri['uri_path'], 'rb') as fin:
+        fin.seek(max(fin.seek(0, io.SEEK_END) - nbytes, 0))
+        return fin.read()
+
+
 def extract_local_path(uri_as_string):
     if uri_as_string.startswith('file://'):
         local_path = uri_as_string.replace('file://', '', 1)
@@ -7,16 +7,23 @@
 #
 """Implements file-like objects for reading and writing from/to AWS S3."""
 
+import bisect
+import collections
+import concurrent.futures
 import io
 import functools
 import logging
+import os
+import queue
+import threading
 import time
+import weakref
 
-import boto
 import boto3
 import botocore.client
 import botocore.exceptions
 
+import smart_open.blockcache
 import smart_open.bytebuffer
 import smart_open.concurrency
 import smart_open.utils
@@ -36,6 +43,27 @@ DEFAULT_HOST = 's3.amazonaws.com'
 
 DEFAULT_BUFFER_SIZE = 128 * 1024
 
+DEFAULT_PREFETCH_BLOCK_SIZE = 16 * 1024**2
+"""Default size of each ranged GET issued when prefetching is enabled."""
+
+DEFAULT_MIN_RANGE_SIZE = 1024**2
+"""Size of the first ranged GET issued by the reader, and of the first one after each seek."""
+
+DEFAULT_MAX_RANGE_SIZE = 64 * 1024**2
+"""Ranged GETs double in size while the reader keeps reading sequentially, up to this size."""
+
+DEFAULT_SKIP_THRESHOLD = 1024**2
+"""Seeking forward by at most this many bytes reads and discards them from the
+open connection, instead of making another request."""
+
+DEFAULT_MAX_RANGE_GAP = 1024**2
+"""Default gap below which :meth:`Reader.read_ranges` merges neighbouring ranges.
+
+Downloading this much costs about as much as the latency of another GET."""
+
+DEFAULT_RANGE_WORKERS = 8
+"""Default number of concurrent GETs issued by :meth:`Reader.read_ranges`."""
+
 URI_EXAMPLES = (
     's3://my_bucket/my_key',
     's3://my_key:my_secret@my_bucket/my_key',
@@ -46,6 +74,20 @@ _UPLOAD_ATTEMPTS = 6
 _SLEEP_SECONDS = 10
 
 
+@functools.lru_cache(maxsize=None)
+def _default_host():
+    """Return the S3 host from the legacy boto configuration, if there is one.
+
+    We import boto only here, because it is slow to import and not otherwise
+    needed.
+    """
+    try:
+        import boto
+    except ImportError:
+        return DEFAULT_HOST
+    return boto.config.get('s3', 'host', DEFAULT_HOST)
+
+
 def parse_uri(uri_as_string):
     #
     # Restrictions on bucket names and labels:
@@ -63,7 +105,7 @@ def parse_uri(uri_as_string):
     assert split_uri.scheme in SCHEMES
 
     port = DEFAULT_PORT
-    host = boto.config.get('s3', 'host', DEFAULT_HOST)
+    host = _default_host()
     ordinary_calling_format = False
     #
     # These defaults tell boto3 to look for credentials elsewhere
@@ -130,7 +172,7 @@ def _consolidate_params(uri, transport_params):
         )
         uri.update(access_id=None, access_secret=None)
     elif (uri['access_id'] and uri['access_secret']):
-        transport_params['session'] = boto3.Session(
+        transport_params['session'] = _RESOURCE_POOL.session(
             aws_access_key_id=uri['access_id'],
             aws_secret_access_key=uri['access_secret'],
         )
@@ -178,6 +220,12 @@ def open(
         multipart_upload=True,
         singlepart_upload_kwargs=None,
         object_kwargs=None,
+        prefetch_workers=0,
+        prefetch_block_size=DEFAULT_PREFETCH_BLOCK_SIZE,
+        block_cache=None,
+        max_concurrent_parts=1,
+        content_length=None,
+        etag=None,
         ):
     """Open an S3 object for reading or writing.
 
@@ -198,7 +246,8 @@ def open(
     resource_kwargs: dict, optional
         Keyword arguments to use when accessing the S3 resource for reading or writing.
     multipart_upload_kwargs: dict, optional
-        Additional parameters to pass to boto3's initiate_multipart_upload function.
+        Additional parameters to pass to boto3's initiate_multipart_upload function,
+        or to its S3.Object.put function if the object fits into a single part.
         For writing only.
     singlepart_upload_kwargs: dict, optional
         Additional parameters to pass to boto3's S3.Object.put function when using single
@@ -206,9 +255,10 @@ def open(
         For writing only.
     multipart_upload: bool, optional
         Default: `True`
-        If set to `True`, will use multipart upload for writing to S3. If set
-        to `False`, S3 upload will use the S3 Single-Part Upload API, which
-        is more ideal for small file sizes.
+        If set to `True`, will use multipart upload for writing to S3, once
+        more than min_part_size bytes have been written; smaller objects are
+        uploaded with a single PUT.  If set to `False`, S3 upload will always
+        use the S3 Single-Part Upload API, buffering the entire object in memory.
         For writing only.
     version_id: str, optional
         Version of the object, used when reading object.
@@ -216,6 +266,32 @@ def open(
     object_kwargs: dict, optional
         Additional parameters to pass to boto3's object.get function.
         Used during reading only.
+    prefetch_workers: int, optional
+        The number of ranged GET requests to keep in flight ahead of the
+        current read position.  If zero (the default), the object is read over
+        a single connection.  Prefetching helps sequential reads of large
+        objects.  For reading only.
+    prefetch_block_size: int, optional
+        The number of bytes to request with each ranged GET when prefetching.
+        Memory usage is bounded by prefetch_workers * prefetch_block_size.
+        For reading only.
+    block_cache: bool or str or smart_open.blockcache.BlockCache, optional
+        Keep the blocks read from the object in an LRU cache, so that seeking
+        back to them does not require another request.  Pass True to use the
+        in-memory cache shared by the entire process, or the path to a local
+        directory to use a persistent cache on disk.  For reading only.
+    max_concurrent_parts: int, optional
+        The number of parts to upload in parallel during a multipart upload.
+        If greater than one, parts are uploaded in the background, and up to
+        max_concurrent_parts * min_part_size bytes are buffered in memory.
+        For writing only.
+    content_length: int, optional
+        The size of the object, if the caller already knows it (e.g. from a
+        listing).  Opening the object then makes no requests until the first
+        read.  For reading only.
+    etag: str, optional
+        The ETag of the object, if the caller already knows it.  Used to
+        identify the object in the block cache.  For reading only.
 
     """
     logger.debug('%r', locals())
@@ -234,6 +310,11 @@ def open(
             session=session,
             resource_kwargs=resource_kwargs,
             object_kwargs=object_kwargs,
+            prefetch_workers=prefetch_workers,
+            prefetch_block_size=prefetch_block_size,
+            block_cache=block_cache,
+            content_length=content_length,
+            etag=etag,
         )
     elif mode == constants.WRITE_BINARY:
         if multipart_upload:
@@ -244,6 +325,7 @@ def open(
                 session=session,
                 upload_kwargs=multipart_upload_kwargs,
                 resource_kwargs=resource_kwargs,
+                max_concurrent_parts=max_concurrent_parts,
             )
         else:
             fileobj = SinglepartWriter(
@@ -260,6 +342,165 @@ def open(
     return fileobj
 
 
+def tail_uri(uri, nbytes, transport_params):
+    parsed_uri = parse_uri(uri)
+    parsed_uri, transport_params = _consolidate_params(parsed_uri, transport_params)
+    kwargs = smart_open.utils.check_kwargs(tail, transport_params)
+    return tail(parsed_uri['bucket_id'], parsed_uri['key_id'], nbytes, **kwargs)
+
+
+def tail(
+        bucket_id,
+        key_id,
+        nbytes,
+        version_id=None,
+        session=None,
+        resource_kwargs=None,
+        object_kwargs=None,
+        ):
+    """Read the last nbytes of an S3 object with a single request.
+
+    Parameters
+    ----------
+    bucket_id: str
+        The name of the bucket this object resides in.
+    key_id: str
+        The name of the key within the bucket.
+    nbytes: int
+        The number of bytes to read.
+    version_id: str, optional
+        Version of the object.  If None, will read the most recent version.
+    session: object, optional
+        The S3 session to use when working with boto3.
+    resource_kwargs: dict, optional
+        Keyword arguments to use when accessing the S3 resource.
+    object_kwargs: dict, optional
+        Additional parameters to pass to boto3's object.get function.
+
+    Returns
+    -------
+    bytes
+        The end of the object.  Shorter than nbytes if the object is smaller.
+
+    """
+    if nbytes <= 0:
+        return b''
+    if session is None:
+        session = _RESOURCE_POOL.session()
+    s3 = _RESOURCE_POOL.resource(session, resource_kwargs)
+    response, _ = _get_window(
+        s3.Object(bucket_id, key_id),
+        -nbytes,
+        None,
+        version=version_id,
+        **(object_kwargs if object_kwargs else {})
+    )
+    body = response['Body']
+    try:
+        return body.read()
+    finally:
+        body.close()
+
+
+def _make_key(kwargs):
+    """Make a hashable key out of keyword arguments, or return None if we can't."""
+    key = tuple(sorted(kwargs.items()))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+_MAX_POOLED = 8
+"""The most sessions, or resources per session, that each thread keeps around."""
+
+
+def _lru_get(cache, key, factory):
+    """Get an item from an OrderedDict used as a small LRU cache, creating it if necessary.
+
+    Values that hash by identity, e.g. botocore.config.Config, make a new key
+    every time, so the cache must be bounded to not grow forever.
+    """
+    try:
+        cache.move_to_end(key)
+        return cache[key]
+    except KeyError:
+        value = cache[key] = factory()
+        while len(cache) > _MAX_POOLED:
+            cache.popitem(last=False)
+        return value
+
+
+class _ResourcePool(object):
+    """Reuses boto3 sessions and S3 resources between calls to open.
+
+    Creating a session resolves credentials, sometimes over the network, and
+    each new resource comes with a fresh connection pool, so reusing them
+    makes opening many small objects much faster.
+
+    boto3 sessions and resources are not thread-safe, so each thread gets its
+    own.  Forked child processes start with an empty pool, because they must
+    not share connections with their parent.
+
+    This class is internal to the S3 submodule.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def session(self, **session_kwargs):
+        """Get a session created with the specified keyword arguments."""
+        key = _make_key(session_kwargs)
+        if key is None:
+            return boto3.Session(**session_kwargs)
+
+        #
+        # Include the factory in the key, so that code which replaces
+        # boto3.Session (e.g. tests using mock.patch) still gets new sessions.
+        #
+        key = (boto3.Session, ) + key
+
+        sessions = self._get_local().sessions
+        return _lru_get(sessions, key, lambda: boto3.Session(**session_kwargs))
+
+    def resource(self, session, resource_kwargs=None):
+        """Get an S3 resource created from the session with the specified keyword arguments."""
+        if resource_kwargs is None:
+            resource_kwargs = {}
+
+        key = _make_key(resource_kwargs)
+        if key is None:
+            return session.resource('s3', **resource_kwargs)
+
+        #
+        # Hold sessions weakly, so that we don't keep the sessions passed to
+        # us by the user alive forever.
+        #
+        resources_by_session = self._get_local().resources
+        try:
+            resources = resources_by_session.setdefault(session, collections.OrderedDict())
+        except TypeError:
+            return session.resource('s3', **resource_kwargs)
+
+        return _lru_get(resources, key, lambda: session.resource('s3', **resource_kwargs))
+
+    def clear(self):
+        """Forget the sessions and resources of the current thread."""
+        self._local.pid = None
+
+    def _get_local(self):
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            local.pid = os.getpid()
+            local.sessions = collections.OrderedDict()
+            local.resources = weakref.WeakKeyDictionary()
+        return local
+
+
+_RESOURCE_POOL = _ResourcePool()
+
+
 def _get(s3_object, version=None, **kwargs):
     if version is not None:
         kwargs['VersionId'] = version
@@ -273,18 +514,107 @@ def _get(s3_object, version=None, **kwargs):
         )
 
 
+def _head(s3_object, version=None, **kwargs):
+    """Get the metadata of an S3 object.
+
+    Accepts the same keyword arguments as _get, and ignores those that only
+    make sense for a GET (e.g. ResponseContentType).
+    """
+    client = s3_object.meta.client
+    members = client.meta.service_model.operation_model('HeadObject').input_shape.members
+    kwargs = {name: value for (name, value) in kwargs.items() if name in members}
+    if version is not None:
+        kwargs['VersionId'] = version
+    try:
+        return client.head_object(Bucket=s3_object.bucket_name, Key=s3_object.key, **kwargs)
+    except botocore.client.ClientError as error:
+        raise IOError(
+            'unable to access bucket: %r key: %r version: %r error: %s' % (
+                s3_object.bucket_name, s3_object.key, version, error
+            )
+        )
+
+
+def _get_window(s3_object, start, stop, version=None, **kwargs):
+    """Start fetching bytes from start (inclusive) to stop (exclusive) of an S3 object.
+
+    If start is negative and stop is None, fetch the last -start bytes instead.
+
+    Returns the response, whose body is still unread, and the size of the
+    entire object.
+    """
+    range_string = smart_open.utils.make_range_string(start, None if stop is None else stop - 1)
+    params = dict(kwargs, Range=range_string)
+    if version is not None:
+        params['VersionId'] = version
+    try:
+        response = s3_object.get(**params)
+    except botocore.client.ClientError as error:
+        if error.response.get('ResponseMetadata', {}).get('HTTPStatusCode') != 416:
+            raise IOError(
+                'unable to access bucket: %r key: %r version: %r error: %s' % (
+                    s3_object.bucket_name, s3_object.key, version, error
+                )
+            )
+        #
+        # S3 refuses to serve any range of an empty object, so get all of it.
+        #
+        response = _get(s3_object, version=version, **kwargs)
+        return response, response['ContentLength']
+    return response, int(response['ContentRange'].rpartition('/')[2])
+
+
+def _get_range(client, bucket, key, start, stop, version=None, **kwargs):
+    """Fetch bytes from start (inclusive) to stop (exclusive) of an S3 object.
+
+    Uses the low-level client, so it is safe to call from multiple threads.
+    """
+    if version is not None:
+        kwargs['VersionId'] = version
+    range_string = smart_open.utils.make_range_string(start, stop - 1)
+    logger.debug('fetching %r from %r/%r', range_string, bucket, key)
+    try:
+        response = client.get_object(Bucket=bucket, Key=key, Range=range_string, **kwargs)
+    except botocore.client.ClientError as error:
+        raise IOError(
+            'unable to access bucket: %r key: %r version: %r error: %s' % (
+                bucket, key, version, error
+            )
+        )
+    body = response['Body']
+    try:
+        return body.read()
+    finally:
+        body.close()
+
+
 class _SeekableRawReader(object):
     """Read an S3 object.
 
     This class is internal to the S3 submodule.
     """
 
-    def __init__(self, s3_object, content_length, version_id=None, object_kwargs=None):
+    def __init__(
+            self,
+            s3_object,
+            content_length,
+            version_id=None,
+            object_kwargs=None,
+            body=None,
+            body_stop=None,
+            ):
         self._object = s3_object
         self._content_length = content_length
         self._version_id = version_id
         self._position = 0
-        self._body = None
+        #
+        # If the caller already has the beginning of the object (e.g. from a
+        # GET they just made), we read from that instead of making another
+        # request.  The body covers the object up to body_stop (exclusive).
+        #
+        self._body = body
+        self._body_stop = content_length if body_stop is None else body_stop
+        self._range_size = DEFAULT_MIN_RANGE_SIZE
         self._object_kwargs = object_kwargs if object_kwargs else {}
 
     def seek(self, position):
@@ -292,19 +622,43 @@ class _SeekableRawReader(object):
 
         :param int position: The byte offset from the beginning of the key.
         """
+        gap = position - self._position
+        if self._body is not None and 0 <= gap <= DEFAULT_SKIP_THRESHOLD and \
+                position <= self._body_stop and self._skip(gap):
+            return
+
         #
-        # Close old body explicitly.
-        # When first seek() after __init__(), self._body is not exist.
+        # Close old body explicitly, so that we stop downloading the rest of
+        # its range.  When first seek() after __init__(), self._body is not exist.
         #
-        if self._body is not None:
-            self._body.close()
-        self._body = None
+        self.close()
         self._position = position
+        self._range_size = DEFAULT_MIN_RANGE_SIZE
 
-    def _load_body(self):
+    def _skip(self, size):
+        """Read and discard size bytes from the body.  Returns True if
+        successful, or False if the connection broke along the way."""
+        try:
+            while size > 0:
+                binary = self._body.read(min(size, DEFAULT_BUFFER_SIZE))
+                if not binary:
+                    break
+                size -= len(binary)
+                self._position += len(binary)
+        except botocore.exceptions.IncompleteReadError:
+            return False
+        return size == 0
+
+    def _load_body(self, stop=None):
         """Build a continuous connection with the remote peer starts from the current postion.
+
+        The connection ends at stop (exclusive), or after the current range
+        size if stop is None.
         """
-        range_string = smart_open.utils.make_range_string(self._position)
+        if stop is None:
+            stop = min(self._position + self._range_size, self._content_length)
+        self._body_stop = stop
+        range_string = smart_open.utils.make_range_string(self._position, stop - 1)
         logger.debug('content_length: %r range_string: %r', self._content_length, range_string)
 
         if self._position == self._content_length == 0 or self._position == self._content_length:
@@ -321,6 +675,29 @@ class _SeekableRawReader(object):
                 **self._object_kwargs
             )['Body']
 
+    def _ensure_body(self, size=-1):
+        """Make sure that we have a body to read size bytes from.
+
+        If size is negative, the caller wants the rest of the object, so we
+        get all of it with a single request.
+        """
+        if size < 0:
+            if self._body is None or self._body_stop < self._content_length:
+                self.close()
+                self._load_body(self._content_length)
+        elif self._body is None:
+            # When the first read() after __init__() or seek(), self._body is not exist.
+            self._load_body()
+        elif self._position >= self._body_stop:
+            #
+            # We've read the entire range, so the caller is reading
+            # sequentially.  Continue with a larger range, to keep the number
+            # of requests low.
+            #
+            self._body.close()
+            self._range_size = min(2 * self._range_size, DEFAULT_MAX_RANGE_SIZE)
+            self._load_body()
+
     def _read_from_body(self, size=-1):
         if size == -1:
             binary = self._body.read()
@@ -328,23 +705,210 @@ class _SeekableRawReader(object):
             binary = self._body.read(size)
         return binary
 
+    def _readinto_body(self, b):
+        #
+        # botocore's StreamingBody does not implement readinto, so we have to
+        # copy whatever read returns.  Other bodies, e.g. the BytesIO we use
+        # for empty objects, write into b directly.
+        #
+        readinto = getattr(self._body, 'readinto', None)
+        if readinto is not None:
+            return readinto(b) or 0
+        binary = self._body.read(len(b))
+        b[:len(binary)] = binary
+        return len(binary)
+
     def read(self, size=-1):
         """Read from the continuous connection with the remote peer."""
         if self._position >= self._content_length:
             return b''
-        if self._body is None:
-            # When the first read() after __init__() or seek(), self._body is not exist.
-            self._load_body()
+        self._ensure_body(size)
 
         try:
             binary = self._read_from_body(size)
         except botocore.exceptions.IncompleteReadError:
             # The underlying connection of the self._body was closed by the remote peer.
-            self._load_body()
+            self._load_body(self._body_stop)
             binary = self._read_from_body(size)
         self._position += len(binary)
         return binary
 
+    def readinto(self, b):
+        """Read up to len(b) bytes from the continuous connection with the
+        remote peer into b, and return the number of bytes read."""
+        if self._position >= self._content_length:
+            return 0
+        self._ensure_body(len(b))
+
+        try:
+            size = self._readinto_body(b)
+        except botocore.exceptions.IncompleteReadError:
+            self._load_body(self._body_stop)
+            size = self._readinto_body(b)
+        self._position += size
+        return size
+
+    def close(self):
+        """Release the connection with the remote peer, if any."""
+        if self._body is not None:
+            self._body.close()
+        self._body = None
+
+
+class _PrefetchingRawReader(object):
+    """Read an S3 object by fetching blocks ahead of the current position.
+
+    Keeps up to ``workers`` ranged GET requests of ``block_size`` bytes each
+    in flight, and returns their contents to the caller in order.  Blocks are
+    aligned to multiples of ``block_size`` from the start of the object.
+
+    This class is internal to the S3 submodule.
+    """
+
+    def __init__(
+            self,
+            s3_object,
+            content_length,
+            version_id=None,
+            object_kwargs=None,
+            workers=1,
+            block_size=DEFAULT_PREFETCH_BLOCK_SIZE,
+            cache=None,
+            cache_key=None,
+            ):
+        #
+        # boto3 resources are not thread-safe, but clients are, so the worker
+        # threads talk to S3 via the client underlying the object.
+        #
+        self._client = s3_object.meta.client
+        self._bucket = s3_object.bucket_name
+        self._key = s3_object.key
+        self._content_length = content_length
+        self._version_id = version_id
+        self._object_kwargs = object_kwargs if object_kwargs else {}
+        self._workers = workers
+        self._block_size = block_size
+        self._cache = cache
+        self._cache_key = tuple(cache_key) if cache_key else ()
+        self._executor = concurrent.futures.ThreadPoolExecutor(workers)
+
+        self._position = 0
+        self._next_block = 0
+        self._pending = collections.deque()
+        self._block = b''
+        self._block_offset = 0
+
+    def seek(self, position):
+        """Seek to the specified position (byte offset) in the S3 key.
+
+        Seeking forward within the blocks requested so far keeps them.
+        Otherwise, discards all blocks that have been prefetched so far.
+
+        :param int position: The byte offset from the beginning of the key.
+        """
+        requested = min(self._next_block * self._block_size, self._content_length)
+        if self._position <= position < requested:
+            self._block_offset += position - self._position
+            self._position = position
+            return
+
+        self._discard()
+        self._position = position
+        self._next_block = position // self._block_size
+        self._block_offset = position % self._block_size
+
+    def read(self, size=-1):
+        """Read up to size bytes from the prefetched blocks."""
+        if size < 0:
+            parts = []
+            while True:
+                part = self.read(self._block_size)
+                if not part:
+                    return b''.join(parts)
+                parts.append(part)
+
+        if self._position >= self._content_length:
+            return b''
+
+        while self._block_offset >= len(self._block):
+            self._next()
+
+        part = self._block[self._block_offset:self._block_offset + size]
+        self._block_offset += len(part)
+        self._position += len(part)
+        return part
+
+    def readinto(self, b):
+        """Copy up to len(b) bytes from the prefetched blocks into b, and
+        return the number of bytes copied."""
+        if self._position >= self._content_length:
+            return 0
+
+        while self._block_offset >= len(self._block):
+            self._next()
+
+        start = self._block_offset
+        size = min(len(b), len(self._block) - start)
+        b[:size] = memoryview(self._block)[start:start + size]
+        self._block_offset += size
+        self._position += size
+        return size
+
+    def close(self):
+        """Cancel all outstanding requests and release the worker threads."""
+        self._discard()
+        self._executor.shutdown(wait=False)
+
+    def _next(self):
+        """Replace the current block with the next one in order."""
+        self._schedule()
+        block_offset = self._block_offset - len(self._block)
+        self._block = self._pending.popleft().result()
+        self._block_offset = block_offset
+        self._schedule()
+
+    def _schedule(self):
+        """Keep up to self._workers requests in flight."""
+        while len(self._pending) < self._workers:
+            start = self._next_block * self._block_size
+            if start >= self._content_length:
+                break
+            self._pending.append(self._executor.submit(self._fetch_block, self._next_block))
+            self._next_block += 1
+
+    def _fetch_block(self, index):
+        """Fetch the block with the specified index, consulting the cache first."""
+        start = index * self._block_size
+        stop = min(start + self._block_size, self._content_length)
+        if self._cache is None:
+            return self._fetch(start, stop)
+
+        key = self._cache_key + (self._block_size, index)
+        block = self._cache.get(key)
+        if block is None:
+            block = self._fetch(start, stop)
+            self._cache.put(key, block)
+        return block
+
+    def _fetch(self, start, stop):
+        """Fetch bytes from start (inclusive) to stop (exclusive)."""
+        return _get_range(
+            self._client,
+            self._bucket,
+            self._key,
+            start,
+            stop,
+            version=self._version_id,
+            **self._object_kwargs
+        )
+
+    def _discard(self):
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._block = b''
+        self._block_offset = 0
+
 
 class Reader(io.BufferedIOBase):
     """Reads bytes from S3.
@@ -353,12 +917,14 @@ class Reader(io.BufferedIOBase):
 
     def __init__(self, bucket, key, version_id=None, buffer_size=DEFAULT_BUFFER_SIZE,
                  line_terminator=constants.BINARY_NEWLINE, session=None, resource_kwargs=None,
-                 object_kwargs=None):
+                 object_kwargs=None, prefetch_workers=0,
+                 prefetch_block_size=DEFAULT_PREFETCH_BLOCK_SIZE, block_cache=None,
+                 content_length=None, etag=None):
 
         self._buffer_size = buffer_size
 
         if session is None:
-            session = boto3.Session()
+            session = _RESOURCE_POOL.session()
         if resource_kwargs is None:
             resource_kwargs = {}
         if object_kwargs is None:
@@ -368,21 +934,94 @@ class Reader(io.BufferedIOBase):
         self._resource_kwargs = resource_kwargs
         self._object_kwargs = object_kwargs
 
-        s3 = session.resource('s3', **resource_kwargs)
+        s3 = _RESOURCE_POOL.resource(session, resource_kwargs)
         self._object = s3.Object(bucket, key)
         self._version_id = version_id
-        self._content_length = _get(
-            self._object,
+
+        cache = smart_open.blockcache.resolve(block_cache)
+        body = None
+        body_stop = None
+        version = None
+        if prefetch_workers or cache is not None:
+            if content_length is None or (cache is not None and not (version_id or etag)):
+                #
+                # We need to know the size of the object (and its identity,
+                # if we're caching), but the body would go unused, so ask for
+                # the metadata only.  This also fails early if the object
+                # does not exist.
+                #
+                response = _head(self._object, version=self._version_id, **self._object_kwargs)
+                content_length = response['ContentLength']
+                version = response.get('VersionId')
+                etag = response.get('ETag')
+        elif content_length is None:
+            #
+            # We need to know the size of the object, so start reading it
+            # right away.  This also fails early if the object does not exist.
+            # The body is used for the first read, so that reading a small
+            # object costs a single request.
+            #
+            response, content_length = _get_window(
+                self._object,
+                0,
+                DEFAULT_MIN_RANGE_SIZE,
+                version=self._version_id,
+                **self._object_kwargs
+            )
+            body = response['Body']
+            body_stop = min(DEFAULT_MIN_RANGE_SIZE, content_length)
+        self._content_length = content_length
+
+        #
+        # Include the version (or failing that, the ETag) in the cache key, so
+        # that we never serve stale blocks after the object gets overwritten.
+        #
+        cache_key = ('s3', bucket, key, self._version_id or version or etag)
+
+        #
+        # Positional reads go through the client, which is thread-safe, so
+        # they never interfere with the stream below.  If there's a cache,
+        # they use it too, with their own reader to keep the cursor untouched.
+        #
+        fetch = functools.partial(
+            _get_range,
+            self._object.meta.client,
+            bucket,
+            key,
             version=self._version_id,
             **self._object_kwargs
-        )['ContentLength']
-
-        self._raw_reader = _SeekableRawReader(
-            self._object,
-            self._content_length,
-            self._version_id,
-            self._object_kwargs,
         )
+        if cache is not None:
+            self._fetch_range = smart_open.blockcache.CachedRawReader(
+                fetch, self._content_length, cache, cache_key,
+            ).read_range
+        else:
+            self._fetch_range = fetch
+
+        if prefetch_workers:
+            self._raw_reader = _PrefetchingRawReader(
+                self._object,
+                self._content_length,
+                self._version_id,
+                self._object_kwargs,
+                workers=prefetch_workers,
+                block_size=prefetch_block_size,
+                cache=cache,
+                cache_key=cache_key,
+            )
+        elif cache is not None:
+            self._raw_reader = smart_open.blockcache.CachedRawReader(
+                fetch, self._content_length, cache, cache_key,
+            )
+        else:
+            self._raw_reader = _SeekableRawReader(
+                self._object,
+                self._content_length,
+                self._version_id,
+                self._object_kwargs,
+                body=body,
+                body_stop=body_stop,
+            )
         self._current_pos = 0
         self._buffer = smart_open.bytebuffer.ByteBuffer(buffer_size)
         self._eof = False
@@ -400,6 +1039,7 @@ class Reader(io.BufferedIOBase):
     def close(self):
         """Flush and close this stream."""
         logger.debug("close: called")
+        self._raw_reader.close()
         self._object = None
 
     def readable(self):
@@ -437,12 +1077,74 @@ class Reader(io.BufferedIOBase):
     def readinto(self, b):
         """Read up to len(b) bytes into b, and return the number of bytes
         read."""
-        data = self.read(len(b))
-        if not data:
-            return 0
-        b[:len(data)] = data
+        return self._readinto(b, single=False)
+
+    def readinto1(self, b):
+        """Read up to len(b) bytes into b with at most one read from the
+        underlying stream, and return the number of bytes read."""
+        return self._readinto(b, single=True)
+
+    def pread(self, offset, size=-1):
+        """Read up to size bytes starting at offset, and return them.
+
+        Does not use or move the current position, so it is safe to call
+        from multiple threads, even while the stream is being read.
+        If size is negative, read until the end of the object."""
+        if offset < 0:
+            raise ValueError('offset must be non-negative, got %r' % offset)
+        stop = self._content_length if size < 0 else min(offset + size, self._content_length)
+        if offset >= stop:
+            return b''
+        return self._fetch_range(offset, stop)
+
+    def readinto_at(self, offset, b):
+        """Read up to len(b) bytes starting at offset into b, and return the
+        number of bytes read.  Like pread, this does not move the current
+        position."""
+        dest = memoryview(b).cast('B')
+        data = self.pread(offset, len(dest))
+        dest[:len(data)] = data
         return len(data)
 
+    def read_ranges(self, ranges, max_gap=DEFAULT_MAX_RANGE_GAP, workers=DEFAULT_RANGE_WORKERS):
+        """Read many regions of the object at once.
+
+        Ranges that overlap or are at most max_gap bytes apart get merged,
+        and the merged ranges are fetched concurrently, so reading dozens of
+        small regions (e.g. the columns of a Parquet file) costs only a few
+        requests.  Like pread, this does not move the current position.
+
+        :param list ranges: (offset, length) tuples.
+        :param int max_gap: The largest gap between two ranges to merge.
+        :param int workers: The maximum number of concurrent requests.
+
+        Returns a list with the bytes of each range, in the order requested.
+        Ranges are truncated at the end of the object."""
+        wanted = []
+        for offset, length in ranges:
+            if offset < 0 or length < 0:
+                raise ValueError('invalid range: offset=%r length=%r' % (offset, length))
+            wanted.append((offset, min(offset + length, self._content_length)))
+
+        coalesced = smart_open.utils.coalesce_ranges(wanted, max_gap=max_gap)
+        logger.debug('reading %d ranges with %d requests', len(wanted), len(coalesced))
+        if len(coalesced) > 1 and workers > 1:
+            with concurrent.futures.ThreadPoolExecutor(min(workers, len(coalesced))) as executor:
+                blocks = list(executor.map(lambda r: self._fetch_range(*r), coalesced))
+        else:
+            blocks = [self._fetch_range(*r) for r in coalesced]
+
+        starts = [start for (start, _) in coalesced]
+        result = []
+        for start, stop in wanted:
+            if start >= stop:
+                result.append(b'')
+                continue
+            index = bisect.bisect_right(starts, start) - 1
+            block_start = starts[index]
+            result.append(blocks[index][start - block_start:stop - block_start])
+        return result
+
     def readline(self, limit=-1):
         """Read up to and including the next newline.  Returns the bytes read."""
         if limit != -1:
@@ -464,6 +1166,18 @@ class Reader(io.BufferedIOBase):
 
         return line.getvalue()
 
+    def iter_lines(self, batch_size=smart_open.utils.DEFAULT_LINE_BATCH_SIZE, keepends=False):
+        """Yield lists of lines, splitting batch_size bytes at a time.
+
+        Much faster than iterating over the lines one at a time.
+        See :func:`smart_open.utils.iter_line_batches`."""
+        return smart_open.utils.iter_line_batches(
+            self,
+            batch_size=batch_size,
+            keepends=keepends,
+            terminator=self._line_terminator,
+        )
+
     def seekable(self):
         """If False, seek(), tell() and truncate() will raise IOError.
 
@@ -488,6 +1202,16 @@ class Reader(io.BufferedIOBase):
         else:
             new_position = self._content_length + offset
         new_position = smart_open.utils.clamp(new_position, 0, self._content_length)
+        gap = new_position - self._current_pos
+        if 0 <= gap <= len(self._buffer):
+            #
+            # The new position is already in our buffer, so the raw reader
+            # can stay where it is.
+            #
+            self._buffer.skip(gap)
+            self._current_pos = new_position
+            return self._current_pos
+
         self._current_pos = new_position
         self._raw_reader.seek(new_position)
         logger.debug('new_position: %r', self._current_pos)
@@ -544,6 +1268,28 @@ class Reader(io.BufferedIOBase):
                 logger.debug('reached EOF while filling buffer')
                 self._eof = True
 
+    def _readinto(self, b, single):
+        """Copy unused data into b first, then read the rest from the raw
+        reader.  Requests of at least one buffer's worth skip our buffer
+        entirely.  If single is True, read from the raw reader at most once."""
+        dest = memoryview(b).cast('B')
+        total = self._buffer.readinto(dest)
+        while total < len(dest) and not self._eof and not (single and total):
+            remaining = dest[total:]
+            if len(remaining) >= self._buffer._chunk_size:
+                bytes_read = self._raw_reader.readinto(remaining)
+            elif self._buffer.fill(self._raw_reader):
+                bytes_read = self._buffer.readinto(remaining)
+            else:
+                bytes_read = 0
+
+            if bytes_read == 0:
+                logger.debug('reached EOF while reading into caller buffer')
+                self._eof = True
+            total += bytes_read
+        self._current_pos += total
+        return total
+
     def __str__(self):
         return "smart_open.s3.Reader(%r, %r)" % (
             self._object.bucket_name, self._object.key
@@ -573,6 +1319,10 @@ class Reader(io.BufferedIOBase):
 class MultipartWriter(io.BufferedIOBase):
     """Writes bytes to S3 using the multi part API.
 
+    Buffers up to min_part_size bytes before starting the multipart upload.
+    If the stream gets closed before that, uploads the data with a single PUT
+    instead.
+
     Implements the io.BufferedIOBase interface of the standard library."""
 
     def __init__(
@@ -583,13 +1333,14 @@ class MultipartWriter(io.BufferedIOBase):
             session=None,
             resource_kwargs=None,
             upload_kwargs=None,
+            max_concurrent_parts=1,
             ):
         if min_part_size < MIN_MIN_PART_SIZE:
             logger.warning("S3 requires minimum part size >= 5MB; \
 multipart upload may fail")
 
         if session is None:
-            session = boto3.Session()
+            session = _RESOURCE_POOL.session()
         if resource_kwargs is None:
             resource_kwargs = {}
         if upload_kwargs is None:
@@ -599,24 +1350,33 @@ multipart upload may fail")
         self._resource_kwargs = resource_kwargs
         self._upload_kwargs = upload_kwargs
 
-        s3 = session.resource('s3', **resource_kwargs)
-        try:
-            self._object = s3.Object(bucket, key)
-            self._min_part_size = min_part_size
-            partial = functools.partial(self._object.initiate_multipart_upload, **self._upload_kwargs)
-            self._mp = _retry_if_failed(partial)
-        except botocore.client.ClientError as error:
-            raise ValueError(
-                'the bucket %r does not exist, or is forbidden for access (%r)' % (
-                    bucket, error
-                )
-            )
+        s3 = _RESOURCE_POOL.resource(session, resource_kwargs)
+        self._object = s3.Object(bucket, key)
+        self._min_part_size = min_part_size
+
+        #
+        # We initiate the multipart upload once we have the first part ready,
+        # so that opening the writer does not cost a request.
+        #
+        self._mp = None
+        self._closed = False
 
         self._buf = io.BytesIO()
         self._total_bytes = 0
         self._total_parts = 0
         self._parts = []
 
+        #
+        # Uploads run in the background only if we're allowed to keep more
+        # than one part in flight.  Otherwise, write() blocks on each upload.
+        #
+        self._max_concurrent_parts = max_concurrent_parts
+        self._pending = collections.deque()
+        if max_concurrent_parts > 1:
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_concurrent_parts)
+        else:
+            self._executor = None
+
         #
         # This member is part of the io.BufferedIOBase interface.
         #
@@ -630,31 +1390,57 @@ multipart upload may fail")
     #
     def close(self):
         logger.debug("closing")
-        if self._buf.tell():
-            self._upload_next_part()
+        if self._closed:
+            return
 
-        if self._total_bytes and self._mp:
-            partial = functools.partial(self._mp.complete, MultipartUpload={'Parts': self._parts})
-            _retry_if_failed(partial)
-            logger.debug("completed multipart upload")
-        elif self._mp:
+        if self._mp is None:
+            #
+            # All the data fit into a single part, so we never started a
+            # multipart upload.  A single PUT is much cheaper for such small
+            # objects.  It also handles empty input, which AWS rejects with
+            # "The XML you provided was not well-formed or did not validate
+            # against our published schema" for multipart uploads.
             #
-            # AWS complains with "The XML you provided was not well-formed or
-            # did not validate against our published schema" when the input is
-            # completely empty => abort the upload, no file created.
+            logger.debug("uploading %i bytes in a single part", self._buf.tell())
+            self._buf.seek(0)
+            try:
+                self._object.put(Body=self._buf, **self._upload_kwargs)
+            except botocore.client.ClientError as error:
+                raise ValueError(
+                    'the bucket %r does not exist, or is forbidden for access (%r)' % (
+                        self._object.bucket_name, error
+                    )
+                )
+        else:
             #
-            # We work around this by creating an empty file explicitly.
+            # Parts uploaded in the background may fail only now.  Abort the
+            # upload in that case, so that it doesn't linger (and get billed)
+            # forever.
             #
-            logger.info("empty input, ignoring multipart upload")
-            assert self._mp, "no multipart upload in progress"
-            self._mp.abort()
-            self._object.put(Body=b'')
+            try:
+                if self._buf.tell():
+                    self._upload_next_part()
+
+                while self._pending:
+                    self._parts.append(self._pending.popleft().result())
+
+                partial = functools.partial(self._mp.complete, MultipartUpload={'Parts': self._parts})
+                _retry_if_failed(partial)
+            except BaseException:
+                self.terminate()
+                raise
+            logger.debug("completed multipart upload")
+
+        if self._executor is not None:
+            self._executor.shutdown()
+        self._buf = io.BytesIO()
         self._mp = None
+        self._closed = True
         logger.debug("successfully closed")
 
     @property
     def closed(self):
-        return self._mp is None
+        return self._closed
 
     def writable(self):
         """Return True if the stream supports writing."""
@@ -689,7 +1475,20 @@ multipart upload may fail")
 
     def terminate(self):
         """Cancel the underlying multipart upload."""
-        assert self._mp, "no multipart upload in progress"
+        assert not self._closed, "no multipart upload in progress"
+        self._closed = True
+        if self._mp is None:
+            return
+
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        if self._executor is not None:
+            #
+            # Parts that finish uploading after the abort would linger, so
+            # wait for the ones that are already in flight.
+            #
+            self._executor.shutdown()
         self._mp.abort()
         self._mp = None
 
@@ -709,11 +1508,60 @@ multipart upload may fail")
     # Internal methods.
     #
     def _upload_next_part(self):
+        if self._mp is None:
+            self._initiate()
+
         part_num = self._total_parts + 1
         logger.info("uploading part #%i, %i bytes (total %.3fGB)",
                     part_num, self._buf.tell(), self._total_bytes / 1024.0 ** 3)
         self._buf.seek(0)
-        part = self._mp.Part(part_num)
+
+        if self._executor is None:
+            self._parts.append(self._upload_part(part_num, self._buf))
+        else:
+            #
+            # Bound memory usage by waiting for the oldest upload to finish
+            # before starting another one.  Waiting in order also keeps
+            # self._parts sorted by part number.
+            #
+            if len(self._pending) >= self._max_concurrent_parts:
+                self._parts.append(self._pending.popleft().result())
+
+            #
+            # Fail as soon as any part fails, not only once close waits for it.
+            #
+            for future in self._pending:
+                if future.done() and future.exception() is not None:
+                    raise future.exception()
+            future = self._executor.submit(self._upload_part, part_num, self._buf)
+            self._pending.append(future)
+
+        self._total_parts += 1
+        self._buf = io.BytesIO()
+
+    def _initiate(self):
+        partial = functools.partial(self._object.initiate_multipart_upload, **self._upload_kwargs)
+        try:
+            self._mp = _retry_if_failed(partial)
+        except botocore.client.ClientError as error:
+            raise ValueError(
+                'the bucket %r does not exist, or is forbidden for access (%r)' % (
+                    self._object.bucket_name, error
+                )
+            )
+
+    def _upload_part(self, part_num, body):
+        #
+        # boto3 resources are not thread-safe, so use the underlying client.
+        #
+        partial = functools.partial(
+            self._object.meta.client.upload_part,
+            Bucket=self._object.bucket_name,
+            Key=self._object.key,
+            UploadId=self._mp.id,
+            PartNumber=part_num,
+            Body=body,
+        )
 
         #
         # Network problems in the middle of an upload are particularly
@@ -721,13 +1569,10 @@ multipart upload may fail")
         # of a temporary connection problem, so this part needs to be
         # especially robust.
         #
-        upload = _retry_if_failed(functools.partial(part.upload, Body=self._buf))
+        upload = _retry_if_failed(partial)
 
-        self._parts.append({'ETag': upload['ETag'], 'PartNumber': part_num})
         logger.debug("upload of part #%i finished" % part_num)
-
-        self._total_parts += 1
-        self._buf = io.BytesIO()
+        return {'ETag': upload['ETag'], 'PartNumber': part_num}
 
     def __enter__(self):
         return self
@@ -746,7 +1591,8 @@ multipart upload may fail")
     def __repr__(self):
         return (
             "smart_open.s3.MultipartWriter(bucket=%r, key=%r, "
-            "min_part_size=%r, session=%r, resource_kwargs=%r, upload_kwargs=%r)"
+            "min_part_size=%r, session=%r, resource_kwargs=%r, upload_kwargs=%r, "
+            "max_concurrent_parts=%r)"
         ) % (
             self._object.bucket_name,
             self._object.key,
@@ -754,6 +1600,7 @@ multipart upload may fail")
             self._session,
             self._resource_kwargs,
             self._upload_kwargs,
+            self._max_concurrent_parts,
         )
 
 
@@ -778,7 +1625,7 @@ class SinglepartWriter(io.BufferedIOBase):
         self._resource_kwargs = resource_kwargs
 
         if session is None:
-            session = boto3.Session()
+            session = _RESOURCE_POOL.session()
         if resource_kwargs is None:
             resource_kwargs = {}
         if upload_kwargs is None:
@@ -786,12 +1633,8 @@ class SinglepartWriter(io.BufferedIOBase):
 
         self._upload_kwargs = upload_kwargs
 
-        s3 = session.resource('s3', **resource_kwargs)
-        try:
-            self._object = s3.Object(bucket, key)
-            s3.meta.client.head_bucket(Bucket=bucket)
-        except botocore.client.ClientError:
-            raise ValueError('the bucket %r does not exist, or is forbidden for access' % bucket)
+        s3 = _RESOURCE_POOL.resource(session, resource_kwargs)
+        self._object = s3.Object(bucket, key)
 
         self._buf = io.BytesIO()
         self._total_bytes = 0
@@ -921,6 +1764,9 @@ def iter_bucket(
         key_limit=None,
         workers=16,
         retries=3,
+        stream_threshold=None,
+        list_workers=1,
+        list_shards=None,
         **session_kwargs):
     """
     Iterate and download all S3 objects under `s3://bucket_name/prefix`.
@@ -941,6 +1787,22 @@ def iter_bucket(
         The number of subprocesses to use.
     retries: int, optional
         The number of time to retry a failed download.
+    stream_threshold: int, optional
+        If specified, yield file-like objects instead of bytes.  Objects of at
+        most this many bytes get downloaded by the workers, and are yielded as
+        io.BytesIO.  Larger objects never get downloaded in full: they are
+        yielded as :class:`Reader` instances, which fetch data as you read
+        from them.
+    list_workers: int, optional
+        The number of threads that list the keys.  If greater than one, the
+        keys under the prefix are split into shards, which are listed
+        concurrently.  The keys are passed on to the download workers as soon
+        as they are listed.
+    list_shards: list of str, optional
+        Keys that split the prefix into shards, e.g. ``['foo/b', 'foo/m']``.
+        Each shard includes its upper boundary.  If not specified, and
+        list_workers is greater than one, each sub-prefix directly below
+        prefix (as delimited by a slash) is a shard.
     session_kwargs: dict, optional
         Keyword arguments to pass when creating a new session.
         For a list of available names and values, see:
@@ -951,8 +1813,9 @@ def iter_bucket(
     ------
     str
         The full key name (does not include the bucket name).
-    bytes
-        The full contents of the key.
+    bytes or file-like object
+        The full contents of the key, or a file-like object for reading them
+        if stream_threshold is specified.
 
     Notes
     -----
@@ -972,6 +1835,11 @@ def iter_bucket(
       >>> # limit to 10k files, using 32 parallel workers (default is 16)
       >>> for key, content in iter_bucket(bucket_name, key_limit=10000, workers=32):
       ...     print key, len(content)
+
+      >>> # stream objects larger than 100MB instead of downloading them
+      >>> for key, fin in iter_bucket(bucket_name, stream_threshold=100 * 1024**2):
+      ...     with fin:
+      ...         print key, len(fin.readline())
     """
     if accept_key is None:
         accept_key = _accept_all
@@ -986,27 +1854,66 @@ def iter_bucket(
         pass
 
     total_size, key_no = 0, -1
-    key_iterator = _list_bucket(
-        bucket_name,
-        prefix=prefix,
-        accept_key=accept_key,
-        **session_kwargs)
-    download_key = functools.partial(
-        _download_key,
-        bucket_name=bucket_name,
-        retries=retries,
-        **session_kwargs)
+    if list_workers > 1 or list_shards is not None:
+        object_iterator = _list_bucket_objects_parallel(
+            bucket_name,
+            prefix=prefix,
+            accept_key=accept_key,
+            workers=list_workers,
+            shards=list_shards,
+            **session_kwargs)
+    else:
+        object_iterator = _list_bucket_objects(
+            bucket_name,
+            prefix=prefix,
+            accept_key=accept_key,
+            **session_kwargs)
+
+    if stream_threshold is None:
+        key_iterator = (key for key, _ in object_iterator)
+        download_key = functools.partial(
+            _download_key,
+            bucket_name=bucket_name,
+            retries=retries,
+            **session_kwargs)
+    else:
+        key_iterator = object_iterator
+        download_key = functools.partial(
+            _download_small_key,
+            stream_threshold=stream_threshold,
+            bucket_name=bucket_name,
+            retries=retries,
+            **session_kwargs)
 
     with smart_open.concurrency.create_pool(processes=workers) as pool:
         result_iterator = pool.imap_unordered(download_key, key_iterator)
         for key_no, (key, content) in enumerate(result_iterator):
+            if stream_threshold is None:
+                size = len(content)
+            elif isinstance(content, bytes):
+                size = len(content)
+                content = io.BytesIO(content)
+            else:
+                #
+                # The worker skipped this key because it is too large, and
+                # told us its size instead.  The reader won't make any
+                # requests until the caller starts reading.
+                #
+                size = content
+                content = Reader(
+                    bucket_name,
+                    key,
+                    session=_RESOURCE_POOL.session(**session_kwargs),
+                    content_length=size,
+                )
+
             if True or key_no % 1000 == 0:
                 logger.info(
                     "yielding key #%i: %s, size %i (total %.1fMB)",
-                    key_no, key, len(content), total_size / 1024.0 ** 2
+                    key_no, key, size, total_size / 1024.0 ** 2
                 )
             yield key, content
-            total_size += len(content)
+            total_size += size
 
             if key_limit is not None and key_no + 1 >= key_limit:
                 # we were asked to output only a limited number of keys => we're done
@@ -1019,30 +1926,156 @@ def _list_bucket(
         prefix='',
         accept_key=lambda k: True,
         **session_kwargs):
-    session = boto3.session.Session(**session_kwargs)
+    for key, _ in _list_bucket_objects(bucket_name, prefix, accept_key, **session_kwargs):
+        yield key
+
+
+def _list_bucket_objects(
+        bucket_name,
+        prefix='',
+        accept_key=lambda k: True,
+        **session_kwargs):
+    """Yield the key and size of each accepted object."""
+    session = _RESOURCE_POOL.session(**session_kwargs)
     client = session.client('s3')
-    ctoken = None
 
+    for response in _list_pages(client, Bucket=bucket_name, Prefix=prefix):
+        for c in response.get('Contents', []):
+            key = c['Key']
+            if accept_key(key):
+                yield key, c['Size']
+
+
+def _list_pages(client, **kwargs):
+    """Yield each page of the response to list_objects_v2."""
     while True:
+        response = client.list_objects_v2(**kwargs)
+        yield response
         # list_objects_v2 doesn't like a None value for ContinuationToken
         # so we don't set it if we don't have one.
-        if ctoken:
-            kwargs = dict(Bucket=bucket_name, Prefix=prefix, ContinuationToken=ctoken)
-        else:
-            kwargs = dict(Bucket=bucket_name, Prefix=prefix)
-        response = client.list_objects_v2(**kwargs)
-        try:
-            content = response['Contents']
-        except KeyError:
-            pass
-        else:
-            for c in content:
-                key = c['Key']
-                if accept_key(key):
-                    yield key
         ctoken = response.get('NextContinuationToken', None)
         if not ctoken:
             break
+        kwargs['ContinuationToken'] = ctoken
+
+
+_SHARD_DONE = object()
+"""Signals that a shard has been listed completely."""
+
+
+def _list_bucket_objects_parallel(
+        bucket_name,
+        prefix='',
+        accept_key=lambda k: True,
+        workers=4,
+        shards=None,
+        **session_kwargs):
+    """Yield the key and size of each accepted object, listing several shards
+    of the prefix concurrently.
+
+    Parameters
+    ----------
+    workers: int, optional
+        The number of shards to list at the same time.
+    shards: list of str, optional
+        Keys that split the prefix into ranges, e.g. ``['b', 'm', 't']``.
+        Each range includes its upper boundary.  If not specified, the shards
+        are the sub-prefixes right below prefix, as delimited by a slash.
+        They get discovered while listing the keys directly below prefix.
+
+    The keys are yielded as their pages arrive, so they are not sorted.
+    """
+    session = _RESOURCE_POOL.session(**session_kwargs)
+    #
+    # Unlike sessions and resources, clients are thread-safe.
+    #
+    client = session.client('s3')
+
+    pages = queue.Queue(maxsize=2 * workers)
+    stopped = threading.Event()
+
+    def put(item):
+        #
+        # Give up if the consumer went away, so that the threads can exit.
+        #
+        while not stopped.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def list_shard(stop_key, **kwargs):
+        try:
+            for response in _list_pages(client, Bucket=bucket_name, **kwargs):
+                contents = response.get('Contents', [])
+                objects = [
+                    (c['Key'], c['Size']) for c in contents
+                    if stop_key is None or c['Key'] <= stop_key
+                ]
+                put(objects)
+                #
+                # Keys come sorted, so once we see one past the end of the
+                # shard, we're done.
+                #
+                if stopped.is_set() or len(objects) < len(contents):
+                    break
+        except Exception as error:
+            put(error)
+        finally:
+            put(_SHARD_DONE)
+
+    def accepted(item):
+        if isinstance(item, Exception):
+            raise item
+        return [(key, size) for (key, size) in item if accept_key(key)]
+
+    futures = []
+    num_done = 0
+    executor = concurrent.futures.ThreadPoolExecutor(workers)
+    try:
+        if shards is None:
+            for response in _list_pages(client, Bucket=bucket_name, Prefix=prefix, Delimiter='/'):
+                for common_prefix in response.get('CommonPrefixes', []):
+                    futures.append(executor.submit(list_shard, None, Prefix=common_prefix['Prefix']))
+
+                objects = [(c['Key'], c['Size']) for c in response.get('Contents', [])]
+                for key, size in accepted(objects):
+                    yield key, size
+
+                #
+                # Don't keep the shards waiting while we discover more of them.
+                #
+                while True:
+                    try:
+                        item = pages.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _SHARD_DONE:
+                        num_done += 1
+                    else:
+                        for key, size in accepted(item):
+                            yield key, size
+        else:
+            boundaries = sorted(shards)
+            for start_after, stop_key in zip([None] + boundaries, boundaries + [None]):
+                kwargs = dict(Prefix=prefix)
+                if start_after is not None:
+                    kwargs['StartAfter'] = start_after
+                futures.append(executor.submit(list_shard, stop_key, **kwargs))
+
+        while num_done < len(futures):
+            item = pages.get()
+            if item is _SHARD_DONE:
+                num_done += 1
+            else:
+                for key, size in accepted(item):
+                    yield key, size
+    finally:
+        stopped.set()
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
 
 
 def _download_key(key_name, bucket_name=None, retries=3, **session_kwargs):
@@ -1050,10 +2083,15 @@ def _download_key(key_name, bucket_name=None, retries=3, **session_kwargs):
         raise ValueError('bucket_name may not be None')
 
     #
-    # https://geekpete.com/blog/multithreading-boto3/
+    # Sessions aren't thread-safe, so each worker thread gets its own from
+    # the pool: https://geekpete.com/blog/multithreading-boto3/
+    #
+    # The pool keeps them for the lifetime of the thread (or process), so
+    # each worker creates its session and resource once, when it handles its
+    # first key, and then reuses them for every other key.
     #
-    session = boto3.session.Session(**session_kwargs)
-    s3 = session.resource('s3')
+    session = _RESOURCE_POOL.session(**session_kwargs)
+    s3 = _RESOURCE_POOL.resource(session)
     bucket = s3.Bucket(bucket_name)
 
     # Sometimes, https://github.com/boto/boto/issues/2409 can happen
@@ -1072,11 +2110,27 @@ def _download_key(key_name, bucket_name=None, retries=3, **session_kwargs):
             return key_name, content_bytes
 
 
+def _download_small_key(key_and_size, stream_threshold, bucket_name=None, retries=3, **session_kwargs):
+    """Download the key if it is no larger than stream_threshold bytes.
+
+    Returns the key name and its contents, or the key name and its size if
+    the key is too large.
+    """
+    key_name, size = key_and_size
+    if size > stream_threshold:
+        return key_name, size
+    return _download_key(key_name, bucket_name=bucket_name, retries=retries, **session_kwargs)
+
+
 def _download_fileobj(bucket, key_name):
     #
     # This is a separate function only because it makes it easier to inject
     # exceptions during tests.
     #
-    buf = io.BytesIO()
-    bucket.download_fileobj(key_name, buf)
-    return buf.getvalue()
+    # We use a plain GET instead of bucket.download_fileobj, because the
+    # latter makes an extra HEAD request and starts a new thread pool for
+    # every key, which dominates the time it takes to fetch small objects.
+    # We already download many keys in parallel anyway.
+    #
+    response = bucket.meta.client.get_object(Bucket=bucket.name, Key=key_name)
+    return response['Body'].read()
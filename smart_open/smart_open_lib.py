@@ -17,6 +17,7 @@ The main functions are:
 
 import codecs
 import collections
+import io
 import logging
 import os
 import os.path as P
@@ -25,8 +26,6 @@ import urllib.parse
 import warnings
 import sys
 
-import boto3
-
 #
 # This module defines a function called smart_open so we cannot use
 # smart_open.submodule to reference to the submodules.
@@ -117,6 +116,8 @@ def open(
         opener=None,
         ignore_ext=False,
         transport_params=None,
+        byte_range=None,
+        compression_params=None,
         ):
     r"""Open the URI object, returning a file-like object.
 
@@ -150,6 +151,15 @@ def open(
         Disable transparent compression/decompression based on the file extension.
     transport_params: dict, optional
         Additional parameters for the transport layer (see notes below).
+    byte_range: tuple, optional
+        A ``(start, stop)`` tuple of byte offsets.  If specified, read only
+        the lines that start within this range, e.g. one of the ranges that
+        :func:`split` returns.  Only supported for reading uncompressed data.
+    compression_params: dict, optional
+        Additional parameters for the compression layer, e.g. ``{'workers': 4}``
+        to compress gzip and bzip2 files on four threads when writing, or
+        ``{'read_ahead_blocks': 2}`` to read compressed data ahead on a
+        background thread while decompressing it.
 
     Returns
     -------
@@ -180,14 +190,20 @@ def open(
     if transport_params is None:
         transport_params = {}
 
-    fobj = _shortcut_open(
-        uri,
-        mode,
-        ignore_ext=ignore_ext,
-        buffering=buffering,
-        encoding=encoding,
-        errors=errors,
-    )
+    if byte_range is not None and mode not in ('r', 'rb', 'rt'):
+        raise ValueError('byte_range is only supported for reading, not mode %r' % mode)
+
+    fobj = None
+    if byte_range is None:
+        fobj = _shortcut_open(
+            uri,
+            mode,
+            ignore_ext=ignore_ext,
+            buffering=buffering,
+            encoding=encoding,
+            errors=errors,
+            newline=newline,
+        )
     if fobj is not None:
         return fobj
 
@@ -222,13 +238,23 @@ def open(
     #
     binary_mode = _TO_BINARY_LUT.get(mode, mode)
     binary = _open_binary_stream(uri, binary_mode, transport_params)
-    if ignore_ext:
+    if byte_range is not None:
+        _, extension = P.splitext(binary.name)
+        if extension in compression.get_supported_extensions() and not ignore_ext:
+            binary.close()
+            raise ValueError('byte_range is not supported for compressed files')
+        decompressed = _LineRangeReader(binary, *byte_range)
+    elif ignore_ext:
         decompressed = binary
     else:
-        decompressed = compression.compression_wrapper(binary, mode)
+        decompressed = compression.compression_wrapper(
+            binary, mode, compression_params=compression_params,
+        )
 
     if 'b' not in mode or explicit_encoding is not None:
-        decoded = _encoding_wrapper(decompressed, mode, encoding=encoding, errors=errors)
+        decoded = _encoding_wrapper(
+            decompressed, mode, encoding=encoding, errors=errors, newline=newline,
+        )
     else:
         decoded = decompressed
 
@@ -288,6 +314,7 @@ def smart_open(uri, mode="rb", **kw):
         logger.error('profile_name and s3_session are mutually exclusive, ignoring the former')
 
     if 'profile_name' in kw:
+        import boto3
         transport_params['session'] = boto3.Session(profile_name=kw.pop('profile_name'))
 
     if 's3_session' in kw:
@@ -309,6 +336,267 @@ def smart_open(uri, mode="rb", **kw):
                 transport_params=transport_params, **scrubbed_kwargs)
 
 
+def iter_lines(
+        uri,
+        batch_size=utils.DEFAULT_LINE_BATCH_SIZE,
+        keepends=False,
+        encoding=None,
+        errors=None,
+        ignore_ext=False,
+        transport_params=None,
+        ):
+    """Iterate over the lines of the URI object in batches.
+
+    Reads the object batch_size bytes at a time, and splits each batch into
+    lines in one go.  For objects with many short lines, this is an order of
+    magnitude faster than iterating over a file object line by line.
+
+    Compressed objects are decompressed as with :func:`open`.
+
+    :param str uri: The URI to read from.
+    :param int batch_size: The number of bytes to split into lines at once.
+    :param bool keepends: If True, include the newline at the end of each line.
+    :param str encoding: If specified, decode the lines into text.
+    :param str errors: How to handle decoding errors.
+    :param bool ignore_ext: Disable transparent decompression based on the file extension.
+    :param dict transport_params: Additional parameters for the transport layer.
+    :returns: An iterator of lists of lines, split at ``\n``.  The lines are
+        bytes, unless an encoding is specified.
+    """
+    with open(uri, 'rb', ignore_ext=ignore_ext, transport_params=transport_params) as fin:
+        yield from utils.iter_line_batches(
+            fin,
+            batch_size=batch_size,
+            keepends=keepends,
+            encoding=encoding,
+            errors=errors or 'strict',
+        )
+
+
+def tail(uri, nbytes=None, nlines=None, transport_params=None):
+    """Read the end of the URI object without reading all of it.
+
+    Transports that support it fetch the tail with a single suffix-range
+    request (e.g. ``Range: bytes=-1024``), so there is no need to know the
+    size of the object in advance.  Other transports fall back to seeking
+    to the end of the stream, or to streaming it if it is not seekable.
+
+    The tail is read as raw bytes: compressed objects are not decompressed.
+
+    :param str uri: The URI to read from.
+    :param int nbytes: The number of bytes to read.
+    :param int nlines: The number of lines to read.
+    :param dict transport_params: Additional parameters for the transport layer.
+    :returns: The last nbytes as bytes, or the last nlines as a list of bytes,
+        each including its line terminator.
+    :raises ValueError: Unless exactly one of nbytes and nlines is specified.
+    """
+    if (nbytes is None) == (nlines is None):
+        raise ValueError('specify exactly one of nbytes and nlines')
+
+    if transport_params is None:
+        transport_params = {}
+
+    if nbytes is not None:
+        return _tail_bytes(uri, nbytes, transport_params)
+
+    if nlines <= 0:
+        return []
+
+    #
+    # We don't know how long the lines are, so keep doubling the suffix until
+    # it contains enough of them, or we've read the whole object.
+    #
+    size = io.DEFAULT_BUFFER_SIZE
+    while True:
+        data = _tail_bytes(uri, size, transport_params)
+        lines = data.splitlines(True)
+        if len(data) < size or len(lines) > nlines:
+            return lines[-nlines:]
+        size *= 2
+
+
+DEFAULT_PROBE_SIZE = 64 * 1024
+"""The number of bytes :func:`split` reads at a time while looking for the end of a line."""
+
+
+def split(uri, n_splits=None, split_size=None, ignore_ext=False, transport_params=None):
+    """Split the URI object into byte ranges that start and end on line boundaries.
+
+    Reads only a few bytes around each boundary, so splitting even a very
+    large object is cheap.  Each range can then be processed independently,
+    e.g. on a different core or machine, by opening it with
+    ``open(uri, byte_range=(start, stop))``.
+
+    :param str uri: The URI to split.
+    :param int n_splits: The number of ranges to split into.
+    :param int split_size: The approximate number of bytes in each range.
+    :param bool ignore_ext: Split compressed objects as if they were not.
+        Without this, compressed objects cannot be split.
+    :param dict transport_params: Additional parameters for the transport layer.
+    :returns: A list of ``(start, stop)`` tuples.  The ranges are consecutive,
+        and cover the whole object.  There may be fewer ranges than requested,
+        if some lines are longer than a range.
+    :raises ValueError: Unless exactly one of n_splits and split_size is specified.
+    """
+    if (n_splits is None) == (split_size is None):
+        raise ValueError('specify exactly one of n_splits and split_size')
+
+    if isinstance(uri, str) and not ignore_ext:
+        _, extension = P.splitext(uri)
+        if extension in compression.get_supported_extensions():
+            raise ValueError('cannot split compressed file %r' % uri)
+
+    with open(uri, 'rb', ignore_ext=True, transport_params=transport_params) as fin:
+        size = fin.seek(0, io.SEEK_END)
+        if n_splits is None:
+            n_splits = -(-size // split_size)
+
+        boundaries = [0]
+        for i in range(1, n_splits):
+            offset = size * i // n_splits
+            if offset > boundaries[-1]:
+                boundaries.append(_next_line_start(fin, offset, size))
+        boundaries.append(size)
+
+    return [(start, stop) for (start, stop) in zip(boundaries, boundaries[1:]) if stop > start]
+
+
+def _next_line_start(fin, offset, size):
+    """Return the offset of the first line that starts at or after offset."""
+    pread = getattr(fin, 'pread', None)
+    position = offset - 1
+    while position < size:
+        if pread is not None:
+            probe = pread(position, DEFAULT_PROBE_SIZE)
+        else:
+            fin.seek(position)
+            probe = fin.read(DEFAULT_PROBE_SIZE)
+        if not probe:
+            break
+
+        newline = probe.find(b'\n')
+        if newline >= 0:
+            return position + newline + 1
+        position += len(probe)
+    return size
+
+
+class _LineRangeReader(io.BufferedIOBase):
+    """Reads the lines of a binary stream that start within a byte range.
+
+    Like Hadoop's input splits: skips the partial line at the start of the
+    range, because it belongs to the previous range, and reads past the end
+    of the range to finish the last line.  So every line of the stream
+    belongs to exactly one of a sequence of consecutive ranges, wherever
+    their boundaries fall.
+    """
+    def __init__(self, fileobj, start, stop):
+        self._fileobj = fileobj
+        self._stop = stop
+        self._position = 0
+        self._ends_line = True
+        self._tail = None
+        self._done = False
+        self.name = fileobj.name
+
+        if start > 0:
+            fileobj.seek(start - 1)
+            self._position = start - 1 + len(fileobj.readline())
+        if self._position >= stop:
+            self._done = True
+
+    def close(self):
+        """Flush and close this stream."""
+        if not self.closed:
+            self._fileobj.close()
+        super().close()
+
+    def readable(self):
+        """Return True if the stream can be read from."""
+        return True
+
+    def detach(self):
+        """Unsupported."""
+        raise io.UnsupportedOperation
+
+    def read(self, size=-1):
+        """Read up to size bytes from the range and return them."""
+        if size < 0:
+            return b''.join(iter(lambda: self.read(io.DEFAULT_BUFFER_SIZE), b''))
+        if size == 0 or self._finished():
+            return b''
+
+        if self._position < self._stop:
+            data = self._fileobj.read(min(size, self._stop - self._position))
+            if not data:
+                self._done = True
+            self._position += len(data)
+            self._ends_line = data.endswith(b'\n')
+            return data
+
+        #
+        # We're past the end of the range, in the middle of its last line.
+        #
+        if self._tail is None:
+            self._tail = self._fileobj.readline()
+        data, self._tail = self._tail[:size], self._tail[size:]
+        self._position += len(data)
+        if not self._tail:
+            self._done = True
+        return data
+
+    def read1(self, size=-1):
+        """This is the same as read()."""
+        return self.read(size=size)
+
+    def readinto(self, b):
+        """Read up to len(b) bytes into b, and return the number of bytes
+        read."""
+        with memoryview(b) as view, view.cast('B') as dest:
+            data = self.read(len(dest))
+            dest[:len(data)] = data
+        return len(data)
+
+    def readline(self, limit=-1):
+        """Read up to and including the next newline.  Returns the bytes read."""
+        if limit != -1:
+            raise NotImplementedError('limits other than -1 not implemented yet')
+        if self._finished():
+            return b''
+
+        if self._tail is not None:
+            line, self._tail = self._tail, b''
+        else:
+            line = self._fileobj.readline()
+        self._position += len(line)
+        self._ends_line = True
+        if not line or self._position >= self._stop:
+            self._done = True
+        return line
+
+    def _finished(self):
+        return self._done or (self._position >= self._stop and self._ends_line)
+
+
+def _tail_bytes(uri, nbytes, transport_params):
+    submodule = transport.get_transport(_sniff_scheme(uri))
+    tail_uri = getattr(submodule, 'tail_uri', None)
+    if tail_uri is not None:
+        return tail_uri(uri, nbytes, transport_params)
+
+    if nbytes <= 0:
+        return b''
+    with _open_binary_stream(uri, 'rb', transport_params) as fin:
+        if fin.seekable():
+            fin.seek(max(fin.seek(0, io.SEEK_END) - nbytes, 0))
+            return fin.read()
+        buf = collections.deque(maxlen=nbytes)
+        for chunk in iter(lambda: fin.read(io.DEFAULT_BUFFER_SIZE), b''):
+            buf.extend(chunk)
+        return bytes(buf)
+
+
 def _shortcut_open(
         uri,
         mode,
@@ -316,6 +604,7 @@ def _shortcut_open(
         buffering=-1,
         encoding=None,
         errors=None,
+        newline=None,
         ):
     """Try to open the URI using the standard library io.open function.
 
@@ -359,6 +648,9 @@ def _shortcut_open(
     if errors and 'b' not in mode:
         open_kwargs['errors'] = errors
 
+    if newline is not None and 'b' not in mode:
+        open_kwargs['newline'] = newline
+
     return _builtin_open(local_path, mode, buffering=buffering, **open_kwargs)
 
 
@@ -404,7 +696,7 @@ def _open_binary_stream(uri, mode, transport_params):
     return fobj
 
 
-def _encoding_wrapper(fileobj, mode, encoding=None, errors=None):
+def _encoding_wrapper(fileobj, mode, encoding=None, errors=None, newline=None):
     """Decode bytes into text, if necessary.
 
     If mode specifies binary access, does nothing, unless the encoding is
@@ -414,6 +706,7 @@ def _encoding_wrapper(fileobj, mode, encoding=None, errors=None):
     :arg str mode: is the mode which was originally requested by the user.
     :arg str encoding: The text encoding to use.  If mode is binary, overrides mode.
     :arg str errors: The method to use when handling encoding/decoding errors.
+    :arg str newline: Controls universal newlines, like the built-in open function.
     :returns: a file object
     """
     logger.debug('encoding_wrapper: %r', locals())
@@ -433,6 +726,16 @@ def _encoding_wrapper(fileobj, mode, encoding=None, errors=None):
     if encoding is None:
         encoding = SYSTEM_ENCODING
 
+    #
+    # TextIOWrapper is implemented in C, and is several times faster than the
+    # codecs module's stream readers and writers, especially for readline.
+    # It needs a stream that quacks like io.BufferedIOBase, which all of our
+    # transports and compressors return.  Anything else gets the old,
+    # slower treatment.
+    #
+    if all(hasattr(fileobj, attr) for attr in ('readable', 'writable', 'seekable', 'closed')):
+        return io.TextIOWrapper(fileobj, encoding=encoding, errors=errors, newline=newline)
+
     kw = {'errors': errors} if errors else {}
     if mode[0] == 'r' or mode.endswith('+'):
         fileobj = codecs.getreader(encoding)(fileobj, **kw)
@@ -461,19 +764,23 @@ def _patch_pathlib(func):
     return old_impl
 
 
-#
-# Prevent failures with doctools from messing up the entire library.  We don't
-# expect such failures, but contributed modules (e.g. new transport mechanisms)
-# may not be as polished.
-#
-try:
-    doctools.tweak_open_docstring(open)
-    doctools.tweak_parse_uri_docstring(parse_uri)
-except Exception as ex:
-    logger.error(
-        'Encountered a non-fatal error while building docstrings (see below). '
-        'help(smart_open) will provide incomplete information as a result. '
-        'For full help text, see '
-        '<https://github.com/RaRe-Technologies/smart_open/blob/master/help.txt>.'
-    )
-    logger.exception(ex)
+def _tweak_docstrings(full=False):
+    #
+    # Prevent failures with doctools from messing up the entire library.  We don't
+    # expect such failures, but contributed modules (e.g. new transport mechanisms)
+    # may not be as polished.
+    #
+    try:
+        doctools.tweak_open_docstring(open, full=full)
+        doctools.tweak_parse_uri_docstring(parse_uri, full=full)
+    except Exception as ex:
+        logger.error(
+            'Encountered a non-fatal error while building docstrings (see below). '
+            'help(smart_open) will provide incomplete information as a result. '
+            'For full help text, see '
+            '<https://github.com/RaRe-Technologies/smart_open/blob/master/help.txt>.'
+        )
+        logger.exception(ex)
+
+
+_tweak_docstrings()
@@ -16,6 +16,7 @@ import unittest
 from collections import OrderedDict
 
 import smart_open
+import smart_open.blockcache
 import smart_open.constants
 
 import azure.storage.blob
@@ -42,7 +43,7 @@ class FakeBlobClient(object):
     def commit_block_list(self, block_list):
         data = b''.join([self._staged_contents[block_blob['id']] for block_blob in block_list])
         self.__contents = io.BytesIO(data)
-        self.set_blob_metadata(dict(size=len(data)))
+        self.set_blob_metadata(dict(size=len(data), etag=uuid.uuid4().hex))
         self._container_client.register_blob_client(self)
 
     def delete_blob(self):
@@ -67,7 +68,7 @@ class FakeBlobClient(object):
         if metadata is not None:
             self.set_blob_metadata(metadata)
         self.__contents = io.BytesIO(data[:length])
-        self.set_blob_metadata(dict(size=len(data[:length])))
+        self.set_blob_metadata(dict(size=len(data[:length]), etag=uuid.uuid4().hex))
         self._container_client.register_blob_client(self)
 
 
@@ -497,6 +498,61 @@ class ReaderTest(unittest.TestCase):
         expected = [b'englishman\n', b'in\n', b'new\n', b'york\n']
         self.assertEqual(expected, actual)
 
+    def test_readinto(self):
+        """Does readinto work for requests smaller and larger than the buffer?"""
+        content = b'englishman\nin\nnew\nyork\n' * 16
+        blob_name = "test_readinto_%s" % BLOB_NAME
+        put_to_container(blob_name, contents=content)
+
+        with smart_open.asb.Reader(
+                CONTAINER_NAME,
+                blob_name,
+                buffer_size=32,
+                client=test_blob_service_client
+        ) as fin:
+            small = bytearray(10)
+            self.assertEqual(fin.readinto(small), 10)
+            self.assertEqual(small, content[:10])
+
+            large = bytearray(len(content))
+            self.assertEqual(fin.readinto(large), len(content) - 10)
+            self.assertEqual(large[:len(content) - 10], content[10:])
+            self.assertEqual(fin.readinto(large), 0)
+            self.assertEqual(fin.tell(), len(content))
+
+    def test_tail(self):
+        content = b'englishman\nin\nnew\nyork\n'
+        blob_name = "test_tail_%s" % BLOB_NAME
+        put_to_container(blob_name, contents=content)
+
+        actual = smart_open.asb.tail(CONTAINER_NAME, blob_name, 5, client=test_blob_service_client)
+        self.assertEqual(actual, content[-5:])
+        actual = smart_open.asb.tail(CONTAINER_NAME, blob_name, 1000, client=test_blob_service_client)
+        self.assertEqual(actual, content)
+
+    def test_pread(self):
+        """Does pread leave the current position alone?"""
+        content = b'englishman\nin\nnew\nyork\n' * 16
+        blob_name = "test_pread_%s" % BLOB_NAME
+        put_to_container(blob_name, contents=content)
+
+        with smart_open.asb.Reader(
+                CONTAINER_NAME,
+                blob_name,
+                buffer_size=32,
+                client=test_blob_service_client
+        ) as fin:
+            self.assertEqual(fin.read(5), content[:5])
+            self.assertEqual(fin.pread(100, 10), content[100:110])
+            self.assertEqual(fin.pread(len(content) - 3, 10), content[-3:])
+            self.assertEqual(fin.pread(len(content), 10), b'')
+
+            buf = bytearray(10)
+            self.assertEqual(fin.readinto_at(200, buf), 10)
+            self.assertEqual(buf, content[200:210])
+            self.assertEqual(fin.tell(), 5)
+            self.assertEqual(fin.read(5), content[5:10])
+
     def test_read0_does_not_return_data(self):
         content = b'englishman\nin\nnew\nyork\n'
         blob_name = "test_read0_does_not_return_data_%s" % BLOB_NAME
@@ -525,6 +581,44 @@ class ReaderTest(unittest.TestCase):
 
         self.assertEqual(data, content)
 
+    def test_block_cache(self):
+        content = bytes(bytearray(range(256))) * 10
+        blob_name = "test_block_cache_%s" % BLOB_NAME
+        put_to_container(blob_name, contents=content)
+
+        cache = smart_open.blockcache.BlockCache(block_size=100)
+        with smart_open.asb.Reader(
+                CONTAINER_NAME,
+                blob_name,
+                buffer_size=16,
+                client=test_blob_service_client,
+                block_cache=cache,
+        ) as fin:
+            fin.seek(2000)
+            self.assertEqual(fin.read(300), content[2000:2300])
+            fin.seek(2050)
+            self.assertEqual(fin.read(100), content[2050:2150])
+
+        self.assertEqual(cache.misses, 3)
+        self.assertEqual(cache.hits, 2)
+
+    def test_block_cache_without_validator(self):
+        """Do we refuse to cache blobs that we can't tell have changed?"""
+        blob_name = "test_block_cache_without_validator_%s" % BLOB_NAME
+        put_to_container(blob_name, contents=b'hello')
+        blob_client = test_blob_service_client.get_container_client(CONTAINER_NAME).get_blob_client(blob_name)
+        del blob_client.metadata['etag']
+
+        cache = smart_open.blockcache.BlockCache(block_size=100)
+        with smart_open.asb.Reader(
+                CONTAINER_NAME,
+                blob_name,
+                client=test_blob_service_client,
+                block_cache=cache,
+        ) as fin:
+            self.assertEqual(fin.read(), b'hello')
+        self.assertEqual(cache.misses, 0)
+
 
 class WriterTest(unittest.TestCase):
     """
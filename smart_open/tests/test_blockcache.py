@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 Radim Rehurek <me@radimrehurek.com>
+#
+# This code is distributed under the terms and conditions
+# from the MIT License (MIT).
+#
+import os
+import tempfile
+import unittest
+
+import smart_open.blockcache
+
+
+class BlockCacheTest(unittest.TestCase):
+    def test_get_missing(self):
+        cache = smart_open.blockcache.BlockCache()
+        self.assertIsNone(cache.get(('s3', 'bucket', 'key', None, 1, 0)))
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.hits, 0)
+
+    def test_evicts_least_recently_used(self):
+        cache = smart_open.blockcache.BlockCache(max_size=8, block_size=4)
+        cache.put('a', b'aaaa')
+        cache.put('b', b'bbbb')
+        self.assertEqual(cache.get('a'), b'aaaa')
+
+        cache.put('c', b'cccc')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), b'aaaa')
+        self.assertEqual(cache.get('c'), b'cccc')
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.size, 8)
+        self.assertEqual(len(cache), 2)
+
+    def test_replace(self):
+        cache = smart_open.blockcache.BlockCache(max_size=8, block_size=4)
+        cache.put('a', b'aaaa')
+        cache.put('a', b'AA')
+        self.assertEqual(cache.get('a'), b'AA')
+        self.assertEqual(cache.size, 2)
+
+    def test_too_large(self):
+        cache = smart_open.blockcache.BlockCache(max_size=2, block_size=4)
+        cache.put('a', b'aaaa')
+        self.assertEqual(len(cache), 0)
+
+    def test_stats(self):
+        cache = smart_open.blockcache.BlockCache()
+        cache.put('a', b'aaaa')
+        cache.get('a')
+        cache.get('b')
+        cache.clear()
+        expected = dict(hits=1, misses=1, evictions=0, blocks=0, size=0)
+        self.assertEqual(cache.stats(), expected)
+
+
+class ResolveTest(unittest.TestCase):
+    def test_disabled(self):
+        self.assertIsNone(smart_open.blockcache.resolve(None))
+        self.assertIsNone(smart_open.blockcache.resolve(False))
+
+    def test_shared(self):
+        self.assertIs(smart_open.blockcache.resolve(True), smart_open.blockcache.SHARED_CACHE)
+
+    def test_instance(self):
+        cache = smart_open.blockcache.BlockCache()
+        self.assertIs(smart_open.blockcache.resolve(cache), cache)
+
+
+class CachedRawReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.content = bytes(bytearray(range(256)))
+        self.requests = []
+
+    def fetch(self, start, stop):
+        self.requests.append((start, stop))
+        return self.content[start:stop]
+
+    def test_read(self):
+        cache = smart_open.blockcache.BlockCache(block_size=100)
+        reader = smart_open.blockcache.CachedRawReader(self.fetch, len(self.content), cache, ('x', ))
+        self.assertEqual(reader.read(150), self.content[:100])
+        self.assertEqual(reader.read(), self.content[100:])
+        self.assertEqual(reader.read(), b'')
+        self.assertEqual(self.requests, [(0, 100), (100, 200), (200, 256)])
+
+    def test_seek(self):
+        cache = smart_open.blockcache.BlockCache(block_size=100)
+        reader = smart_open.blockcache.CachedRawReader(self.fetch, len(self.content), cache, ('x', ))
+        reader.seek(250)
+        self.assertEqual(reader.read(), self.content[250:])
+        reader.seek(10)
+        self.assertEqual(reader.read(5), self.content[10:15])
+        reader.seek(210)
+        self.assertEqual(reader.read(5), self.content[210:215])
+        self.assertEqual(self.requests, [(200, 256), (0, 100)])
+
+    def test_read_range(self):
+        cache = smart_open.blockcache.BlockCache(block_size=100)
+        reader = smart_open.blockcache.CachedRawReader(self.fetch, len(self.content), cache, ('x', ))
+        self.assertEqual(reader.read_range(90, 210), self.content[90:210])
+        self.assertEqual(reader.read_range(250, 300), self.content[250:])
+        self.assertEqual(reader.read_range(256, 300), b'')
+        self.assertEqual(reader.read(10), self.content[:10])
+        self.assertEqual(self.requests, [(0, 100), (100, 200), (200, 256)])
+
+    def test_shared_between_readers(self):
+        cache = smart_open.blockcache.BlockCache(block_size=100)
+        for _ in range(2):
+            reader = smart_open.blockcache.CachedRawReader(self.fetch, len(self.content), cache, ('x', ))
+            self.assertEqual(reader.read(), self.content)
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(cache.hits, 3)
+
+
+class DiskBlockCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_dir = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_get_put(self):
+        cache = smart_open.blockcache.DiskBlockCache(self.cache_dir)
+        self.assertIsNone(cache.get(('s3', 'bucket', 'key', 'etag', 4, 0)))
+        cache.put(('s3', 'bucket', 'key', 'etag', 4, 0), b'abcd')
+        self.assertEqual(cache.get(('s3', 'bucket', 'key', 'etag', 4, 0)), b'abcd')
+        self.assertIsNone(cache.get(('s3', 'bucket', 'key', 'other', 4, 0)))
+        self.assertEqual(cache.stats(), dict(hits=1, misses=2, evictions=0, blocks=1, size=4))
+
+    def test_put_twice(self):
+        """Does rewriting a block keep the size accurate?"""
+        cache = smart_open.blockcache.DiskBlockCache(self.cache_dir, max_size=8)
+        cache.put('a', b'aaaa')
+        cache.put('a', b'aaaa')
+        cache.put('a', b'aa')
+        self.assertEqual(cache.size, 2)
+        cache.put('b', b'bbbb')
+        self.assertEqual(cache.stats()['evictions'], 0)
+        self.assertEqual(cache.size, 6)
+
+    def test_persistent(self):
+        smart_open.blockcache.DiskBlockCache(self.cache_dir).put('a', b'aaaa')
+
+        cache = smart_open.blockcache.DiskBlockCache(self.cache_dir)
+        self.assertEqual(cache.get('a'), b'aaaa')
+        self.assertEqual(cache.size, 4)
+
+    def test_evicts_least_recently_used(self):
+        cache = smart_open.blockcache.DiskBlockCache(self.cache_dir, max_size=8)
+        cache.put('a', b'aaaa')
+        cache.put('b', b'bbbb')
+
+        #
+        # Make sure the blocks are told apart, even on coarse filesystem clocks.
+        #
+        os.utime(cache._path('a'), (0, 0))
+        os.utime(cache._path('b'), (1, 1))
+
+        cache.put('c', b'cccc')
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), b'bbbb')
+        self.assertEqual(cache.get('c'), b'cccc')
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.size, 8)
+
+    def test_clear(self):
+        cache = smart_open.blockcache.DiskBlockCache(self.cache_dir)
+        cache.put('a', b'aaaa')
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get('a'))
+
+    def test_resolve(self):
+        cache = smart_open.blockcache.resolve(self.cache_dir)
+        self.assertIsInstance(cache, smart_open.blockcache.DiskBlockCache)
+        self.assertIs(smart_open.blockcache.resolve(self.cache_dir), cache)
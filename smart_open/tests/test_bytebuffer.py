@@ -39,11 +39,11 @@ class ByteBufferTest(unittest.TestCase):
         self.assertEqual(len(buf), 0)
 
         contents = b'foo bar baz'
-        buf._bytes = contents
+        buf.fill(io.BytesIO(contents))
         self.assertEqual(len(buf), len(contents))
 
         pos = 4
-        buf._pos = pos
+        buf.read(pos)
         self.assertEqual(len(buf), len(contents) - pos)
 
     def test_fill_from_reader(self):
@@ -54,7 +54,7 @@ class ByteBufferTest(unittest.TestCase):
         bytes_filled = buf.fill(content_reader)
         self.assertEqual(bytes_filled, CHUNK_SIZE)
         self.assertEqual(len(buf), CHUNK_SIZE)
-        self.assertEqual(buf._bytes, contents)
+        self.assertEqual(buf.peek(), contents)
 
     def test_fill_from_iterable(self):
         buf = smart_open.bytebuffer.ByteBuffer(CHUNK_SIZE)
@@ -64,7 +64,7 @@ class ByteBufferTest(unittest.TestCase):
         bytes_filled = buf.fill(contents_iter)
         self.assertEqual(bytes_filled, CHUNK_SIZE)
         self.assertEqual(len(buf), CHUNK_SIZE)
-        self.assertEqual(buf._bytes, contents)
+        self.assertEqual(buf.peek(), contents)
 
     def test_fill_from_list(self):
         buf = smart_open.bytebuffer.ByteBuffer(CHUNK_SIZE)
@@ -74,7 +74,7 @@ class ByteBufferTest(unittest.TestCase):
         bytes_filled = buf.fill(contents_list)
         self.assertEqual(bytes_filled, CHUNK_SIZE)
         self.assertEqual(len(buf), CHUNK_SIZE)
-        self.assertEqual(buf._bytes, contents)
+        self.assertEqual(buf.peek(), contents)
 
     def test_fill_multiple(self):
         buf = smart_open.bytebuffer.ByteBuffer(CHUNK_SIZE)
@@ -156,6 +156,63 @@ class ByteBufferTest(unittest.TestCase):
         self.assertEqual(buf.read(CHUNK_SIZE*2), contents[read_size:])
         self.assertEqual(len(buf), 0)
 
+    def test_read_view(self):
+        buf, contents = bytebuffer_and_random_contents()
+        read_size = 128
+
+        view = buf.read_view(read_size)
+        self.assertIsInstance(view, memoryview)
+        self.assertEqual(view, contents[:read_size])
+        self.assertEqual(len(buf), CHUNK_SIZE - read_size)
+
+        self.assertEqual(buf.read_view(CHUNK_SIZE*2), contents[read_size:])
+        self.assertEqual(len(buf), 0)
+
+    def test_read_view_survives_fill(self):
+        """Can the buffer still grow while a view of it exists?"""
+        buf, contents = bytebuffer_and_random_contents()
+        view = buf.read_view(8)
+
+        more_contents = random_byte_string(CHUNK_SIZE * 4)
+        reader = io.BytesIO(more_contents)
+        while buf.fill(reader):
+            pass
+
+        self.assertEqual(len(view), 8)
+        self.assertEqual(buf.read(), contents[8:] + more_contents)
+
+    def test_readinto(self):
+        buf, contents = bytebuffer_and_random_contents()
+        read_size = 128
+
+        dest = bytearray(read_size)
+        self.assertEqual(buf.readinto(dest), read_size)
+        self.assertEqual(dest, contents[:read_size])
+
+        dest = bytearray(CHUNK_SIZE*2)
+        self.assertEqual(buf.readinto(dest), CHUNK_SIZE - read_size)
+        self.assertEqual(dest[:CHUNK_SIZE - read_size], contents[read_size:])
+        self.assertEqual(buf.readinto(dest), 0)
+
+    def test_skip(self):
+        buf, contents = bytebuffer_and_random_contents()
+        self.assertEqual(buf.skip(100), 100)
+        self.assertEqual(buf.read(10), contents[100:110])
+        self.assertEqual(buf.skip(CHUNK_SIZE), CHUNK_SIZE - 110)
+        self.assertEqual(len(buf), 0)
+
+    def test_fill_after_partial_reads(self):
+        """Does reclaiming previously-read bytes keep the unread ones intact?"""
+        buf = smart_open.bytebuffer.ByteBuffer(CHUNK_SIZE)
+        contents = random_byte_string(CHUNK_SIZE * 8)
+        reader = io.BytesIO(contents)
+
+        actual = b''
+        while buf.fill(reader):
+            actual += buf.read(CHUNK_SIZE // 3)
+        actual += buf.read()
+        self.assertEqual(actual, contents)
+
     def test_readline(self):
         """Does the readline function work as expected in the simple case?"""
         expected = (b'this is the very first line\n', b'and this the second')
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 Radim Rehurek <me@radimrehurek.com>
+#
+# This code is distributed under the terms and conditions
+# from the MIT License (MIT).
+#
+import bz2
+import gzip
+import io
+import unittest
+
+import mock
+
+import smart_open
+import smart_open.compression
+
+CONTENTS = b''.join(b'line %d\n' % i for i in range(10000))
+
+
+class ParallelCompressorTest(unittest.TestCase):
+    def write(self, compress, workers, chunk_size=1000):
+        buf = io.BytesIO()
+        fout = smart_open.compression.ParallelCompressor(
+            buf, compress, chunk_size=chunk_size, workers=workers,
+        )
+        with fout:
+            for i in range(0, len(CONTENTS), 777):
+                fout.write(CONTENTS[i:i + 777])
+        return buf.getvalue()
+
+    def test_gzip(self):
+        compressed = self.write(gzip.compress, workers=4)
+        self.assertEqual(gzip.decompress(compressed), CONTENTS)
+
+    def test_bz2(self):
+        compressed = self.write(bz2.compress, workers=4)
+        self.assertEqual(bz2.decompress(compressed), CONTENTS)
+
+    def test_empty(self):
+        buf = io.BytesIO()
+        with smart_open.compression.ParallelCompressor(buf, gzip.compress, workers=4):
+            pass
+        self.assertEqual(gzip.decompress(buf.getvalue()), b'')
+
+    def test_propagates_exception(self):
+        def compress(chunk):
+            raise ValueError('boom')
+
+        fout = smart_open.compression.ParallelCompressor(io.BytesIO(), compress, chunk_size=10, workers=2)
+        with self.assertRaises(ValueError):
+            with fout:
+                fout.write(CONTENTS)
+
+    def test_tell(self):
+        buf = io.BytesIO()
+        fout = smart_open.compression.ParallelCompressor(buf, gzip.compress, chunk_size=1000, workers=2)
+        with fout:
+            fout.write(CONTENTS[:1500])
+            self.assertEqual(fout.tell(), 1500)
+            self.assertEqual(fout.seek(2000), 2000)
+            with self.assertRaises(OSError):
+                fout.seek(10)
+        self.assertEqual(gzip.decompress(buf.getvalue()), CONTENTS[:1500] + bytes(500))
+
+    @mock.patch('smart_open.compression.DEFAULT_WRITE_CHUNK_SIZE', 1000)
+    def test_open(self):
+        """Does smart_open compress in parallel when asked to?"""
+        for ext, module in (('.gz', gzip), ('.bz2', bz2)):
+            buf = io.BytesIO()
+            buf.name = 'contents' + ext
+            fout = smart_open.open(buf, 'wb', compression_params={'workers': 4})
+            self.assertIsInstance(fout, smart_open.compression.ParallelCompressor)
+            fout.write(CONTENTS)
+            self.assertEqual(fout.tell(), len(CONTENTS))
+            fout.close()
+            self.assertEqual(module.decompress(buf.getvalue()), CONTENTS)
+
+    def test_open_text(self):
+        buf = io.BytesIO()
+        buf.name = 'contents.gz'
+        with smart_open.open(buf, 'w', compression_params={'workers': 4}) as fout:
+            fout.write('hello')
+            self.assertEqual(fout.tell(), 5)
+        self.assertEqual(gzip.decompress(buf.getvalue()), b'hello')
+
+    def test_open_default(self):
+        """Does smart_open compress on the calling thread by default?"""
+        for ext, module in (('.gz', gzip), ('.bz2', bz2)):
+            buf = io.BytesIO()
+            buf.name = 'contents' + ext
+            fout = smart_open.open(buf, 'wb')
+            self.assertNotIsInstance(fout, smart_open.compression.ParallelCompressor)
+            fout.write(CONTENTS)
+            self.assertEqual(fout.tell(), len(CONTENTS))
+            fout.close()
+            self.assertEqual(module.decompress(buf.getvalue()), CONTENTS)
+
+        buf = io.BytesIO()
+        buf.name = 'contents.gz'
+        with smart_open.open(buf, 'w') as fout:
+            fout.write('hello')
+            self.assertEqual(fout.tell(), 5)
+
+
+class SlowReader(io.BytesIO):
+    """Returns at most a few bytes at a time, like a network stream would."""
+    def read(self, size=-1):
+        return super().read(min(size, 100) if size >= 0 else 100)
+
+
+class PipelinedReaderTest(unittest.TestCase):
+    def test_read(self):
+        reader = smart_open.compression.PipelinedReader(SlowReader(CONTENTS), blocks=2, block_size=64)
+        self.assertEqual(reader.read(10), CONTENTS[:10])
+        self.assertEqual(reader.read1(1000), CONTENTS[10:64])
+        buf = bytearray(100)
+        self.assertEqual(reader.readinto(buf), 100)
+        self.assertEqual(buf, CONTENTS[64:164])
+        self.assertEqual(reader.tell(), 164)
+        self.assertEqual(reader.read(), CONTENTS[164:])
+        self.assertEqual(reader.read(), b'')
+
+        stats = reader.stats()
+        self.assertEqual(stats['bytes'], len(CONTENTS))
+        self.assertEqual(set(stats), {'fetch', 'stall', 'wait', 'consume', 'bytes'})
+        reader.close()
+
+    def test_seek(self):
+        reader = smart_open.compression.PipelinedReader(io.BytesIO(CONTENTS), blocks=2, block_size=64)
+        self.assertEqual(reader.read(1000), CONTENTS[:1000])
+        self.assertEqual(reader.seek(10), 10)
+        self.assertEqual(reader.read(10), CONTENTS[10:20])
+        self.assertEqual(reader.seek(5, io.SEEK_CUR), 25)
+        self.assertEqual(reader.read(10), CONTENTS[25:35])
+        reader.close()
+
+    def test_close_early(self):
+        """Does closing the reader stop the producer, even if the queue is full?"""
+        buf = io.BytesIO(CONTENTS)
+        reader = smart_open.compression.PipelinedReader(buf, blocks=1, block_size=10)
+        reader.read(1)
+        reader.close()
+        self.assertTrue(buf.closed)
+
+    def test_propagates_exception(self):
+        class BrokenReader(io.BytesIO):
+            def read(self, size=-1):
+                raise IOError('boom')
+
+        reader = smart_open.compression.PipelinedReader(BrokenReader(), blocks=2)
+        with self.assertRaises(IOError):
+            reader.read()
+
+    @mock.patch('smart_open.compression.DEFAULT_READ_AHEAD_BLOCK_SIZE', 100)
+    def test_open(self):
+        for ext, module in (('.gz', gzip), ('.bz2', bz2)):
+            buf = io.BytesIO(module.compress(CONTENTS))
+            buf.name = 'contents' + ext
+            reader = mock.patch(
+                'smart_open.compression.PipelinedReader', wraps=smart_open.compression.PipelinedReader,
+            )
+            with reader as m, smart_open.open(buf, 'rb', compression_params={'read_ahead_blocks': 2}) as fin:
+                m.assert_called_once_with(buf, blocks=2, block_size=100)
+                self.assertEqual(fin.read(1000), CONTENTS[:1000])
+                fin.seek(10)
+                self.assertEqual(fin.read(), CONTENTS[10:])
+
+    def test_open_default(self):
+        """Does smart_open leave reading ahead off by default?"""
+        buf = io.BytesIO(gzip.compress(CONTENTS))
+        buf.name = 'contents.gz'
+        with mock.patch('smart_open.compression.PipelinedReader') as m, smart_open.open(buf, 'rb') as fin:
+            self.assertEqual(fin.read(), CONTENTS)
+        m.assert_not_called()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 Radim Rehurek <me@radimrehurek.com>
+#
+# This code is distributed under the terms and conditions
+# from the MIT License (MIT).
+#
+import os
+import tempfile
+import unittest
+
+import smart_open.concurrency
+
+
+class ConcurrentFuturesPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.pool = smart_open.concurrency.ConcurrentFuturesPool(max_workers=2, max_backlog=3)
+
+    def tearDown(self):
+        self.pool.terminate()
+
+    def test_imap_unordered(self):
+        actual = self.pool.imap_unordered(lambda x: x * 2, range(100))
+        self.assertEqual(sorted(actual), [x * 2 for x in range(100)])
+
+    def test_bounded_backlog(self):
+        """Does imap_unordered consume its input lazily?"""
+        consumed = []
+
+        def items():
+            for i in range(100):
+                consumed.append(i)
+                yield i
+
+        results = self.pool.imap_unordered(lambda x: x, items())
+        next(results)
+        self.assertLessEqual(len(consumed), 3)
+
+    def test_early_exit(self):
+        """Does closing the iterator cancel the items that haven't started?"""
+        calls = []
+
+        def function(x):
+            calls.append(x)
+            return x
+
+        results = self.pool.imap_unordered(function, range(100))
+        next(results)
+        results.close()
+        self.pool.terminate()
+        self.assertLessEqual(len(calls), 3)
+
+    def test_propagates_exception(self):
+        def function(x):
+            raise ValueError(x)
+
+        with self.assertRaises(ValueError):
+            list(self.pool.imap_unordered(function, range(10)))
+
+
+def _line_length(line):
+    return len(line)
+
+
+class MapLinesTest(unittest.TestCase):
+    def setUp(self):
+        self.lines = ['línea %d: %s' % (i, 'x' * (i % 13)) for i in range(10000)]
+        with tempfile.NamedTemporaryFile(prefix='test', delete=False) as fout:
+            fout.write('\n'.join(self.lines).encode('utf-8'))
+            self.temp_file = fout.name
+
+    def tearDown(self):
+        os.unlink(self.temp_file)
+
+    def test_map_lines(self):
+        actual = smart_open.concurrency.map_lines(
+            self.temp_file, _line_length, workers=2, n_splits=5, encoding='utf-8',
+        )
+        self.assertEqual(list(actual), [len(line) for line in self.lines])
+
+    def test_bytes(self):
+        actual = smart_open.concurrency.map_lines(self.temp_file, _line_length, workers=2, split_size=1000)
+        self.assertEqual(list(actual), [len(line.encode('utf-8')) for line in self.lines])
@@ -24,6 +24,7 @@ import google.cloud
 import google.api_core.exceptions
 
 import smart_open
+import smart_open.blockcache
 import smart_open.constants
 
 BUCKET_NAME = 'test-smartopen-{}'.format(uuid.uuid4().hex)
@@ -141,6 +142,7 @@ class FakeBlob(object):
         self._bucket = bucket  # type: FakeBucket
         self._exists = False
         self.__contents = io.BytesIO()
+        self.generation = None
 
         if create:
             self._create_if_not_exists()
@@ -161,6 +163,9 @@ class FakeBlob(object):
     def download_as_string(self, start=0, end=None):
         # mimics Google's API by returning bytes, despite the method name
         # https://google-cloud-python.readthedocs.io/en/0.32.0/storage/blobs.html#google.cloud.storage.blob.Blob.download_as_string
+        if start < 0:
+            # a negative start asks for a suffix range, like Google's API
+            return self.__contents.getvalue()[start:]
         if end is None:
             end = self.__contents.tell()
         self.__contents.seek(start)
@@ -176,6 +181,7 @@ class FakeBlob(object):
             data = bytes(data, 'utf8')
         self.__contents = io.BytesIO(data)
         self.__contents.seek(0, io.SEEK_END)
+        self.generation = (self.generation or 0) + 1
 
     def write(self, data):
         self.upload_from_string(data)
@@ -652,6 +658,46 @@ class ReaderTest(unittest.TestCase):
         expected = [b'englishman\n', b'in\n', b'new\n', b'york\n']
         self.assertEqual(expected, actual)
 
+    def test_readinto(self):
+        """Does readinto work for requests smaller and larger than the buffer?"""
+        content = b'englishman\nin\nnew\nyork\n' * 16
+        put_to_bucket(contents=content)
+
+        with smart_open.gcs.Reader(BUCKET_NAME, BLOB_NAME, buffer_size=32) as fin:
+            small = bytearray(10)
+            self.assertEqual(fin.readinto(small), 10)
+            self.assertEqual(small, content[:10])
+
+            large = bytearray(len(content))
+            self.assertEqual(fin.readinto(large), len(content) - 10)
+            self.assertEqual(large[:len(content) - 10], content[10:])
+            self.assertEqual(fin.readinto(large), 0)
+            self.assertEqual(fin.tell(), len(content))
+
+    def test_tail(self):
+        content = b'englishman\nin\nnew\nyork\n'
+        put_to_bucket(contents=content)
+
+        self.assertEqual(smart_open.gcs.tail(BUCKET_NAME, BLOB_NAME, 5), content[-5:])
+        self.assertEqual(smart_open.gcs.tail(BUCKET_NAME, BLOB_NAME, 1000), content)
+
+    def test_pread(self):
+        """Does pread leave the current position alone?"""
+        content = b'englishman\nin\nnew\nyork\n' * 16
+        put_to_bucket(contents=content)
+
+        with smart_open.gcs.Reader(BUCKET_NAME, BLOB_NAME, buffer_size=32) as fin:
+            self.assertEqual(fin.read(5), content[:5])
+            self.assertEqual(fin.pread(100, 10), content[100:110])
+            self.assertEqual(fin.pread(len(content) - 3, 10), content[-3:])
+            self.assertEqual(fin.pread(len(content), 10), b'')
+
+            buf = bytearray(10)
+            self.assertEqual(fin.readinto_at(200, buf), 10)
+            self.assertEqual(buf, content[200:210])
+            self.assertEqual(fin.tell(), 5)
+            self.assertEqual(fin.read(5), content[5:10])
+
     def test_read0_does_not_return_data(self):
         content = b'englishman\nin\nnew\nyork\n'
         put_to_bucket(contents=content)
@@ -670,6 +716,32 @@ class ReaderTest(unittest.TestCase):
 
         self.assertEqual(data, content)
 
+    def test_block_cache(self):
+        content = bytes(bytearray(range(256))) * 10
+        put_to_bucket(contents=content)
+
+        cache = smart_open.blockcache.BlockCache(block_size=100)
+        with smart_open.gcs.Reader(BUCKET_NAME, BLOB_NAME, buffer_size=16, block_cache=cache) as fin:
+            fin.seek(2000)
+            self.assertEqual(fin.read(300), content[2000:2300])
+            fin.seek(2050)
+            self.assertEqual(fin.read(100), content[2050:2150])
+            fin.seek(-10, whence=smart_open.constants.WHENCE_END)
+            self.assertEqual(fin.read(), content[-10:])
+
+        self.assertEqual(cache.misses, 4)
+        self.assertEqual(cache.hits, 2)
+
+    def test_block_cache_without_validator(self):
+        """Do we refuse to cache blobs that we can't tell have changed?"""
+        put_to_bucket(contents=b'hello')
+
+        cache = smart_open.blockcache.BlockCache(block_size=100)
+        with mock.patch.object(get_bucket().get_blob(BLOB_NAME), 'generation', None):
+            with smart_open.gcs.Reader(BUCKET_NAME, BLOB_NAME, block_cache=cache) as fin:
+                self.assertEqual(fin.read(), b'hello')
+        self.assertEqual(cache.misses, 0)
+
 
 @maybe_mock_gcs
 class WriterTest(unittest.TestCase):
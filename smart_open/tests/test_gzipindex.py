@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 Radim Rehurek <me@radimrehurek.com>
+#
+# This code is distributed under the terms and conditions
+# from the MIT License (MIT).
+#
+import gzip
+import io
+import os
+import random
+import tempfile
+import unittest
+import zlib
+
+import smart_open.gzipindex
+
+SPACING = 64 * 1024
+CONTENTS = b''.join(b'line %d: %s\n' % (i, b'x' * (i % 37)) for i in range(50000))
+
+
+def compress_with_flushes(data, every, mode=zlib.Z_SYNC_FLUSH, level=6):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    parts = []
+    for i in range(0, len(data), every):
+        parts.append(compressor.compress(data[i:i + every]))
+        parts.append(compressor.flush(mode))
+    parts.append(compressor.flush())
+    return b''.join(parts)
+
+
+def compress_members(data, every):
+    return b''.join(gzip.compress(data[i:i + every]) for i in range(0, len(data), every))
+
+
+class GzipIndexTest(unittest.TestCase):
+    def check_random_access(self, compressed, contents=CONTENTS):
+        index = smart_open.gzipindex.build_index(io.BytesIO(compressed), spacing=SPACING, buffer_size=4096)
+        self.assertEqual(index.size, len(contents))
+
+        reader = smart_open.gzipindex.Reader(io.BytesIO(compressed), index, buffer_size=4096)
+        self.assertEqual(reader.read(), contents)
+
+        rng = random.Random(0)
+        for _ in range(50):
+            position, size = rng.randrange(len(contents)), rng.randrange(10000)
+            self.assertEqual(reader.seek(position), position)
+            self.assertEqual(reader.read(size), contents[position:position + size])
+        return index
+
+    def test_sync_flush(self):
+        index = self.check_random_access(compress_with_flushes(CONTENTS, 16 * 1024))
+        self.assertGreater(len(index), 5)
+        self.assertTrue(all(c.window is not None for c in index.checkpoints[1:]))
+
+    def test_full_flush(self):
+        index = self.check_random_access(compress_with_flushes(CONTENTS, 16 * 1024, zlib.Z_FULL_FLUSH))
+        self.assertGreater(len(index), 5)
+
+    def test_members(self):
+        index = self.check_random_access(compress_members(CONTENTS, 100 * 1024) + b'\x00' * 16)
+        self.assertGreater(len(index), 5)
+        self.assertTrue(all(c.window is None for c in index.checkpoints))
+
+    def test_single_pass(self):
+        """Can we still read a file that has nowhere to restart from?"""
+        index = self.check_random_access(gzip.compress(CONTENTS))
+        self.assertEqual(len(index), 1)
+
+    def test_false_markers(self):
+        """Do we ignore flush markers that are really part of the data?"""
+        contents = os.urandom(32 * 1024).join([b'\x00\x00\xff\xff'] * 20)
+        self.check_random_access(compress_with_flushes(contents, 50 * 1024, level=0), contents)
+
+    def test_dump_load(self):
+        index = smart_open.gzipindex.build_index(
+            io.BytesIO(compress_with_flushes(CONTENTS, 16 * 1024)), spacing=SPACING,
+        )
+        buf = io.BytesIO()
+        index.dump(buf)
+        buf.seek(0)
+
+        loaded = smart_open.gzipindex.GzipIndex.load(buf)
+        self.assertEqual(loaded.checkpoints, index.checkpoints)
+        self.assertEqual(loaded.size, index.size)
+
+    def test_load_garbage(self):
+        with self.assertRaises(ValueError):
+            smart_open.gzipindex.GzipIndex.load(io.BytesIO(b'not an index'))
+
+    def test_truncated(self):
+        compressed = gzip.compress(CONTENTS)
+        with self.assertRaises(EOFError):
+            smart_open.gzipindex.build_index(io.BytesIO(compressed[:len(compressed) // 2]))
+
+    def test_readline(self):
+        compressed = compress_with_flushes(CONTENTS, 16 * 1024)
+        index = smart_open.gzipindex.build_index(io.BytesIO(compressed), spacing=SPACING)
+        reader = smart_open.gzipindex.Reader(io.BytesIO(compressed), index)
+
+        position = CONTENTS.index(b'line 40000:')
+        reader.seek(position)
+        self.assertEqual(reader.readline(), b'line 40000: %s\n' % (b'x' * (40000 % 37)))
+        self.assertEqual(reader.tell(), CONTENTS.index(b'line 40001:'))
+
+        reader.seek(-6, io.SEEK_END)
+        self.assertEqual(list(reader), [CONTENTS[-6:]])
+
+    def test_sidecar(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'contents.gz')
+            with open(path, 'wb') as fout:
+                fout.write(compress_with_flushes(CONTENTS, 16 * 1024))
+
+            index = smart_open.gzipindex.write_index(path, spacing=SPACING)
+            self.assertTrue(os.path.exists(path + '.gzidx'))
+
+            with smart_open.gzipindex.open(path) as fin:
+                self.assertEqual(fin.index.checkpoints, index.checkpoints)
+                fin.seek(100000)
+                self.assertEqual(fin.read(100), CONTENTS[100000:100100])
@@ -5,10 +5,13 @@
 # This code is distributed under the terms and conditions
 # from the MIT License (MIT).
 #
+import tempfile
 import unittest
 
+import mock
 import responses
 
+import smart_open.blockcache
 import smart_open.http
 import smart_open.s3
 import smart_open.constants
@@ -38,6 +41,19 @@ def request_callback(request):
     return (200, HEADERS, BYTES[start:end])
 
 
+def partial_content_callback(request):
+    """Like request_callback, but honors the range like a real server would."""
+    try:
+        range_string = request.headers['range']
+    except KeyError:
+        return (200, HEADERS, BYTES)
+    start, end = range_string.replace('bytes=', '').split('-', 1)
+    if not start:
+        return (206, HEADERS, BYTES[-int(end):])
+    end = int(end) + 1 if end else len(BYTES)
+    return (206, HEADERS, BYTES[int(start):end])
+
+
 class HttpTest(unittest.TestCase):
 
     @responses.activate
@@ -138,6 +154,24 @@ class HttpTest(unittest.TestCase):
             read_bytes = fin.read(size=10)
             self.assertEqual(BYTES[10:20], read_bytes)
 
+    @responses.activate
+    def test_seek_forward_reuses_connection(self):
+        """Do short forward seeks avoid making another request?"""
+        responses.add_callback(responses.GET, URL, callback=request_callback)
+
+        reader = smart_open.http.SeekableBufferedInputBase(URL, buffer_size=8)
+        self.assertEqual(reader.read(5), BYTES[:5])
+        reader.seek(7)
+        self.assertEqual(reader.read(5), BYTES[7:12])
+        reader.seek(40)
+        self.assertEqual(reader.tell(), 40)
+        self.assertEqual(reader.read(5), BYTES[40:45])
+        self.assertEqual(len(responses.calls), 1)
+
+        reader.seek(0)
+        self.assertEqual(reader.read(5), BYTES[:5])
+        self.assertEqual(len(responses.calls), 2)
+
     @responses.activate
     def test_https_seek_reverse(self):
         """Did the seek in reverse over HTTPS work?"""
@@ -148,3 +182,98 @@ class HttpTest(unittest.TestCase):
             fin.seek(-10, whence=smart_open.constants.WHENCE_CURRENT)
             read_bytes_2 = fin.read(size=10)
             self.assertEqual(read_bytes_1, read_bytes_2)
+
+    @responses.activate
+    def test_disk_block_cache(self):
+        """Are repeat reads served from the disk cache?"""
+        ranges = []
+
+        def callback(request):
+            headers = dict(HEADERS, ETag='"abc"')
+            try:
+                range_string = request.headers['range']
+            except KeyError:
+                return (200, headers, BYTES)
+            ranges.append(range_string)
+            start, end = range_string.replace('bytes=', '').split('-', 1)
+            return (206, headers, BYTES[int(start):int(end) + 1])
+
+        responses.add_callback(responses.GET, URL, callback=callback)
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            transport_params = {'block_cache': smart_open.blockcache.DiskBlockCache(cache_dir, block_size=16)}
+            for _ in range(2):
+                with smart_open.open(URL, 'rb', transport_params=transport_params) as fin:
+                    fin.seek(20)
+                    self.assertEqual(fin.read(30), BYTES[20:50])
+                    fin.seek(0)
+                    self.assertEqual(fin.read(), BYTES)
+
+        self.assertEqual(ranges, ['bytes=16-31', 'bytes=32-47', 'bytes=48-63', 'bytes=0-15', 'bytes=64-67'])
+
+    @responses.activate
+    def test_pread(self):
+        """Does pread leave the current position alone?"""
+        responses.add_callback(responses.GET, URL, callback=partial_content_callback)
+
+        reader = smart_open.http.SeekableBufferedInputBase(URL)
+        self.assertEqual(reader.read(5), BYTES[:5])
+        self.assertEqual(reader.pread(20, 10), BYTES[20:30])
+        self.assertEqual(reader.pread(len(BYTES) - 3, 10), BYTES[-3:])
+        self.assertEqual(reader.pread(len(BYTES), 10), b'')
+
+        buf = bytearray(10)
+        self.assertEqual(reader.readinto_at(40, buf), 10)
+        self.assertEqual(buf, BYTES[40:50])
+        self.assertEqual(reader.tell(), 5)
+        self.assertEqual(reader.read(5), BYTES[5:10])
+
+    @responses.activate
+    def test_pread_reuses_session(self):
+        """Do positional reads share one session, and its connections?"""
+        responses.add_callback(responses.GET, URL, callback=partial_content_callback)
+
+        reader = smart_open.http.SeekableBufferedInputBase(URL)
+        self.assertEqual(reader.read(5), BYTES[:5])
+        session = reader._session
+        with mock.patch('requests.get', side_effect=AssertionError('new connection')), \
+                mock.patch.object(session, 'get', wraps=session.get) as get, \
+                mock.patch.object(session, 'close', wraps=session.close) as close:
+            self.assertEqual(reader.pread(20, 10), BYTES[20:30])
+            self.assertEqual(reader.readinto_at(40, bytearray(10)), 10)
+            reader.seek(0)
+            self.assertEqual(reader.read(5), BYTES[:5])
+            self.assertEqual(get.call_count, 3)
+
+            reader.close()
+            close.assert_called_once_with()
+
+    @responses.activate
+    def test_tail(self):
+        responses.add_callback(responses.GET, URL, callback=partial_content_callback)
+
+        self.assertEqual(smart_open.http.tail(URL, 10), BYTES[-10:])
+        self.assertEqual(responses.calls[0].request.headers['range'], 'bytes=-10')
+        self.assertEqual(smart_open.http.tail(URL, 1000), BYTES)
+
+    @responses.activate
+    def test_tail_range_ignored(self):
+        """Does tail cope with servers that send the whole resource?"""
+        responses.add(responses.GET, URL, body=BYTES, stream=True)
+
+        self.assertEqual(smart_open.http.tail(URL, 10), BYTES[-10:])
+
+    @responses.activate
+    @mock.patch('smart_open.http.DEFAULT_MAX_RANGE_SIZE', 20)
+    @mock.patch('smart_open.http.DEFAULT_MIN_RANGE_SIZE', 10)
+    def test_bounded_ranges(self):
+        """After a seek, do sequential reads request growing ranges?"""
+        responses.add_callback(responses.GET, URL, callback=partial_content_callback)
+
+        reader = smart_open.http.SeekableBufferedInputBase(URL, buffer_size=4)
+        self.assertEqual(reader.read(10), BYTES[:10])
+        reader.seek(5)
+        self.assertEqual(reader.read(), BYTES[5:])
+
+        ranges = [call.request.headers.get('range') for call in responses.calls]
+        self.assertEqual(ranges, [None, 'bytes=5-14', 'bytes=15-34', 'bytes=35-54', 'bytes=55-67'])
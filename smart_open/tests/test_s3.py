@@ -5,10 +5,12 @@
 # This code is distributed under the terms and conditions
 # from the MIT License (MIT).
 #
+import concurrent.futures
 import gzip
 import io
 import logging
 import os
+import threading
 import time
 import unittest
 import warnings
@@ -16,10 +18,12 @@ import warnings
 import boto.s3.bucket
 import boto3
 import botocore.client
+import botocore.config
 import mock
 import moto
 
 import smart_open
+import smart_open.blockcache
 import smart_open.s3
 
 # To reduce spurious errors due to S3's eventually-consistent behavior
@@ -104,6 +108,14 @@ class SeekableRawReaderTest(unittest.TestCase):
         self.assertEqual(reader.read(2), b'23')
 
 
+def make_recording_session():
+    """Create a session that records the names of the S3 operations it calls."""
+    calls = []
+    session = boto3.Session()
+    session.events.register('before-call.s3', lambda model, **kwargs: calls.append(model.name))
+    return session, calls
+
+
 @moto.mock_s3
 class SeekableBufferedInputBaseTest(unittest.TestCase):
     def setUp(self):
@@ -284,6 +296,255 @@ class SeekableBufferedInputBaseTest(unittest.TestCase):
             actual = [line.rstrip() for line in fin]
         self.assertEqual(expected, actual)
 
+    def test_readinto(self):
+        """Does readinto work for requests smaller and larger than the buffer?"""
+        content = b''.join(b'line %d\n' % i for i in range(100))
+        put_to_bucket(contents=content)
+
+        with smart_open.s3.open(BUCKET_NAME, KEY_NAME, 'rb', buffer_size=64) as fin:
+            small = bytearray(10)
+            self.assertEqual(fin.readinto(small), 10)
+            self.assertEqual(small, content[:10])
+
+            large = bytearray(len(content))
+            self.assertEqual(fin.readinto(large), len(content) - 10)
+            self.assertEqual(large[:len(content) - 10], content[10:])
+            self.assertEqual(fin.readinto(large), 0)
+            self.assertEqual(fin.tell(), len(content))
+
+    def test_buffered_reader(self):
+        """Can io.BufferedReader pull data via readinto and readinto1?"""
+        content = b''.join(b'line %d\n' % i for i in range(100))
+        put_to_bucket(contents=content)
+
+        with smart_open.s3.open(BUCKET_NAME, KEY_NAME, 'rb', buffer_size=64) as fin:
+            reader = io.BufferedReader(fin, buffer_size=100)
+            self.assertEqual(reader.read(5), content[:5])
+            self.assertEqual(reader.read1(1000), content[5:100])
+            self.assertEqual(reader.read(), content[100:])
+
+    def test_pread(self):
+        """Does pread leave the current position alone?"""
+        content = b''.join(b'line %d\n' % i for i in range(100))
+        put_to_bucket(contents=content)
+
+        with smart_open.s3.open(BUCKET_NAME, KEY_NAME, 'rb', buffer_size=64) as fin:
+            self.assertEqual(fin.read(5), content[:5])
+            self.assertEqual(fin.pread(100, 10), content[100:110])
+            self.assertEqual(fin.pread(len(content) - 3, 10), content[-3:])
+            self.assertEqual(fin.pread(len(content), 10), b'')
+            self.assertEqual(fin.pread(600), content[600:])
+            self.assertEqual(fin.tell(), 5)
+            self.assertEqual(fin.read(5), content[5:10])
+
+            buf = bytearray(10)
+            self.assertEqual(fin.readinto_at(200, buf), 10)
+            self.assertEqual(buf, content[200:210])
+            self.assertEqual(fin.tell(), 10)
+
+    def test_iter_lines(self):
+        content = b''.join(b'line %d\n' % i for i in range(1000))
+        put_to_bucket(contents=content)
+
+        with smart_open.s3.open(BUCKET_NAME, KEY_NAME, 'rb', buffer_size=256) as fin:
+            self.assertEqual(fin.readline(), b'line 0\n')
+            batches = list(fin.iter_lines(batch_size=100))
+        self.assertGreater(len(batches), 1)
+        self.assertEqual([line for batch in batches for line in batch], content.split(b'\n')[1:-1])
+
+    def test_tail(self):
+        content = b''.join(b'line %d\n' % i for i in range(100))
+        put_to_bucket(contents=content)
+
+        self.assertEqual(smart_open.s3.tail(BUCKET_NAME, KEY_NAME, 10), content[-10:])
+        self.assertEqual(smart_open.s3.tail(BUCKET_NAME, KEY_NAME, 10000), content)
+        self.assertEqual(smart_open.s3.tail(BUCKET_NAME, KEY_NAME, 0), b'')
+
+    def test_tail_empty(self):
+        put_to_bucket(contents=b'')
+        self.assertEqual(smart_open.s3.tail(BUCKET_NAME, KEY_NAME, 10), b'')
+
+    def test_pread_threads(self):
+        """Can many threads read regions of the same handle concurrently?"""
+        content = os.urandom(10000)
+        put_to_bucket(contents=content)
+
+        results = {}
+        with smart_open.s3.open(BUCKET_NAME, KEY_NAME, 'rb') as fin:
+            def read(offset):
+                results[offset] = fin.pread(offset, 1000)
+
+            threads = [threading.Thread(target=read, args=(i * 1000, )) for i in range(10)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(b''.join(results[i * 1000] for i in range(10)), content)
+
+    def test_read_ranges(self):
+        """Are nearby ranges fetched with a single request?"""
+        content = os.urandom(10000)
+        put_to_bucket(contents=content)
+        session, calls = make_recording_session()
+
+        ranges = [(5000, 100), (0, 10), (20, 10), (5050, 100), (9990, 100), (3000, 0)]
+        with smart_open.s3.open(BUCKET_NAME, KEY_NAME, 'rb', session=session, content_length=10000) as fin:
+            actual = fin.read_ranges(ranges, max_gap=100)
+            self.assertEqual(fin.tell(), 0)
+
+        expected = [content[offset:offset + length] for (offset, length) in ranges]
+        self.assertEqual(actual, expected)
+        self.assertEqual(calls, ['GetObject'] * 3)
+
+    def test_pread_block_cache(self):
+        content = bytes(bytearray(range(256))) * 10
+        put_to_bucket(contents=content)
+
+        cache = smart_open.blockcache.BlockCache(block_size=100)
+        with smart_open.s3.open(BUCKET_NAME, KEY_NAME, 'rb', block_cache=cache) as fin:
+            self.assertEqual(fin.pread(2050, 100), content[2050:2150])
+            self.assertEqual(fin.pread(2000, 300), content[2000:2300])
+            self.assertEqual(fin.tell(), 0)
+
+        self.assertEqual(cache.misses, 3)
+        self.assertEqual(cache.hits, 2)
+
+    def test_prefetch_read(self):
+        content = b''.join(b'line %d\n' % i for i in range(1000))
+        put_to_bucket(contents=content)
+
+        with smart_open.s3.open(
+                BUCKET_NAME, KEY_NAME, 'rb', buffer_size=100,
+                prefetch_workers=4, prefetch_block_size=64) as fin:
+            self.assertEqual(fin.read(10), content[:10])
+            self.assertEqual(fin.readline(), content[10:content.index(b'\n', 10) + 1])
+            position = fin.tell()
+            self.assertEqual(fin.read(), content[position:])
+
+    def test_prefetch_seek(self):
+        content = bytes(bytearray(range(256))) * 10
+        put_to_bucket(contents=content)
+
+        with smart_open.s3.open(
+                BUCKET_NAME, KEY_NAME, 'rb', buffer_size=16,
+                prefetch_workers=2, prefetch_block_size=100) as fin:
+            fin.seek(150)
+            self.assertEqual(fin.read(100), content[150:250])
+            fin.seek(420)
+            self.assertEqual(fin.read(100), content[420:520])
+            fin.seek(-5, whence=smart_open.constants.WHENCE_END)
+            self.assertEqual(fin.read(), content[-5:])
+            fin.seek(3)
+            self.assertEqual(fin.read(1000), content[3:1003])
+
+    def test_block_cache(self):
+        content = bytes(bytearray(range(256))) * 10
+        put_to_bucket(contents=content)
+
+        cache = smart_open.blockcache.BlockCache(block_size=100)
+        with smart_open.s3.open(BUCKET_NAME, KEY_NAME, 'rb', buffer_size=16, block_cache=cache) as fin:
+            fin.seek(2000)
+            self.assertEqual(fin.read(300), content[2000:2300])
+            fin.seek(2050)
+            self.assertEqual(fin.read(100), content[2050:2150])
+
+        self.assertEqual(cache.misses, 3)
+        self.assertEqual(cache.hits, 2)
+
+        #
+        # Overwriting the object changes its ETag, so the cached blocks
+        # must not be used anymore.
+        #
+        content = content[::-1]
+        put_to_bucket(contents=content)
+        with smart_open.s3.open(BUCKET_NAME, KEY_NAME, 'rb', buffer_size=16, block_cache=cache) as fin:
+            fin.seek(2000)
+            self.assertEqual(fin.read(300), content[2000:2300])
+
+    def test_read_single_request(self):
+        """Does reading a small object cost a single request?"""
+        put_to_bucket(contents=b'hello')
+        session, calls = make_recording_session()
+
+        with smart_open.s3.open(BUCKET_NAME, KEY_NAME, 'rb', session=session) as fin:
+            self.assertEqual(fin.read(), b'hello')
+        self.assertEqual(calls, ['GetObject'])
+
+    def test_seek_forward_reuses_connection(self):
+        """Do short forward seeks avoid making another request?"""
+        content = os.urandom(10000)
+        put_to_bucket(contents=content)
+        session, calls = make_recording_session()
+
+        with smart_open.s3.open(BUCKET_NAME, KEY_NAME, 'rb', session=session, buffer_size=100) as fin:
+            self.assertEqual(fin.read(10), content[:10])
+            fin.seek(50)
+            self.assertEqual(fin.read(10), content[50:60])
+            fin.seek(5000)
+            self.assertEqual(fin.read(10), content[5000:5010])
+            self.assertEqual(calls, ['GetObject'])
+
+            fin.seek(0)
+            self.assertEqual(fin.read(10), content[:10])
+        self.assertEqual(calls, ['GetObject', 'GetObject'])
+
+    @mock.patch('smart_open.s3.DEFAULT_MAX_RANGE_SIZE', 400)
+    @mock.patch('smart_open.s3.DEFAULT_MIN_RANGE_SIZE', 100)
+    def test_bounded_ranges(self):
+        """Do sequential reads request geometrically growing ranges?"""
+        content = os.urandom(1000)
+        put_to_bucket(contents=content)
+        ranges = []
+        session = boto3.Session()
+        session.events.register(
+            'before-call.s3.GetObject',
+            lambda params, **kwargs: ranges.append(params['headers'].get('Range')),
+        )
+
+        with smart_open.s3.open(BUCKET_NAME, KEY_NAME, 'rb', session=session, buffer_size=50) as fin:
+            self.assertEqual(fin.read(50), content[:50])
+            self.assertEqual(ranges, ['bytes=0-99'])
+            actual = fin.read(950)
+            fin.seek(10)
+            self.assertEqual(fin.read(10), content[10:20])
+
+        self.assertEqual(actual, content[50:])
+        self.assertEqual(
+            ranges,
+            ['bytes=0-99', 'bytes=100-299', 'bytes=300-699', 'bytes=700-999', 'bytes=10-109'],
+        )
+
+    def test_read_empty(self):
+        put_to_bucket(contents=b'')
+        with smart_open.s3.open(BUCKET_NAME, KEY_NAME, 'rb') as fin:
+            self.assertEqual(fin.read(), b'')
+
+    def test_content_length_hint(self):
+        """Does opening with a known size defer all requests until the first read?"""
+        put_to_bucket(contents=b'hello')
+        session, calls = make_recording_session()
+
+        with smart_open.s3.open(BUCKET_NAME, KEY_NAME, 'rb', session=session, content_length=5) as fin:
+            self.assertEqual(calls, [])
+            fin.seek(-2, whence=smart_open.constants.WHENCE_END)
+            self.assertEqual(fin.read(), b'lo')
+        self.assertEqual(calls, ['GetObject'])
+
+    def test_prefetch_block_cache(self):
+        content = bytes(bytearray(range(256))) * 10
+        put_to_bucket(contents=content)
+
+        cache = smart_open.blockcache.BlockCache(block_size=100)
+        for _ in range(2):
+            with smart_open.s3.open(
+                    BUCKET_NAME, KEY_NAME, 'rb', prefetch_workers=2,
+                    prefetch_block_size=1000, block_cache=cache) as fin:
+                self.assertEqual(fin.read(), content)
+
+        self.assertEqual(cache.misses, 3)
+        self.assertEqual(cache.hits, 3)
+
 
 @moto.mock_s3
 class MultipartWriterTest(unittest.TestCase):
@@ -351,6 +612,65 @@ class MultipartWriterTest(unittest.TestCase):
         output = list(smart_open.smart_open("s3://{}/{}".format(BUCKET_NAME, WRITE_KEY_NAME)))
         self.assertEqual(output, [b"testtest\n", b"test"])
 
+    def test_write_lazy(self):
+        """Does opening the writer defer the multipart upload?"""
+        session, calls = make_recording_session()
+        with smart_open.s3.open(BUCKET_NAME, WRITE_KEY_NAME, 'wb', session=session) as fout:
+            fout.write(b'hello')
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, ['PutObject'])
+
+        with smart_open.s3.open(BUCKET_NAME, WRITE_KEY_NAME, 'rb') as fin:
+            self.assertEqual(fin.read(), b'hello')
+
+    def test_write_switches_to_multipart(self):
+        """Does crossing min_part_size switch the writer to a multipart upload?"""
+        session, calls = make_recording_session()
+        with smart_open.s3.open(
+                BUCKET_NAME, WRITE_KEY_NAME, 'wb', session=session, min_part_size=10) as fout:
+            fout.write(b'0123456789abc')
+        self.assertEqual(
+            calls, ['CreateMultipartUpload', 'UploadPart', 'CompleteMultipartUpload'],
+        )
+
+        with smart_open.s3.open(BUCKET_NAME, WRITE_KEY_NAME, 'rb') as fin:
+            self.assertEqual(fin.read(), b'0123456789abc')
+
+    def test_write_concurrent_parts(self):
+        """Do parts uploaded in the background end up in the right order?"""
+        part_size = smart_open.s3.MIN_MIN_PART_SIZE
+        parts = [bytes([i]) * part_size for i in range(4)] + [b'tail']
+
+        with smart_open.s3.MultipartWriter(
+                BUCKET_NAME, WRITE_KEY_NAME, min_part_size=part_size, max_concurrent_parts=2) as fout:
+            for part in parts:
+                fout.write(part)
+            self.assertEqual(fout._total_parts, 4)
+            self.assertLessEqual(len(fout._pending), 2)
+
+        with smart_open.s3.open(BUCKET_NAME, WRITE_KEY_NAME, 'rb') as fin:
+            self.assertEqual(fin.read(), b''.join(parts))
+
+    def test_write_concurrent_part_fails(self):
+        """Does a part that fails in the background abort the upload?"""
+        part_size = smart_open.s3.MIN_MIN_PART_SIZE
+        error = botocore.client.ClientError({'Error': {'Code': 'InternalError'}}, 'UploadPart')
+        client = boto3.client('s3')
+
+        for parts in (1, 3):
+            fout = smart_open.s3.MultipartWriter(
+                BUCKET_NAME, WRITE_KEY_NAME, min_part_size=part_size, max_concurrent_parts=4,
+            )
+            with mock.patch.object(fout._object.meta.client, 'upload_part', side_effect=error):
+                with self.assertRaises(botocore.client.ClientError):
+                    with fout:
+                        for _ in range(parts):
+                            fout.write(b'x' * part_size)
+                            concurrent.futures.wait(fout._pending)
+
+            self.assertTrue(fout.closed)
+            self.assertNotIn('Uploads', client.list_multipart_uploads(Bucket=BUCKET_NAME))
+
     def test_write_04(self):
         """Does writing no data cause key with an empty value to be created?"""
         smart_open_write = smart_open.s3.MultipartWriter(BUCKET_NAME, WRITE_KEY_NAME)
@@ -568,6 +888,34 @@ class IterBucketTest(unittest.TestCase):
         expected = ['key_%d' % x for x in range(num_keys)]
         self.assertEqual(sorted(keys), sorted(expected))
 
+    def test_list_bucket_parallel(self):
+        """Does listing the sub-prefixes in parallel find every key once?"""
+        s3 = boto3.resource('s3')
+        expected = ['top_%d' % x for x in range(3)]
+        expected += ['dir_%d/key_%d' % (x, y) for x in range(5) for y in range(x)]
+        for key in expected:
+            s3.Object(BUCKET_NAME, key).put(Body=b'x')
+
+        objects = list(smart_open.s3._list_bucket_objects_parallel(BUCKET_NAME, workers=2))
+        self.assertEqual(sorted(objects), sorted((key, 1) for key in expected))
+
+    def test_list_bucket_shards(self):
+        """Does listing explicit shards in parallel find every key once?"""
+        num_keys = 30
+        populate_bucket(num_keys=num_keys)
+        shards = ['key_1', 'key_15', 'key_27']
+
+        objects = smart_open.s3._list_bucket_objects_parallel(BUCKET_NAME, workers=2, shards=shards)
+        keys = [key for key, _ in objects]
+        expected = ['key_%d' % x for x in range(num_keys)]
+        self.assertEqual(sorted(keys), sorted(expected))
+
+    def test_iter_bucket_list_workers(self):
+        populate_bucket()
+        results = list(smart_open.s3.iter_bucket(
+            BUCKET_NAME, accept_key=lambda key: key.endswith('4'), list_workers=2, list_shards=['key_5']))
+        self.assertEqual(results, [('key_4', b'4')])
+
     def test_old(self):
         """Does s3_iter_bucket work correctly?"""
         #
@@ -628,6 +976,19 @@ class IterBucketConcurrentFuturesTest(unittest.TestCase):
         expected = [('key_%d' % x, b'%d' % x) for x in range(num_keys)]
         self.assertEqual(sorted(keys), sorted(expected))
 
+    def test_stream_threshold(self):
+        """Are large objects streamed instead of downloaded?"""
+        num_keys = 20
+        populate_bucket(num_keys=num_keys)
+        results = dict(smart_open.s3.iter_bucket(BUCKET_NAME, stream_threshold=1))
+
+        self.assertIsInstance(results['key_9'], io.BytesIO)
+        self.assertIsInstance(results['key_10'], smart_open.s3.Reader)
+
+        actual = {key: fin.read() for key, fin in results.items()}
+        expected = {'key_%d' % x: b'%d' % x for x in range(num_keys)}
+        self.assertEqual(actual, expected)
+
 
 @moto.mock_s3
 @unittest.skipIf(not smart_open.concurrency._MULTIPROCESSING, 'multiprocessing unavailable')
@@ -711,6 +1072,17 @@ class DownloadKeyTest(unittest.TestCase):
         actual = smart_open.s3._download_key(KEY_NAME, bucket_name=BUCKET_NAME)
         self.assertEqual(expected, actual)
 
+    def test_single_request(self):
+        """Does each download cost a single request, reusing the session?"""
+        contents = b'hello'
+        put_to_bucket(contents=contents)
+        session, calls = make_recording_session()
+        with mock.patch.object(smart_open.s3._RESOURCE_POOL, 'session', return_value=session):
+            for _ in range(2):
+                actual = smart_open.s3._download_key(KEY_NAME, bucket_name=BUCKET_NAME)
+                self.assertEqual(actual, (KEY_NAME, contents))
+        self.assertEqual(calls, ['GetObject', 'GetObject'])
+
     def test_intermittent_error(self):
         contents = b'hello'
         put_to_bucket(contents=contents)
@@ -794,6 +1166,68 @@ class RetryIfFailedTest(unittest.TestCase):
         self.assertEqual(partial.call_count, 3)
 
 
+class ResourcePoolTest(unittest.TestCase):
+    def setUp(self):
+        self.pool = smart_open.s3._ResourcePool()
+
+    def test_session_reused(self):
+        self.assertIs(self.pool.session(), self.pool.session())
+        self.assertIs(
+            self.pool.session(aws_access_key_id='a', aws_secret_access_key='b'),
+            self.pool.session(aws_access_key_id='a', aws_secret_access_key='b'),
+        )
+        self.assertIsNot(
+            self.pool.session(aws_access_key_id='a', aws_secret_access_key='b'),
+            self.pool.session(aws_access_key_id='c', aws_secret_access_key='d'),
+        )
+
+    def test_resource_reused(self):
+        session = self.pool.session()
+        kwargs = {'endpoint_url': 'http://localhost:5000'}
+        self.assertIs(self.pool.resource(session), self.pool.resource(session))
+        self.assertIs(self.pool.resource(session, kwargs), self.pool.resource(session, dict(kwargs)))
+        self.assertIsNot(self.pool.resource(session), self.pool.resource(session, kwargs))
+        self.assertIsNot(self.pool.resource(session), self.pool.resource(boto3.Session()))
+
+    def test_unhashable_kwargs(self):
+        session = self.pool.session()
+        kwargs = {'config': {'unhashable': True}}
+        with mock.patch.object(session, 'resource') as mock_resource:
+            self.pool.resource(session, kwargs)
+            self.pool.resource(session, kwargs)
+        self.assertEqual(mock_resource.call_count, 2)
+
+    def test_bounded(self):
+        """Do kwargs that hash by identity leave a bounded number of resources behind?"""
+        session = self.pool.session()
+        for _ in range(50):
+            kwargs = {'config': botocore.config.Config(retries={'max_attempts': 2})}
+            resource = self.pool.resource(session, kwargs)
+        self.assertEqual(len(self.pool._get_local().resources[session]), smart_open.s3._MAX_POOLED)
+        self.assertIs(self.pool.resource(session, kwargs), resource)
+
+        for i in range(50):
+            self.pool.session(aws_access_key_id=str(i), aws_secret_access_key='b')
+        self.assertEqual(len(self.pool._get_local().sessions), smart_open.s3._MAX_POOLED)
+
+    def test_per_thread(self):
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(self.pool.session()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(sessions[0], self.pool.session())
+
+    def test_fork(self):
+        session = self.pool.session()
+        with mock.patch('os.getpid', return_value=os.getpid() + 1):
+            self.assertIsNot(self.pool.session(), session)
+
+    def test_clear(self):
+        session = self.pool.session()
+        self.pool.clear()
+        self.assertIsNot(self.pool.session(), session)
+
+
 if __name__ == '__main__':
     logging.basicConfig(format='%(asctime)s : %(levelname)s : %(message)s', level=logging.INFO)
     unittest.main()
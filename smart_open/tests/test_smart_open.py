@@ -495,6 +495,121 @@ class RealFileSystemTests(unittest.TestCase):
         self.assertEqual(text, SAMPLE_TEXT * 2)
 
 
+class IterLinesTest(unittest.TestCase):
+    def test_gzip(self):
+        lines = ['línea %d' % i for i in range(10000)]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'lines.gz')
+            with smart_open.open(path, 'w', encoding='utf-8') as fout:
+                fout.write('\n'.join(lines))
+
+            batches = list(smart_open.iter_lines(path, batch_size=1000, encoding='utf-8'))
+            self.assertGreater(len(batches), 1)
+            self.assertEqual([line for batch in batches for line in batch], lines)
+
+            batches = smart_open.iter_lines(path, keepends=True)
+            self.assertEqual(next(batches)[0], 'línea 0\n'.encode('utf-8'))
+
+
+class TailTest(unittest.TestCase):
+    def setUp(self):
+        self.lines = [b'line %d\n' % i for i in range(10000)]
+        with tempfile.NamedTemporaryFile(prefix='test', delete=False) as fout:
+            fout.write(b''.join(self.lines))
+            self.temp_file = fout.name
+
+    def tearDown(self):
+        os.unlink(self.temp_file)
+
+    def test_nbytes(self):
+        self.assertEqual(smart_open.tail(self.temp_file, nbytes=20), b''.join(self.lines[-2:]))
+        self.assertEqual(smart_open.tail(self.temp_file, nbytes=10**6), b''.join(self.lines))
+
+    def test_nlines(self):
+        self.assertEqual(smart_open.tail(self.temp_file, nlines=3), self.lines[-3:])
+        self.assertEqual(smart_open.tail(self.temp_file, nlines=5000), self.lines[-5000:])
+        self.assertEqual(smart_open.tail(self.temp_file, nlines=20000), self.lines)
+        self.assertEqual(smart_open.tail(self.temp_file, nlines=0), [])
+
+    def test_fallback(self):
+        """Does tail work for transports that have no tail_uri?"""
+        with mock.patch('smart_open.local_file.tail_uri', new=None):
+            self.assertEqual(smart_open.tail(self.temp_file, nlines=2), self.lines[-2:])
+
+    def test_bad_args(self):
+        with self.assertRaises(ValueError):
+            smart_open.tail(self.temp_file)
+        with self.assertRaises(ValueError):
+            smart_open.tail(self.temp_file, nbytes=1, nlines=1)
+
+
+class SplitTest(unittest.TestCase):
+    def setUp(self):
+        self.lines = [b'line %d: %s\n' % (i, b'x' * (i % 97)) for i in range(5000)]
+        with tempfile.NamedTemporaryFile(prefix='test', delete=False) as fout:
+            fout.write(b''.join(self.lines))
+            self.temp_file = fout.name
+        self.size = os.path.getsize(self.temp_file)
+
+    def tearDown(self):
+        os.unlink(self.temp_file)
+
+    def read_range(self, byte_range, mode='rb'):
+        with smart_open.open(self.temp_file, mode, byte_range=byte_range) as fin:
+            return list(fin)
+
+    def test_split(self):
+        ranges = smart_open.split(self.temp_file, n_splits=7)
+        self.assertEqual(len(ranges), 7)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], self.size)
+
+        lines = []
+        for start, stop in ranges:
+            lines.extend(self.read_range((start, stop)))
+            self.assertEqual(lines[-1], self.lines[len(lines) - 1])
+        self.assertEqual(lines, self.lines)
+
+    def test_split_size(self):
+        ranges = smart_open.split(self.temp_file, split_size=10000)
+        self.assertEqual(len(ranges), -(-self.size // 10000))
+        self.assertEqual([r[1] for r in ranges[:-1]], [r[0] for r in ranges[1:]])
+
+    def test_long_lines(self):
+        """Do we drop the ranges that fall inside a single line?"""
+        ranges = smart_open.split(self.temp_file, n_splits=self.size)
+        self.assertEqual(len(ranges), len(self.lines))
+
+    def test_unaligned(self):
+        """Does every line belong to exactly one range, wherever the boundaries are?"""
+        boundaries = [0, 1, 12, 13, 500, 20000, 20001, 65537, self.size - 1, self.size]
+        lines = []
+        for start, stop in zip(boundaries, boundaries[1:]):
+            lines.extend(self.read_range((start, stop)))
+        self.assertEqual(lines, self.lines)
+
+    def test_read(self):
+        start, stop = 20000, 40000
+        with smart_open.open(self.temp_file, 'rb', byte_range=(start, stop)) as fin:
+            data = b''.join(iter(lambda: fin.read(333), b''))
+        self.assertEqual(data.splitlines(True), self.read_range((start, stop)))
+        self.assertTrue(data.endswith(b'\n'))
+
+    def test_text(self):
+        lines = self.read_range((0, 1000), mode='r')
+        self.assertEqual(lines, [line.decode('utf-8') for line in self.read_range((0, 1000))])
+
+    def test_bad_args(self):
+        with self.assertRaises(ValueError):
+            smart_open.split(self.temp_file)
+        with self.assertRaises(ValueError):
+            smart_open.split(self.temp_file, n_splits=2, split_size=2)
+        with self.assertRaises(ValueError):
+            smart_open.split('nonexistent.gz', n_splits=2)
+        with self.assertRaises(ValueError):
+            smart_open.open(self.temp_file, 'wb', byte_range=(0, 10))
+
+
 class SmartOpenFileObjTest(unittest.TestCase):
     """
     Test passing raw file objects.
@@ -529,7 +644,8 @@ class SmartOpenFileObjTest(unittest.TestCase):
         """Attempts to write directly to a text stream should fail."""
         buf = make_buffer(io.StringIO)
         with smart_open.smart_open(buf, 'w') as sf:
-            self.assertRaises(TypeError, sf.write, SAMPLE_TEXT)  # we expect binary mode
+            sf.write(SAMPLE_TEXT)
+            self.assertRaises(TypeError, sf.flush)  # we expect binary mode
 
     def test_read_text_from_bytestream(self):
         buf = make_buffer(initial_value=SAMPLE_BYTES)
@@ -537,6 +653,24 @@ class SmartOpenFileObjTest(unittest.TestCase):
             data = sf.read()
         self.assertEqual(data, SAMPLE_TEXT)
 
+    def test_read_text_newline(self):
+        """Does reading text honor the newline argument, like the built-in open?"""
+        for newline, expected in ((None, ['a\n', 'b\n', 'c']), ('', ['a\r\n', 'b\r', 'c'])):
+            buf = make_buffer(initial_value=b'a\r\nb\rc')
+            with smart_open.open(buf, 'r', newline=newline) as sf:
+                self.assertEqual(list(sf), expected)
+
+    def test_read_text_errors(self):
+        buf = make_buffer(initial_value=b'caf\xe9')
+        with smart_open.open(buf, 'r', encoding='utf-8', errors='replace') as sf:
+            self.assertEqual(sf.read(), 'caf\ufffd')
+
+    def test_write_text_newline(self):
+        buf = make_buffer(noclose=True)
+        with smart_open.open(buf, 'w', newline='\r\n') as sf:
+            sf.write('a\nb\n')
+        self.assertEqual(buf.getvalue(), b'a\r\nb\r\n')
+
     def test_read_text_from_bytestream_rt(self):
         buf = make_buffer(initial_value=SAMPLE_BYTES)
         with smart_open.smart_open(buf, 'rt') as sf:
@@ -936,25 +1070,55 @@ class SmartOpenS3KwargsTest(unittest.TestCase):
 
     @mock.patch('boto3.Session')
     def test_s3_upload(self, mock_session):
-        smart_open.open(
+        #
+        # Small objects get uploaded with a single PUT.
+        #
+        with smart_open.open(
             "s3://bucket/key", 'wb', transport_params={
                 'multipart_upload_kwargs': {
                     'ServerSideEncryption': 'AES256',
                     'ContentType': 'application/json',
                 }
             }
-        )
+        ) as fout:
+            fout.write(b'test')
 
         # Locate the s3.Object instance (mock)
         s3_resource = mock_session.return_value.resource.return_value
         s3_object = s3_resource.Object.return_value
 
-        # Check that `initiate_multipart_upload` was called
+        # Check that `put` was called
         # with the desired args
+        s3_object.put.assert_called_with(
+            Body=mock.ANY,
+            ServerSideEncryption='AES256',
+            ContentType='application/json'
+        )
+
+    @mock.patch('boto3.Session')
+    def test_s3_upload_multipart(self, mock_session):
+        #
+        # Larger objects get uploaded in parts.
+        #
+        min_part_size = smart_open.s3.MIN_MIN_PART_SIZE
+        with smart_open.open(
+            "s3://bucket/key", 'wb', transport_params={
+                'min_part_size': min_part_size,
+                'multipart_upload_kwargs': {
+                    'ServerSideEncryption': 'AES256',
+                    'ContentType': 'application/json',
+                }
+            }
+        ) as fout:
+            fout.write(b'x' * (min_part_size + 1))
+
+        s3_resource = mock_session.return_value.resource.return_value
+        s3_object = s3_resource.Object.return_value
         s3_object.initiate_multipart_upload.assert_called_with(
             ServerSideEncryption='AES256',
             ContentType='application/json'
         )
+        s3_object.put.assert_not_called()
 
     def test_session_read_mode(self):
         """
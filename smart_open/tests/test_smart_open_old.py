@@ -473,28 +473,54 @@ class SmartOpenS3KwargsTest(unittest.TestCase):
 
     @mock.patch('boto3.Session')
     def test_s3_upload(self, mock_session):
-        smart_open.smart_open("s3://bucket/key", 'wb', s3_upload={
+        #
+        # Small objects get uploaded with a single PUT.
+        #
+        with smart_open.smart_open("s3://bucket/key", 'wb', s3_upload={
             'ServerSideEncryption': 'AES256',
             'ContentType': 'application/json'
-        })
+        }) as fout:
+            fout.write(b'test')
 
         # Locate the s3.Object instance (mock)
         s3_resource = mock_session.return_value.resource.return_value
         s3_object = s3_resource.Object.return_value
 
-        # Check that `initiate_multipart_upload` was called
+        # Check that `put` was called
         # with the desired args
+        s3_object.put.assert_called_with(
+            Body=mock.ANY,
+            ServerSideEncryption='AES256',
+            ContentType='application/json'
+        )
+
+    @mock.patch('boto3.Session')
+    def test_s3_upload_multipart(self, mock_session):
+        #
+        # Larger objects get uploaded in parts.
+        #
+        min_part_size = smart_open.s3.MIN_MIN_PART_SIZE
+        with smart_open.smart_open("s3://bucket/key", 'wb', min_part_size=min_part_size, s3_upload={
+            'ServerSideEncryption': 'AES256',
+            'ContentType': 'application/json'
+        }) as fout:
+            fout.write(b'x' * (min_part_size + 1))
+
+        s3_resource = mock_session.return_value.resource.return_value
+        s3_object = s3_resource.Object.return_value
         s3_object.initiate_multipart_upload.assert_called_with(
             ServerSideEncryption='AES256',
             ContentType='application/json'
         )
+        s3_object.put.assert_not_called()
 
     @mock.patch('boto3.Session')
     def test_s3_upload_is_none(self, mock_session):
-        smart_open.smart_open("s3://bucket/key", 'wb', s3_upload=None)
+        with smart_open.smart_open("s3://bucket/key", 'wb', s3_upload=None) as fout:
+            fout.write(b'test')
         s3_resource = mock_session.return_value.resource.return_value
         s3_object = s3_resource.Object.return_value
-        s3_object.initiate_multipart_upload.assert_called()
+        s3_object.put.assert_called()
 
     def test_session_read_mode(self):
         """
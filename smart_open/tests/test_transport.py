@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 Radim Rehurek <me@radimrehurek.com>
+#
+# This code is distributed under the terms and conditions
+# from the MIT License (MIT).
+#
+import subprocess
+import sys
+import unittest
+
+import mock
+
+import smart_open
+import smart_open.doctools
+import smart_open.smart_open_lib
+import smart_open.transport
+
+#
+# Modules that make importing smart_open slow.  The transports that need them
+# should import them only when they get used.
+#
+HEAVY_MODULES = (
+    'azure.storage.blob',
+    'boto',
+    'boto3',
+    'google.cloud.storage',
+    'paramiko',
+    'requests',
+)
+
+
+def imported_modules(statement):
+    """Run statement in a fresh interpreter and return the modules it imports."""
+    command = [sys.executable, '-X', 'importtime', '-c', statement]
+    output = subprocess.run(command, stderr=subprocess.PIPE, check=True).stderr.decode('utf-8')
+    return {
+        line.split('|')[-1].strip()
+        for line in output.splitlines()
+        if line.startswith('import time:')
+    }
+
+
+class TransportTest(unittest.TestCase):
+    def test_registered_schemes(self):
+        """Does every transport handle the schemes it got registered under?"""
+        for scheme in smart_open.transport.SUPPORTED_SCHEMES:
+            submodule = smart_open.transport.get_transport(scheme)
+            self.assertIn(scheme, list(smart_open.transport._get_schemes(submodule)) + [''])
+            self.assertIs(smart_open.transport._REGISTRY[scheme], submodule)
+
+    def test_unsupported(self):
+        with self.assertRaises(NotImplementedError):
+            smart_open.transport.get_transport('foo')
+
+    def test_missing_dependencies(self):
+        with mock.patch.dict(smart_open.transport._REGISTRY, {'foo': 'smart_open.nonexistent'}):
+            with self.assertRaises(ImportError):
+                smart_open.transport.get_transport('foo')
+
+    def test_import_is_lazy(self):
+        """Does importing smart_open leave the heavy dependencies alone?"""
+        modules = imported_modules('import smart_open; import pydoc')
+        self.assertIn('smart_open', modules)
+        for name in HEAVY_MODULES:
+            self.assertNotIn(name, modules)
+
+    def test_first_use(self):
+        modules = imported_modules('import smart_open; smart_open.parse_uri("s3://bucket/key")')
+        self.assertIn('boto3', modules)
+        self.assertNotIn('google.cloud.storage', modules)
+
+
+class DocstringTest(unittest.TestCase):
+    def tearDown(self):
+        smart_open.smart_open_lib._tweak_docstrings()
+
+    def test_static(self):
+        """Do the docstrings list every transport without importing it?"""
+        self.assertIn('* s3, s3a, s3n, s3u (smart_open.s3)', smart_open.open.__doc__)
+        self.assertIn('* webhdfs', smart_open.parse_uri.__doc__)
+        self.assertNotIn(smart_open.doctools.PLACEHOLDER, smart_open.open.__doc__)
+        self.assertIn('build_docstrings()', smart_open.open.__doc__)
+        self.assertIn('build_docstrings()', smart_open.parse_uri.__doc__)
+
+    def test_build_docstrings(self):
+        smart_open.doctools.build_docstrings()
+        self.assertIn('s3 (smart_open/s3.py)', smart_open.open.__doc__)
+        self.assertIn('min_part_size: int, optional', smart_open.open.__doc__)
+        self.assertIn('s3://my_bucket/my_key', smart_open.parse_uri.__doc__)
@@ -6,6 +6,7 @@
 # from the MIT License (MIT).
 #
 
+import io
 import unittest
 
 import smart_open.utils
@@ -20,3 +21,63 @@ class ClampTest(unittest.TestCase):
 
     def test_out_of_range(self):
         self.assertEqual(smart_open.utils.clamp(-1, 0, 10), 0)
+
+
+class CoalesceRangesTest(unittest.TestCase):
+    def test_disjoint(self):
+        actual = smart_open.utils.coalesce_ranges([(20, 30), (0, 10)])
+        self.assertEqual(actual, [(0, 10), (20, 30)])
+
+    def test_overlapping(self):
+        actual = smart_open.utils.coalesce_ranges([(0, 10), (5, 15), (15, 20), (2, 3)])
+        self.assertEqual(actual, [(0, 20)])
+
+    def test_gap(self):
+        actual = smart_open.utils.coalesce_ranges([(0, 10), (15, 20), (30, 40)], max_gap=5)
+        self.assertEqual(actual, [(0, 20), (30, 40)])
+
+    def test_empty(self):
+        actual = smart_open.utils.coalesce_ranges([(0, 0), (5, 10), (20, 20)], max_gap=100)
+        self.assertEqual(actual, [(5, 10)])
+
+
+class MakeRangeStringTest(unittest.TestCase):
+    def test_open_ended(self):
+        self.assertEqual(smart_open.utils.make_range_string(5), 'bytes=5-')
+
+    def test_bounded(self):
+        self.assertEqual(smart_open.utils.make_range_string(5, 10), 'bytes=5-10')
+
+    def test_suffix(self):
+        self.assertEqual(smart_open.utils.make_range_string(-5), 'bytes=-5')
+
+    def test_suffix_with_stop(self):
+        with self.assertRaises(ValueError):
+            smart_open.utils.make_range_string(-5, 10)
+
+
+class IterLineBatchesTest(unittest.TestCase):
+    def test_lines(self):
+        contents = b''.join(b'line %d\n' % i for i in range(1000)) + b'no newline'
+        batches = list(smart_open.utils.iter_line_batches(io.BytesIO(contents), batch_size=100))
+        self.assertGreater(len(batches), 1)
+        self.assertEqual([line for batch in batches for line in batch], contents.split(b'\n'))
+
+    def test_keepends(self):
+        contents = b'a\nbb\n\nccc\n'
+        batches = smart_open.utils.iter_line_batches(io.BytesIO(contents), batch_size=3, keepends=True)
+        self.assertEqual([line for batch in batches for line in batch], [b'a\n', b'bb\n', b'\n', b'ccc\n'])
+
+    def test_long_line(self):
+        """Is a line longer than a batch carried over whole?"""
+        contents = b'x' * 1000 + b'\ny\n'
+        batches = list(smart_open.utils.iter_line_batches(io.BytesIO(contents), batch_size=7))
+        self.assertEqual([line for batch in batches for line in batch], [b'x' * 1000, b'y'])
+
+    def test_encoding(self):
+        contents = 'καλημέρα\nκόσμε\n'.encode('utf-8')
+        batches = smart_open.utils.iter_line_batches(io.BytesIO(contents), batch_size=3, encoding='utf-8')
+        self.assertEqual([line for batch in batches for line in batch], ['καλημέρα', 'κόσμε'])
+
+    def test_empty(self):
+        self.assertEqual(list(smart_open.utils.iter_line_batches(io.BytesIO(b''))), [])
@@ -22,7 +22,7 @@ NO_SCHEME = ''
 _REGISTRY = {NO_SCHEME: smart_open.local_file}
 
 
-def register_transport(submodule):
+def register_transport(submodule, schemes=None):
     """Register a submodule as a transport mechanism for ``smart_open``.
 
     This module **must** have:
@@ -32,10 +32,24 @@ def register_transport(submodule):
         - `open_uri` function
         - `parse_uri' function
 
+    It **may** also have a `tail_uri` function, which :func:`smart_open.tail`
+    uses to read the end of an object without reading all of it.
+
     Once registered, you can get the submodule by calling :func:`get_transport`.
 
+    If you pass the submodule's name together with the schemes it handles,
+    the submodule does not get imported until the first time it's needed.
+    Transports often depend on large third-party libraries, so this keeps
+    ``import smart_open`` fast.
+
     """
     global _REGISTRY
+    if isinstance(submodule, str) and schemes is not None:
+        for scheme in schemes:
+            assert scheme not in _REGISTRY
+            _REGISTRY[scheme] = submodule
+        return
+
     if isinstance(submodule, str):
         try:
             submodule = importlib.import_module(submodule)
@@ -43,6 +57,12 @@ def register_transport(submodule):
             logger.warning('unable to import %r, disabling that module', submodule)
             return
 
+    for scheme in _get_schemes(submodule):
+        assert scheme not in _REGISTRY
+        _REGISTRY[scheme] = submodule
+
+
+def _get_schemes(submodule):
     if hasattr(submodule, 'SCHEME'):
         schemes = [submodule.SCHEME]
     elif hasattr(submodule, 'SCHEMES'):
@@ -53,9 +73,7 @@ def register_transport(submodule):
     for f in ('open', 'open_uri', 'parse_uri'):
         assert hasattr(submodule, f), '%r is missing %r' % (submodule, f)
 
-    for scheme in schemes:
-        assert scheme not in _REGISTRY
-        _REGISTRY[scheme] = submodule
+    return schemes
 
 
 def get_transport(scheme):
@@ -63,25 +81,46 @@ def get_transport(scheme):
 
     This submodule must have been previously registered via :func:`register_transport`.
 
+    Raises ImportError if the submodule was registered by name, and cannot
+    be imported, e.g. because its dependencies are not installed.
+
     """
+    global _REGISTRY
     message = "scheme %r is not supported, expected one of %r" % (scheme, SUPPORTED_SCHEMES)
 
     try:
         submodule = _REGISTRY[scheme]
     except KeyError:
         raise NotImplementedError(message)
-    else:
-        return submodule
+
+    if isinstance(submodule, str):
+        name = submodule
+        try:
+            submodule = importlib.import_module(name)
+        except ImportError as ex:
+            raise ImportError(
+                'unable to import %r, which handles the %r scheme: %s' % (name, scheme, ex)
+            ) from ex
+
+        schemes = _get_schemes(submodule)
+        assert scheme in schemes, '%r does not handle the %r scheme' % (name, scheme)
+        for s in schemes:
+            if _REGISTRY.get(s) == name:
+                _REGISTRY[s] = submodule
+
+    return submodule
 
 
 register_transport(smart_open.local_file)
-register_transport('smart_open.asb')
-register_transport('smart_open.gcs')
-register_transport('smart_open.hdfs')
-register_transport('smart_open.http')
-register_transport('smart_open.s3')
-register_transport('smart_open.ssh')
-register_transport('smart_open.webhdfs')
+register_transport('smart_open.asb', schemes=('asb', ))
+register_transport('smart_open.gcs', schemes=('gs', ))
+register_transport('smart_open.hdfs', schemes=('hdfs', ))
+register_transport('smart_open.http', schemes=('http', 'https'))
+register_transport('smart_open.s3', schemes=('s3', 's3n', 's3u', 's3a'))
+register_transport('smart_open.ssh', schemes=('ssh', 'scp', 'sftp'))
+register_transport('smart_open.webhdfs', schemes=('webhdfs', ))
 
 SUPPORTED_SCHEMES = tuple(sorted(_REGISTRY.keys()))
-"""The transport schemes that the local installation of ``smart_open`` supports."""
+"""The transport schemes that ``smart_open`` supports.
+
+Some of them need optional dependencies, which may not be installed locally."""
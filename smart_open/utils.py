@@ -8,6 +8,7 @@
 
 """Helper functions for documentation, etc."""
 
+import codecs
 import inspect
 import logging
 import urllib.parse
@@ -100,7 +101,9 @@ def make_range_string(start, stop=None):
     Parameters
     ----------
     start: int
-        The start of the byte range
+        The start of the byte range.  If negative, the range covers the last
+        ``-start`` bytes of the resource (a suffix range), and stop must be
+        unspecified.
 
     stop: int, optional
         The end of the byte range.  If unspecified, indicates EOF.
@@ -114,11 +117,115 @@ def make_range_string(start, stop=None):
     #
     # https://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
     #
+    if start < 0:
+        if stop is not None:
+            raise ValueError('suffix ranges cannot have a stop, got %r' % stop)
+        return 'bytes=%d' % start
     if stop is None:
         return 'bytes=%d-' % start
     return 'bytes=%d-%d' % (start, stop)
 
 
+def coalesce_ranges(ranges, max_gap=0):
+    """Merge byte ranges that overlap or lie close to each other.
+
+    Parameters
+    ----------
+    ranges: list
+        A list of ``(start, stop)`` tuples, with the stop being exclusive.
+        The order does not matter.
+
+    max_gap: int, optional
+        Merge ranges that are separated by at most this many bytes.  Reading
+        a few unwanted bytes is usually cheaper than another request.
+
+    Returns
+    -------
+    list
+        A sorted list of ``(start, stop)`` tuples that cover all the
+        non-empty input ranges.
+
+    """
+    coalesced = []
+    for start, stop in sorted(r for r in ranges if r[1] > r[0]):
+        if coalesced and start - coalesced[-1][1] <= max_gap:
+            coalesced[-1] = (coalesced[-1][0], max(stop, coalesced[-1][1]))
+        else:
+            coalesced.append((start, stop))
+    return coalesced
+
+
+DEFAULT_LINE_BATCH_SIZE = 1024**2
+"""The default number of bytes that :func:`iter_line_batches` splits at once."""
+
+
+def iter_line_batches(
+        fileobj,
+        batch_size=DEFAULT_LINE_BATCH_SIZE,
+        keepends=False,
+        encoding=None,
+        errors='strict',
+        terminator=None,
+        ):
+    """Read a file object in large blocks, and yield the lines in each block.
+
+    Splitting a whole block with a single ``split`` call is much faster than
+    calling ``readline`` once per line.  A line that spans several blocks
+    is carried over, and yielded as part of a later batch.
+
+    Parameters
+    ----------
+    fileobj: file-like object
+        The file to read lines from.
+    batch_size: int, optional
+        The number of bytes (or characters, for a text file) to read and
+        split at once.
+    keepends: bool, optional
+        If True, include the newline at the end of each line.
+    encoding: str, optional
+        If specified, decode the bytes read from fileobj with this encoding.
+    errors: str, optional
+        How to handle decoding errors, see :func:`codecs.decode`.
+    terminator: bytes or str, optional
+        The line terminator.  Defaults to ``\n``.
+
+    Returns
+    -------
+    iterator of list
+        Lists of consecutive lines.  Each list contains at least one line.
+
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors) if encoding else None
+    pending = []
+    eof = False
+    while not eof:
+        data = fileobj.read(batch_size)
+        eof = not data
+        block = data if decoder is None else decoder.decode(data, final=eof)
+        if not block:
+            continue
+
+        newline = terminator
+        if newline is None:
+            newline = b'\n' if isinstance(block, bytes) else '\n'
+        lines = block.split(newline)
+        if len(lines) == 1:
+            pending.append(block)
+            continue
+
+        if pending:
+            pending.append(lines[0])
+            lines[0] = newline[:0].join(pending)
+        pending = [lines.pop()]
+        if keepends:
+            lines = [line + newline for line in lines]
+        yield lines
+
+    last = pending[0][:0].join(pending) if pending else None
+    if last:
+        yield [last]
+
+
 def safe_urlsplit(url):
     """This is a hack to prevent the regular urlsplit from splitting around question marks.
 
@@ -155,11 +155,20 @@ class BufferedInputBase(io.BufferedIOBase):
     def readinto(self, b):
         """Read up to len(b) bytes into b, and return the number of bytes
         read."""
-        data = self.read(len(b))
-        if not data:
-            return 0
-        b[:len(data)] = data
-        return len(data)
+        dest = memoryview(b).cast('B')
+        total = min(len(dest), len(self._buf))
+        dest[:total] = self._buf[:total]
+        self._buf = self._buf[total:]
+
+        #
+        # Read the rest straight from the response, without buffering it.
+        #
+        while total < len(dest):
+            bytes_read = self._response.raw.readinto(dest[total:])
+            if not bytes_read:
+                break
+            total += bytes_read
+        return total
 
     def readline(self):
         self._buf, retval = b'', self._buf + self._response.raw.readline()